@@ -5,6 +5,25 @@ from pathlib import Path
 FOLDER_NAME = "Processed_Files"
 FOLDER_PATH = Path(FOLDER_NAME)
 CONFIG_FILE = Path(__file__).resolve()
+# Reports and aggregates computed when processing each file
+REPORTS_FOLDER_PATH = FOLDER_PATH / "Reports"
+# Raw surveys downloaded from config.SURVEYS, stored by the hash of their content
+RAW_FOLDER_PATH = Path("Raw_Files")
+# Use only the raw surveys already downloaded, without connecting to the urls
+OFFLINE = False
+# Seconds to wait for the server of a survey
+DOWNLOAD_TIMEOUT = 30
+
+# Format of the processed files: "parquet", "feather" or "csv"
+FILE_FORMAT = "parquet"
+FILE_FORMATS = ["parquet", "feather", "csv"]
+
+# Text columns with fewer unique values than this proportion
+# of the rows are stored as categories
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Rows read at a time by main_chunked, for surveys that don't fit in memory
+CHUNK_SIZE = 50000
 
 # --- # --- #
 
@@ -54,6 +73,7 @@ CONTRACT = "Tipo de contrato"
 WORK_MODALITY = "Modalidad de trabajo"
 BONUS = "Recibís algún tipo de bono"
 EMPLOYMENT_STATUS = "Dedicación"
+INFLATION_ADJUSTMENTS = "¿Tuviste ajustes por inflación el último año?"
 
 # --- # --- #
 
@@ -96,6 +116,18 @@ REQUIRED_COLUMNS = [
     BONUS,
 ]
 
+# Columns that are transformed when the survey has them
+OPTIONAL_COLUMNS = [
+    COUNTRIES,
+    PAYMENTS_IN_DOLLARS,
+    LAST_VALUE_EXCHANGE,
+    DAYS_IN_OFFICE,
+    TRAINING_IN,
+    WORK_MODALITY,
+    EMPLOYMENT_STATUS,
+    INFLATION_ADJUSTMENTS,
+]
+
 # Rename columns in file to upload
 SAME_COLUMNS = {
     "Argentina" : PROVINCES,
@@ -123,6 +155,50 @@ SAME_COLUMNS = {
     "Beneficios extra": BENEFITS,
 }
 
+# Rows at the start of an uploaded file where the names of the columns are searched
+HEADER_SEARCH_ROWS = 25
+
+# Columns with other names are proposed as a supported column when the
+# similarity of the names (from 0 to 1) is at least COLUMN_MATCH_MIN_SCORE,
+# and it is COLUMN_MATCH_MIN_MARGIN greater than the next best match.
+# Unrelated questions with words in common score up to about 0.78.
+# The others are chosen by the user.
+COLUMN_MATCH_MIN_SCORE = 0.8
+COLUMN_MATCH_MIN_MARGIN = 0.1
+
+# Surveys downloaded at the same time when loading all the surveys
+DOWNLOAD_THREADS = 8
+# Surveys transformed at the same time, None for the number of processors
+INGEST_PROCESSES = None
+# Seconds between the samples of the memory while profiling the transform
+PROFILE_INTERVAL = 0.005
+
+# Distinct answers whose result is kept by each table of transform_data.rules
+RULE_CACHE_SIZE = 2**14
+
+# Processed surveys, cubes and filter indexes kept in memory, shared by every session
+LOADER_CACHE_SIZE = 12
+# Trend lines of the dashboard kept in memory, one per table of a survey and filters
+TREND_CACHE_SIZE = 256
+# Megabytes of the charts of the dashboard kept in memory, shared by every session
+FIGURE_CACHE_MEMORY = 64
+
+# Modules imported by the pages, in the order of a cold start
+IMPORT_TIME_MODULES = [
+    "config",
+    "transform_data.storage",
+    "transform_data.loader",
+    "transform_data.aggregates",
+    "transform_data.columns",
+    "transform_data.ingest",
+    "transform_data.transform_data",
+    "graphics.streamlit_dashboard",
+]
+# Modules that are imported only by the code that uses them
+DEFERRED_IMPORTS = ["sklearn", "scipy", "plotly.express"]
+# Seconds to import IMPORT_TIME_MODULES, after streamlit
+IMPORT_TIME_BUDGET = 0.3
+
 #  The previous surveys that the program can successfully run.
 
 
@@ -251,3 +327,37 @@ ERROR_MSG = "No se pudo desplegar el grafico"
 MINIMUM_RESPONSES = 10
 ADEQUATE_RESPONSES_INFO = 200
 MIN_NUMBER_OF_PARTICIPANTS_PER_JOB = 20
+# The numeric columns are grouped in at most this number of bins
+MAX_HISTOGRAM_BINS = 100
+# Distinct values of a numeric column counted for its medians and quantiles,
+# with more values they are rounded to fewer significant digits
+STATISTIC_MAX_VALUES = 2**14
+
+# Columns that can be filtered by value in the Filtros page
+FILTER_COLUMNS = [
+    POSITIONS,
+    PAYMENTS_IN_DOLLARS,
+    MAX_LVL_STUDIES,
+    PROVINCES,
+    GENDER,
+    CONTRACT,
+    WORK_MODALITY,
+    ORGANIZATION_SIZE,
+]
+# Numeric columns that can be filtered by range
+RANGE_FILTER_COLUMNS = [
+    YEARS_OF_EXPERIENCE,
+]
+# Multiple choice columns that can be filtered by the chosen answers
+TAG_FILTER_COLUMNS = [
+    LANGUAGES,
+    FRAMEWORKS,
+    DATABASES_COLUMN,
+    PLATFORMS_COLUMN,
+    QA,
+    BENEFITS,
+]
+
+# Answers with their own charts
+HYBRID_MODALITY = "Híbrido (presencial y remoto)"
+ALL_SALARY_IN_DOLLARS = "Cobro todo el salario en dólares"
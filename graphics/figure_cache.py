@@ -0,0 +1,122 @@
+import collections
+import sys
+import threading
+
+import plotly.io as pio
+
+import config
+
+
+class FigureCache:
+    """
+    Figures serialized as JSON, shared by every session of the streamlit
+    server. When the figures take more memory than max_bytes the least
+    recently used are removed. The hits and misses are counted per chart.
+
+    Args:
+        max_bytes (int): The memory of the figures kept.
+
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # {(cube digest, chart): figure JSON}
+        self._figures = collections.OrderedDict()
+        self._bytes = 0
+        self._counters = collections.defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the JSON of a figure, and counts a hit or a miss for its chart.
+
+        Args:
+            key (tuple): The (cube digest, chart) of the figure.
+
+        Returns:
+            str: The JSON of the figure, None if it isn't cached.
+
+        """
+        with self._lock:
+            spec = self._figures.get(key)
+            if spec is None:
+                self._counters[key[1]]["misses"] += 1
+            else:
+                self._figures.move_to_end(key)
+                self._counters[key[1]]["hits"] += 1
+            return spec
+
+    def put(self, key, spec):
+        """
+        Keeps the JSON of a figure, a figure larger than the cache is not kept.
+
+        Args:
+            key (tuple): The (cube digest, chart) of the figure.
+            spec (str): The JSON of the figure.
+
+        """
+        size = sys.getsizeof(spec)
+        with self._lock:
+            if key in self._figures:
+                self._bytes -= sys.getsizeof(self._figures.pop(key))
+            if size > self.max_bytes:
+                return
+            self._figures[key] = spec
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, removed = self._figures.popitem(last=False)
+                self._bytes -= sys.getsizeof(removed)
+
+    def clear(self):
+        """Removes the figures and the counters."""
+        with self._lock:
+            self._figures.clear()
+            self._bytes = 0
+            self._counters.clear()
+
+    def stats(self):
+        """
+        Returns the use of the cache.
+
+        Returns:
+            dict: The number of figures, their memory and the maximum in bytes,
+                and the hits and misses of each chart, {chart: {"hits", "misses"}}.
+
+        """
+        with self._lock:
+            return {
+                "figures": len(self._figures),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "charts": {
+                    chart: dict(counters)
+                    for chart, counters in self._counters.items()
+                },
+            }
+
+
+FIGURES = FigureCache(config.FIGURE_CACHE_MEMORY * 2**20)
+
+
+def get_figure(cube, chart, build):
+    """
+    Returns a chart of a cube, it is built only once for each survey and
+    filters while it stays in the cache, whatever the session that displays it.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+        chart (str): The name of the chart in the dashboard, like "salaries/gross".
+        build (function): Returns the figure, called when it isn't cached.
+
+    Returns:
+        plotly.graph_objects.Figure: The figure.
+
+    """
+    key = (cube["digest"], chart)
+    spec = FIGURES.get(key)
+    if spec is not None:
+        return pio.from_json(spec)
+
+    figure = build()
+    FIGURES.put(key, figure.to_json())
+    return figure
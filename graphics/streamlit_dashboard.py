@@ -1,59 +1,203 @@
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
 import numpy as np
 import pandas as pd
 
 
 import config
+import graphics.figure_cache as figure_cache
 import graphics.streamlit_order_plots as streamlit_order_plots
 import graphics.streamlit_figures as streamlit_figures
+import graphics.trends as trends
+import transform_data.aggregates as aggregates
+
+def _express():
+    """
+    Imports plotly.express when a section draws with it,
+    the pages start faster without it.
+
+    Returns:
+        module: plotly.express.
+
+    """
+    import plotly.express as px
+
+    return px
+
+
+def _plot_chart(cube, chart, build, **kwargs):
+    """
+    Displays a chart of the dashboard, built only if it isn't in the figure cache.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+        chart (str): The name of the chart, unique in the dashboard.
+        build (function): Returns the figure.
+        **kwargs: The arguments of st.plotly_chart.
+
+    """
+    st.plotly_chart(figure_cache.get_figure(cube, chart, build), **kwargs)
+
+
+def display_salaries(cube):
+    px = _express()
+
+    st.markdown("### Salarios :moneybag:")
+    tabs = st.tabs(
+        [
+            "Salario mensual BRUTO",
+            "Salario mensual NETO",
+            "Actualizaciones de tus ingresos",
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            counts, box = aggregates.get_distribution(cube, config.GROSS_SALARY)
+            _plot_chart(
+                cube,
+                "salaries/gross",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    config.GROSS_SALARY,
+                    None,
+                    box=box,
+                    xaxis_title="Salario BRUTO mensual",
+                    yaxis_title="Cantidad de respuestas"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[1]:
+        try:
+            counts, box = aggregates.get_distribution(cube, config.NET_SALARY)
+            _plot_chart(
+                cube,
+                "salaries/net",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    config.NET_SALARY,
+                    None,
+                    box=box,
+                    xaxis_title="Salario NETO mensual",
+                    yaxis_title="Cantidad de respuestas"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[2]:
+        try:
+            _plot_chart(
+                cube,
+                "salaries/adjustments",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    aggregates.get_counts(cube, config.INFLATION_ADJUSTMENTS),
+                    config.INFLATION_ADJUSTMENTS,
+                    streamlit_order_plots.ORDER_1_3,
+                    xaxis_title="Cantidad de actualizaciones",
+                    yaxis_title="Cantidad de respuestas"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
 
+    df_aux = aggregates.get_frame(cube, "net_by_experience")
 
-def display_dashboard(df):
-    container = st.container()
-    with container:
-        # Salarios
-        st.markdown("### Salarios :moneybag:")
-        tabs = st.tabs(
-            [
-                "Salario mensual BRUTO",
-                "Salario mensual NETO",
-                "Actualizaciones de tus ingresos",
-            ]
-        )
+    if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
+        def build():
+            fig = px.scatter(
+                df_aux,
+                y=df_aux[config.NET_SALARY].values,
+                x=df_aux[config.YEARS_OF_EXPERIENCE].values,
+                opacity=1,
+                labels={
+                    "x": config.YEARS_OF_EXPERIENCE,
+                    "y": "Mediana del salario NETO por año de experiencia",
+                },
+                title="Tendencia de sueldos segun experiencia",
+            )
 
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.GROSS_SALARY,
-                        streamlit_order_plots.get_order(
-                            df[config.GROSS_SALARY].unique().tolist()
-                        ),
-                        marginal="box",
-                        xaxis_title="Salario BRUTO mensual",
-                        yaxis_title="Cantidad de respuestas"
-                    ),
-                    theme=None,
+            X = df_aux[config.YEARS_OF_EXPERIENCE].values + 0.1
+            angular_coefficient, intercept = trends.get_log_trends(
+                cube, "net_by_experience", config.YEARS_OF_EXPERIENCE, config.NET_SALARY
+            )[None]
+            fig.add_trace(
+                go.Scatter(
+                    x=X,
+                    y=angular_coefficient * np.log(X + 0.1) + intercept,
+                    mode="lines",
+                    name="Tendencia (Ayuda visual)",
                 )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+            )
+            return fig
 
-        with tabs[1]:
+        try:
+            _plot_chart(cube, "salaries/trend", build, theme=None)
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+def display_dollars(cube):
+    px = _express()
+
+    st.markdown("### Proporción de salarios en dólares  :money_with_wings:")
+    tabs = st.tabs([config.PAYMENTS_IN_DOLLARS, "Valor del tipo de cambio"])
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "dollars/payments",
+                lambda: streamlit_figures.get_pie(
+                    serie=aggregates.get_counts(
+                        cube, config.PAYMENTS_IN_DOLLARS, fill_na="No responde"
+                    ),
+                    title="¿Cobras en dólares?",
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[1]:
+        if (
+            config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
+        ) not in cube["columns"]:
+            st.warning(
+                f"""No se encuentra la columna: -{
+                    config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
+                    }- en el archivo"""
+            )
+        elif (
+            cube["answered"][
+                config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
+            ]
+            >= config.MINIMUM_RESPONSES
+        ):
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.NET_SALARY,
-                        streamlit_order_plots.get_order(
-                            df[config.NET_SALARY].unique().tolist()
-                        ),
-                        marginal="box",
-                        xaxis_title="Salario NETO mensual",
+                counts, _ = aggregates.get_distribution(
+                    cube,
+                    config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX,
+                )
+                _plot_chart(
+                    cube,
+                    "dollars/exchange",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        config.LAST_VALUE_EXCHANGE
+                        + config.REWRITTEN_COLUMN_SUFFIX,
+                        None,
+                        xaxis_title="Valor del tipo de cambio",
                         yaxis_title="Cantidad de respuestas"
                     ),
                     theme=None,
@@ -61,16 +205,40 @@ def display_dashboard(df):
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
+        else:
+            st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
+
+    payments = [
+        payment
+        for payment in cube["unique"][config.PAYMENTS_IN_DOLLARS]
+        if payment is not None
+    ]
+
+    # Salarios en dólares
+    st.markdown("### Salarios en dólares :money_with_wings:")
 
-        with tabs[2]:
+    # gross salary
+    st.markdown("##### Salario Bruto")
+    tabs = st.tabs(payments)
+
+    for n, tab in enumerate(payments):
+        with tabs[n]:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        "¿Tuviste ajustes por inflación el último año?",
-                        streamlit_order_plots.ORDER_1_3,
-                        xaxis_title="Cantidad de actualizaciones",
-                        yaxis_title="Cantidad de respuestas"
+                counts, box = aggregates.get_distribution(
+                    cube,
+                    config.GROSS_SALARY + " - " + config.PAYMENTS_IN_DOLLARS,
+                    group=tab,
+                )
+                _plot_chart(
+                    cube,
+                    f"dollars/gross/{tab}",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        "¿Cobras en dólares? " + tab,
+                        None,
+                        box=box,
+                        yaxis_title="Cantidad de respuestas",
+                        xaxis_title="Valores salariales"
                     ),
                     theme=None,
                 )
@@ -78,454 +246,182 @@ def display_dashboard(df):
                 st.error(config.ERROR_MSG)
                 st.exception(e)
 
-        df_aux = (
-            df.loc[
-                (df[config.NET_SALARY].notna())
-                & (df[config.YEARS_OF_EXPERIENCE].notna())
-            ]
-            .groupby([config.YEARS_OF_EXPERIENCE])[config.NET_SALARY]
-            .median()
-            .reset_index()
-        )
+    df_aux = aggregates.get_frame(cube, "gross_by_payment_and_experience")
+
+    if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
+        def build():
+            type_salary_usd = sorted(payments)
+
+            X = df_aux[config.YEARS_OF_EXPERIENCE].values + 0.1
 
-        if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
             fig = px.scatter(
                 df_aux,
-                y=df_aux[config.NET_SALARY].values,
+                y=df_aux[config.GROSS_SALARY].values,
                 x=df_aux[config.YEARS_OF_EXPERIENCE].values,
+                color=df_aux[config.PAYMENTS_IN_DOLLARS].values,
                 opacity=1,
                 labels={
                     "x": config.YEARS_OF_EXPERIENCE,
-                    "y": "Mediana del salario NETO por año de experiencia",
+                    "y": "Mediana del slario bruto",
+                    "color": "¿Cobras en dolares?"
                 },
-                title="Tendencia de sueldos segun experiencia",
+                title="Tendencia de sueldos segun experiencia y tipo de salario",
             )
 
-            X = df_aux[config.YEARS_OF_EXPERIENCE].values.reshape(-1, 1) + 0.1
-            y = df_aux[config.NET_SALARY].values.reshape(-1, 1)
-            model = LinearRegression()
-            model.fit(np.log(X), y)
+            modelos = trends.get_log_trends(
+                cube,
+                "gross_by_payment_and_experience",
+                config.YEARS_OF_EXPERIENCE,
+                config.GROSS_SALARY,
+                config.PAYMENTS_IN_DOLLARS,
+            )
 
-            angular_coefficient = model.coef_[0]
-            intercept = model.intercept_
-            fig.add_trace(
-                go.Scatter(
-                    x=X.flatten(),
-                    y=angular_coefficient * np.log(X + 0.1).flatten() + intercept,
-                    mode="lines",
-                    name="Tendencia (Ayuda visual)",
+            for type_salary in type_salary_usd:
+                if type_salary not in modelos:
+                    continue
+                angular_coefficient, intercept = modelos[type_salary]
+                log_X = np.log(
+                    X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary] + 0.1
                 )
-            )
+                fig.add_trace(
+                    go.Scatter(
+                        x=X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary],
+                        y=angular_coefficient * log_X + intercept,
+                        mode="lines",
+                        name=type_salary,
+                    )
+                )
+            return fig
 
+        try:
+            _plot_chart(cube, "dollars/gross_trend", build, theme=None)
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    # net salary
+    st.markdown("##### Salario Neto")
+    tabs = st.tabs(payments)
+
+    for n, tab in enumerate(payments):
+        with tabs[n]:
             try:
-                st.plotly_chart(fig, theme=None)
+                counts, box = aggregates.get_distribution(
+                    cube,
+                    config.NET_SALARY + " - " + config.PAYMENTS_IN_DOLLARS,
+                    group=tab,
+                )
+                _plot_chart(
+                    cube,
+                    f"dollars/net/{tab}",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        "¿Cobras en dólares? " + tab,
+                        None,
+                        box=box,
+                        yaxis_title="Cantidad de respuestas",
+                        xaxis_title="Valores salariales"
+                    ),
+                    theme=None,
+                )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
 
-        # Dolares
+    df_aux = aggregates.get_frame(cube, "net_by_payment_and_experience")
 
-        if config.PAYMENTS_IN_DOLLARS in df.columns:
-            st.markdown("### Proporción de salarios en dólares  :money_with_wings:")
-            tabs = st.tabs([config.PAYMENTS_IN_DOLLARS, "Valor del tipo de cambio"])
+    ###
+    if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
+        def build():
+            type_salary_usd = sorted(payments)
 
-            with tabs[0]:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_pie(
-                            serie=df[config.PAYMENTS_IN_DOLLARS]
-                            .replace(np.NaN, "No responde")
-                            .value_counts(),
-                            title="¿Cobras en dólares?",
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-            with tabs[1]:
-                if (
-                    config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
-                ) not in df.columns:
-                    st.warning(
-                        f"""No se encuentra la columna: -{
-                            config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
-                            }- en el archivo"""
-                    )
-                elif (
-                    df[
-                        config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX
-                    ].count()
-                    >= config.MINIMUM_RESPONSES
-                ):
-                    try:
-                        st.plotly_chart(
-                            streamlit_figures.get_horizontal_histogram(
-                                df,
-                                config.LAST_VALUE_EXCHANGE
-                                + config.REWRITTEN_COLUMN_SUFFIX,
-                                None,
-                                xaxis_title="Valor del tipo de cambio",
-                                yaxis_title="Cantidad de respuestas"
-                            ),
-                            theme=None,
-                        )
-                    except Exception as e:
-                        st.error(config.ERROR_MSG)
-                        st.exception(e)
-                else:
-                    st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
-
-            # Salarios en dólares
-            st.markdown("### Salarios en dólares :money_with_wings:")
-
-            # gross salary
-            st.markdown("##### Salario Bruto")
-            tabs = st.tabs(df[config.PAYMENTS_IN_DOLLARS].unique().tolist())
-
-            figurs = {}
-            for n, tab in enumerate(df[config.PAYMENTS_IN_DOLLARS].unique().tolist()):
-                df_aux = df.loc[
-                    df[config.PAYMENTS_IN_DOLLARS] == tab, config.GROSS_SALARY
-                ]
-                fig = px.histogram(
-                    df_aux,
-                    x=df_aux,
-                    marginal="box",
-                    title="¿Cobras en dólares? " + tab,
-                )
-                fig.update_layout(
-                    yaxis_title="Cantidad de respuestas",
-                    xaxis_title="Valores salariales"
-                )
+            X = df_aux[config.YEARS_OF_EXPERIENCE].values + 0.1
 
-                figurs[tab] = fig
-
-                with tabs[n]:
-                    try:
-                        st.plotly_chart(figurs[tab], theme=None)
-                    except Exception as e:
-                        st.error(config.ERROR_MSG)
-                        st.exception(e)
-
-            df_aux = (
-                df.loc[
-                    (df[config.GROSS_SALARY].notna())
-                    & (df[config.YEARS_OF_EXPERIENCE].notna())
-                ]
-                .groupby([config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE])[
-                    config.GROSS_SALARY
-                ]
-                .median()
-                .reset_index()
+            fig = px.scatter(
+                df_aux,
+                y=df_aux[config.NET_SALARY].values,
+                x=df_aux[config.YEARS_OF_EXPERIENCE].values,
+                color=df_aux[config.PAYMENTS_IN_DOLLARS].values,
+                opacity=1,
+                labels={
+                    "x": config.YEARS_OF_EXPERIENCE,
+                    "y": "Mediana del slario neto",
+                    "color": "¿Cobras en dolares?"
+                },
+                title="Tendencia de sueldos segun experiencia y tipo de salario",
             )
-            #
-            if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
-                type_salary_usd = np.unique(df[config.PAYMENTS_IN_DOLLARS])
-
-                df_aux = (
-                    df.loc[
-                        (df[config.GROSS_SALARY].notna())
-                        & (df[config.YEARS_OF_EXPERIENCE].notna())
-                    ]
-                    .groupby([config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE])[
-                        config.GROSS_SALARY
-                    ]
-                    .median()
-                    .reset_index()
-                )
-
-                X = df_aux[config.YEARS_OF_EXPERIENCE].values.reshape(-1, 1) + 0.1
-                y = df_aux[config.GROSS_SALARY].values.reshape(-1, 1)
-
-                fig = px.scatter(
-                    df_aux,
-                    y=df_aux[config.GROSS_SALARY].values,
-                    x=df_aux[config.YEARS_OF_EXPERIENCE].values,
-                    color=df_aux[config.PAYMENTS_IN_DOLLARS].values,
-                    opacity=1,
-                    labels={
-                        "x": config.YEARS_OF_EXPERIENCE,
-                        "y": "Mediana del slario bruto",
-                        "color": "¿Cobras en dolares?"
-                    },
-                    title="Tendencia de sueldos segun experiencia y tipo de salario",
-                )
-
-                modelos = {}
-                for type_salary in type_salary_usd:
-                    X_genero = X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary]
-                    y_genero = y[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary]
-                    modelos[type_salary] = LinearRegression()
-                    modelos[type_salary].fit(np.log(X_genero), y_genero)
-
-                for type_salary in type_salary_usd:
-                    angular_coefficient = modelos[type_salary].coef_[0]
-                    intercept = modelos[type_salary].intercept_
-                    log_X = (
-                        np.log(
-                            X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary] + 0.1
-                        ).flatten())
-                    fig.add_trace(
-                        go.Scatter(
-                            x=X[
-                                df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary
-                            ].flatten(),
-                            y=angular_coefficient * log_X + intercept,
-                            mode="lines",
-                            name=type_salary,
-                        )
-                    )
-
-                try:
-                    st.plotly_chart(fig, theme=None)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-            # net salary
-            st.markdown("##### Salario Neto")
-            tabs = st.tabs(df[config.PAYMENTS_IN_DOLLARS].unique().tolist())
-
-            figurs = {}
-            for n, tab in enumerate(df[config.PAYMENTS_IN_DOLLARS].unique().tolist()):
-                df_aux = df.loc[
-                    df[config.PAYMENTS_IN_DOLLARS] == tab, config.NET_SALARY
-                ]
-                fig = px.histogram(
-                    df_aux,
-                    x=df_aux,
-                    marginal="box",
-                    title="¿Cobras en dólares? " + tab,
-                )
-                fig.update_layout(
-                    yaxis_title="Cantidad de respuestas",
-                    xaxis_title="Valores salariales"
-                )
 
-                figurs[tab] = fig
-
-                with tabs[n]:
-                    try:
-                        st.plotly_chart(figurs[tab], theme=None)
-                    except Exception as e:
-                        st.error(config.ERROR_MSG)
-                        st.exception(e)
-
-            df_aux = (
-                df.loc[
-                    (df[config.NET_SALARY].notna())
-                    & (df[config.YEARS_OF_EXPERIENCE].notna())
-                ]
-                .groupby([config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE])[
-                    config.NET_SALARY
-                ]
-                .median()
-                .reset_index()
+            modelos = trends.get_log_trends(
+                cube,
+                "net_by_payment_and_experience",
+                config.YEARS_OF_EXPERIENCE,
+                config.NET_SALARY,
+                config.PAYMENTS_IN_DOLLARS,
             )
 
-            ###
-            if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
-                type_salary_usd = np.unique(df[config.PAYMENTS_IN_DOLLARS])
-
-                df_aux = (
-                    df.loc[
-                        (df[config.NET_SALARY].notna())
-                        & (df[config.YEARS_OF_EXPERIENCE].notna())
-                    ]
-                    .groupby([config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE])[
-                        config.NET_SALARY
-                    ]
-                    .median()
-                    .reset_index()
-                )
-
-                X = df_aux[config.YEARS_OF_EXPERIENCE].values.reshape(-1, 1) + 0.1
-                y = df_aux[config.NET_SALARY].values.reshape(-1, 1)
-
-                fig = px.scatter(
-                    df_aux,
-                    y=df_aux[config.NET_SALARY].values,
-                    x=df_aux[config.YEARS_OF_EXPERIENCE].values,
-                    color=df_aux[config.PAYMENTS_IN_DOLLARS].values,
-                    opacity=1,
-                    labels={
-                        "x": config.YEARS_OF_EXPERIENCE,
-                        "y": "Mediana del slario neto",
-                        "color": "¿Cobras en dolares?"
-                    },
-                    title="Tendencia de sueldos segun experiencia y tipo de salario",
+            for type_salary in type_salary_usd:
+                if type_salary not in modelos:
+                    continue
+                angular_coefficient, intercept = modelos[type_salary]
+                log_X = np.log(
+                    X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary] + 0.1
                 )
-
-                modelos = {}
-                for type_salary in type_salary_usd:
-                    X_genero = X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary]
-                    y_genero = y[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary]
-                    modelos[type_salary] = LinearRegression()
-                    modelos[type_salary].fit(np.log(X_genero), y_genero)
-
-                for type_salary in type_salary_usd:
-                    angular_coefficient = modelos[type_salary].coef_[0]
-                    intercept = modelos[type_salary].intercept_
-                    log_X = (
-                        np.log(
-                            X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary] + 0.1
-                        ).flatten())
-                    fig.add_trace(
-                        go.Scatter(
-                            x=X[
-                                df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary
-                            ].flatten(),
-                            y=angular_coefficient * log_X + intercept,
-                            mode="lines",
-                            name=type_salary,
-                        )
+                fig.add_trace(
+                    go.Scatter(
+                        x=X[df_aux[config.PAYMENTS_IN_DOLLARS] == type_salary],
+                        y=angular_coefficient * log_X + intercept,
+                        mode="lines",
+                        name=type_salary,
                     )
-
-                try:
-                    st.plotly_chart(fig, theme=None)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-            payments = df[config.PAYMENTS_IN_DOLLARS].unique().tolist()
-            if len(payments) == 1 and payments[0] == "Cobro todo el salario en dólares":
-                st.markdown("### Salarios de ARG -> USD :money_with_wings:")
-                tabs = st.tabs(
-                    [
-                        "Salario Bruto",
-                        "Salario Neto",
-                    ]
                 )
-                with tabs[0]:
-                    try:
-                        df_ax = df[
-                            (
-                                df[config.PAYMENTS_IN_DOLLARS]
-                                == "Cobro todo el salario en dólares"
-                            )
-                            & (df[config.LAST_VALUE_EXCHANGE].notnull())
-                            & (df[config.GROSS_SALARY].notnull())
-                        ]
-
-                        df_ax = (
-                            (
-                                df_ax[config.GROSS_SALARY]
-                                / df_ax[config.LAST_VALUE_EXCHANGE]
-                            )
-                            .reset_index()
-                            .rename(columns={0: "Salarios en USD"})
-                        )
-
-                        st.plotly_chart(
-                            streamlit_figures.get_horizontal_histogram(
-                                df_ax,
-                                "Salarios en USD",
-                                category_order=None,
-                                marginal="box",
-                            ),
-                            theme=None,
-                        )
-                    except Exception as e:
-                        st.error(config.ERROR_MSG)
-                        st.exception(e)
-                with tabs[1]:
-                    try:
-                        df_ax = df[
-                            (
-                                df[config.PAYMENTS_IN_DOLLARS]
-                                == "Cobro todo el salario en dólares"
-                            )
-                            & (df[config.LAST_VALUE_EXCHANGE].notnull())
-                            & (df[config.NET_SALARY].notnull())
-                        ]
-                        df_ax = (
-                            (
-                                df_ax[config.NET_SALARY]
-                                / df_ax[config.LAST_VALUE_EXCHANGE]
-                            )
-                            .reset_index()
-                            .rename(columns={0: "Salarios en USD"})
-                        )
-
-                        st.plotly_chart(
-                            streamlit_figures.get_horizontal_histogram(
-                                df_ax,
-                                "Salarios en USD",
-                                category_order=None,
-                                marginal="box",
-                            ),
-                            theme=None,
-                        )
-                    except Exception as e:
-                        st.error(config.ERROR_MSG)
-                        st.exception(e)
-
-        # Regiones
-        st.markdown("### Regiones :world_map:")
-        tabs = st.tabs([":world_map:"])
+            return fig
 
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_histogram(df, config.PROVINCES),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+        try:
+            _plot_chart(cube, "dollars/net_trend", build, theme=None)
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
 
-        # Genero y edades
-        st.markdown("### Genero y edades :birthday:")
+    if cube["unique"][config.PAYMENTS_IN_DOLLARS] == [config.ALL_SALARY_IN_DOLLARS]:
+        st.markdown("### Salarios de ARG -> USD :money_with_wings:")
         tabs = st.tabs(
             [
-                "Generos",
-                "Edades",
-                "Edades agrupadas",
+                "Salario Bruto",
+                "Salario Neto",
             ]
         )
-
         with tabs[0]:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_pie(
-                        df[config.GENDER].value_counts(),
-                        title="Generos"
-                    ),
-                    theme=None,
+                counts, box = aggregates.get_distribution(
+                    cube, config.GROSS_SALARY + " - USD"
                 )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-
-        with tabs[1]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.AGE,
+                _plot_chart(
+                    cube,
+                    "dollars/gross_usd",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        "Salarios en USD",
                         category_order=None,
-                        marginal="box",
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Edades"
+                        box=box,
                     ),
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[2]:
+        with tabs[1]:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.AGE + config.REWRITTEN_COLUMN_SUFFIX,
-                        streamlit_order_plots.get_order(
-                            df[config.AGE + config.REWRITTEN_COLUMN_SUFFIX].unique()
-                        ),
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Edades"
+                counts, box = aggregates.get_distribution(
+                    cube, config.NET_SALARY + " - USD"
+                )
+                _plot_chart(
+                    cube,
+                    "dollars/net_usd",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        "Salarios en USD",
+                        category_order=None,
+                        box=box,
                     ),
                     theme=None,
                 )
@@ -533,97 +429,205 @@ def display_dashboard(df):
                 st.error(config.ERROR_MSG)
                 st.exception(e)
 
-        # Experiencia
-        st.markdown("### Experiencia :brain:")
-        tabs = st.tabs(
-            [
-                config.YEARS_OF_EXPERIENCE,
-                "Antiguedad en la empresa",
-                "Tiempo en el actual puesto",
-                "Relacion entre experiencia y antiguedad en la empresa",
-            ]
-        )
 
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.YEARS_OF_EXPERIENCE + config.REWRITTEN_COLUMN_SUFFIX,
+def display_regions(cube):
+    st.markdown("### Regiones :world_map:")
+    tabs = st.tabs([":world_map:"])
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "regions/provinces",
+                lambda: streamlit_figures.get_vertical_histogram_from_counts(
+                    aggregates.get_counts(cube, config.PROVINCES),
+                    config.PROVINCES,
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+def display_gender_and_ages(cube):
+    st.markdown("### Genero y edades :birthday:")
+    tabs = st.tabs(
+        [
+            "Generos",
+            "Edades",
+            "Edades agrupadas",
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "gender/genders",
+                lambda: streamlit_figures.get_pie(
+                    aggregates.get_counts(cube, config.GENDER),
+                    title="Generos"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[1]:
+        try:
+            counts, box = aggregates.get_distribution(cube, config.AGE)
+            _plot_chart(
+                cube,
+                "gender/ages",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    config.AGE,
+                    category_order=None,
+                    box=box,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Edades"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[2]:
+        try:
+            column = config.AGE + config.REWRITTEN_COLUMN_SUFFIX
+            counts = aggregates.get_counts(cube, column)
+            _plot_chart(
+                cube,
+                "gender/age_groups",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    column,
+                    streamlit_order_plots.get_category_order(
+                        counts.index.tolist(),
+                        aggregates.get_categories(cube, column),
+                    ),
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Edades"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+def display_experience(cube):
+    px = _express()
+
+    st.markdown("### Experiencia :brain:")
+    tabs = st.tabs(
+        [
+            config.YEARS_OF_EXPERIENCE,
+            "Antiguedad en la empresa",
+            "Tiempo en el actual puesto",
+            "Relacion entre experiencia y antiguedad en la empresa",
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            column = config.YEARS_OF_EXPERIENCE + config.REWRITTEN_COLUMN_SUFFIX
+            counts = aggregates.get_counts(cube, column)
+            _plot_chart(
+                cube,
+                "experience/years",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    column,
+                    streamlit_order_plots.get_category_order(
+                        counts.index.tolist(),
+                        aggregates.get_categories(cube, column),
                         streamlit_order_plots.FIBO_ORDER,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Años de experiencia"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-
-        with tabs[1]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.TIME_IN_CURRENT_COMPANY + config.REWRITTEN_COLUMN_SUFFIX,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Años de experiencia"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[1]:
+        try:
+            column = config.TIME_IN_CURRENT_COMPANY + config.REWRITTEN_COLUMN_SUFFIX
+            counts = aggregates.get_counts(cube, column)
+            _plot_chart(
+                cube,
+                "experience/company",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    column,
+                    streamlit_order_plots.get_category_order(
+                        counts.index.tolist(),
+                        aggregates.get_categories(cube, column),
                         streamlit_order_plots.FIBO_ORDER,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Años de antiguedad"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-
-        with tabs[2]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.TIME_IN_CURRENT_ROLE + config.REWRITTEN_COLUMN_SUFFIX,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Años de antiguedad"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[2]:
+        try:
+            column = config.TIME_IN_CURRENT_ROLE + config.REWRITTEN_COLUMN_SUFFIX
+            counts = aggregates.get_counts(cube, column)
+            _plot_chart(
+                cube,
+                "experience/role",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    counts,
+                    column,
+                    streamlit_order_plots.get_category_order(
+                        counts.index.tolist(),
+                        aggregates.get_categories(cube, column),
                         streamlit_order_plots.FIBO_ORDER,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Años en el puesto actual"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Años en el puesto actual"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[3]:
+        if cube["answered"][config.YEARS_OF_EXPERIENCE] >= config.MINIMUM_RESPONSES:
+            try:
+                # each pair of values once, with its number of answers
+                def build():
+                    df_aux = aggregates.get_frame(cube, "experience_and_company")
+                    answered = df_aux[config.TIME_IN_CURRENT_COMPANY].notna()
+
+                    X = df_aux.loc[answered, config.YEARS_OF_EXPERIENCE].values
 
-        with tabs[3]:
-            if df[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
-                try:
-                    X = df.loc[
-                        df[config.YEARS_OF_EXPERIENCE].notna()
-                        & df[config.TIME_IN_CURRENT_COMPANY].notna(),
+                    angular_coefficient, intercept = trends.get_linear_trend(
+                        cube,
+                        "experience_and_company",
                         config.YEARS_OF_EXPERIENCE,
-                    ].values.reshape(-1, 1)
-
-                    model = LinearRegression()
-                    model.fit(
-                        X,
-                        df.loc[
-                            df[config.YEARS_OF_EXPERIENCE].notna()
-                            & df[config.TIME_IN_CURRENT_COMPANY].notna(),
-                            config.TIME_IN_CURRENT_COMPANY,
-                        ].values,
+                        config.TIME_IN_CURRENT_COMPANY,
+                        "count",
                     )
 
                     x_range = np.linspace(X.min(), X.max(), 100)
-                    y_range = model.predict(x_range.reshape(-1, 1))
+                    y_range = angular_coefficient * x_range + intercept
 
                     fig = px.scatter(
-                        df,
-                        x=df.loc[
-                            df[config.YEARS_OF_EXPERIENCE].notna(),
-                            config.YEARS_OF_EXPERIENCE,
-                        ],
-                        y=df.loc[
-                            df[config.YEARS_OF_EXPERIENCE].notna(),
-                            config.TIME_IN_CURRENT_COMPANY,
-                        ],
+                        df_aux,
+                        x=df_aux[config.YEARS_OF_EXPERIENCE],
+                        y=df_aux[config.TIME_IN_CURRENT_COMPANY],
                         opacity=0.35,
                         labels={
                             "y": "Años en la empresa",
@@ -638,114 +642,106 @@ def display_dashboard(df):
                                     name="Tendencia (Ayuda visual)"
                                     )
                     )
-                    st.plotly_chart(fig, theme=None)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-            else:
-                st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
-
-        st.markdown("***El símbolo  \")\" indica que el límite no está incluido en el intervalo.***")
-
-        # Education
-        st.markdown("### Educacion :mortar_board:")
-        tabs = st.tabs(
-            [
-                config.CAREER,
-                config.STUDIES_STATE,
-                config.MAX_LVL_STUDIES,
-            ]
-        )
-
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_histogram(
-                        df, config.CAREER + config.REWRITTEN_COLUMN_SUFFIX
-                    ),
-                    use_container_width=True,
-                    theme=None,
-                    yaxis_title="",
-                    xaxis_title="Cantidad de respuestas",
-                )
-                df[config.CAREER].fillna("No Contesta", inplace=True)
-                total_count = len(df)
-                total_na = df[config.CAREER].eq("No Contesta").sum()
-                perc = (total_na / total_count) * 100
-
-                st.markdown(
-                    f"**El %{perc:.2f}({total_na}) del total({total_count}) no contesto esta pregunta.**"
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+                    return fig
 
-        with tabs[1]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_pie(
-                        df[config.STUDIES_STATE].value_counts(),
-                        title="Estado de la carrera",
-                    ),
-                    theme=None,
-                )
+                _plot_chart(cube, "experience/company_trend", build, theme=None)
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-
-        with tabs[2]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_histogram(
-                        df,
-                        config.MAX_LVL_STUDIES,
-                        norm="percent",
-                        yaxis_title="",
-                        xaxis_title="Porcentaje",
+        else:
+            st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
+
+    st.markdown("***El símbolo  \")\" indica que el límite no está incluido en el intervalo.***")
+
+
+def display_education(cube):
+    px = _express()
+
+    st.markdown("### Educacion :mortar_board:")
+    tabs = st.tabs(
+        [
+            config.CAREER,
+            config.STUDIES_STATE,
+            config.MAX_LVL_STUDIES,
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "education/career",
+                lambda: streamlit_figures.get_vertical_histogram_from_counts(
+                    aggregates.get_counts(
+                        cube, config.CAREER + config.REWRITTEN_COLUMN_SUFFIX
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+                    config.CAREER + config.REWRITTEN_COLUMN_SUFFIX,
+                ),
+                use_container_width=True,
+                theme=None,
+                yaxis_title="",
+                xaxis_title="Cantidad de respuestas",
+            )
+            total_count = cube["rows"]
+            total_na = total_count - cube["answered"][config.CAREER]
+            perc = (total_na / total_count) * 100
 
-        # Salary based on highest level of studies
-        st.markdown("### Salario en base al nivel de estudios")
-        tabs = st.tabs(
-            [
-                "Salario Bruto",
-                "Salario Neto",
-            ]
-        )
-        with tabs[0]:
-            df_aux = (
-                df.loc[
-                    (df[config.GROSS_SALARY].notna())
-                    & (df[config.YEARS_OF_EXPERIENCE].notna())
-                ]
-                .groupby([config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE])[
-                    config.GROSS_SALARY
-                ]
-                .median()
-                .reset_index()
+            st.markdown(
+                f"**El %{perc:.2f}({total_na}) del total({total_count}) no contesto esta pregunta.**"
             )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[1]:
+        try:
+            _plot_chart(
+                cube,
+                "education/state",
+                lambda: streamlit_figures.get_pie(
+                    aggregates.get_counts(cube, config.STUDIES_STATE),
+                    title="Estado de la carrera",
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[2]:
+        try:
+            _plot_chart(
+                cube,
+                "education/level",
+                lambda: streamlit_figures.get_vertical_histogram_from_counts(
+                    aggregates.get_counts(cube, config.MAX_LVL_STUDIES),
+                    config.MAX_LVL_STUDIES,
+                    norm="percent",
+                    yaxis_title="",
+                    xaxis_title="Porcentaje",
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    # Salary based on highest level of studies
+    st.markdown("### Salario en base al nivel de estudios")
+    tabs = st.tabs(
+        [
+            "Salario Bruto",
+            "Salario Neto",
+        ]
+    )
+    with tabs[0]:
+        df_aux = aggregates.get_frame(cube, "gross_by_studies_and_experience")
 
-            if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
-                studies = np.unique(df[config.MAX_LVL_STUDIES])
-                df_aux = (
-                    df.loc[
-                        (df[config.GROSS_SALARY].notna())
-                        & (df[config.YEARS_OF_EXPERIENCE].notna())
-                    ]
-                    .groupby([config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE])[
-                        config.GROSS_SALARY
-                    ]
-                    .median()
-                    .reset_index()
-                )
+        if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
+            def build():
+                studies = np.unique(df_aux[config.MAX_LVL_STUDIES])
 
-                X = df_aux[config.YEARS_OF_EXPERIENCE].values.reshape(-1, 1) + 0.1
-                y = df_aux[config.GROSS_SALARY].values.reshape(-1, 1)
+                X = df_aux[config.YEARS_OF_EXPERIENCE].values + 0.1
 
                 fig = px.scatter(
                     df_aux,
@@ -762,65 +758,43 @@ def display_dashboard(df):
                     title="tendencia de salarios segun experiencia, separado por estudios",
                 )
 
-                modelos = {}
-                for studie in studies:
-                    if sum(df_aux[config.MAX_LVL_STUDIES] == studie) > 0:
-                        X_genero = X[df_aux[config.MAX_LVL_STUDIES] == studie]
-                        y_genero = y[df_aux[config.MAX_LVL_STUDIES] == studie]
-                        modelos[studie] = LinearRegression()
-                        modelos[studie].fit(np.log(X_genero), y_genero)
+                modelos = trends.get_log_trends(
+                    cube,
+                    "gross_by_studies_and_experience",
+                    config.YEARS_OF_EXPERIENCE,
+                    config.GROSS_SALARY,
+                    config.MAX_LVL_STUDIES,
+                )
 
                 for studie in studies:
-                    if sum(df_aux[config.MAX_LVL_STUDIES] == studie) > 0:
-                        angular_coefficient = modelos[studie].coef_[0]
-                        intercept = modelos[studie].intercept_
-                        fig.add_trace(
-                            go.Scatter(
-                                x=X[df_aux[config.MAX_LVL_STUDIES] == studie].flatten(),
-                                y=angular_coefficient
-                                * np.log(
-                                    X[df_aux[config.MAX_LVL_STUDIES] == studie] + 0.1
-                                ).flatten()
-                                + intercept,
-                                mode="lines",
-                                name=studie,
+                    angular_coefficient, intercept = modelos[studie]
+                    fig.add_trace(
+                        go.Scatter(
+                            x=X[df_aux[config.MAX_LVL_STUDIES] == studie],
+                            y=angular_coefficient
+                            * np.log(
+                                X[df_aux[config.MAX_LVL_STUDIES] == studie] + 0.1
                             )
+                            + intercept,
+                            mode="lines",
+                            name=studie,
                         )
+                    )
+                return fig
 
-                try:
-                    st.plotly_chart(fig, theme=None)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-        with tabs[1]:
-            df_aux = (
-                df.loc[
-                    (df[config.NET_SALARY].notna())
-                    & (df[config.YEARS_OF_EXPERIENCE].notna())
-                ]
-                .groupby([config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE])[
-                    config.NET_SALARY
-                ]
-                .median()
-                .reset_index()
-            )
+            try:
+                _plot_chart(cube, "education/gross_trend", build, theme=None)
+            except Exception as e:
+                st.error(config.ERROR_MSG)
+                st.exception(e)
+    with tabs[1]:
+        df_aux = aggregates.get_frame(cube, "net_by_studies_and_experience")
 
-            if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
-                studies = np.unique(df[config.MAX_LVL_STUDIES])
-                df_aux = (
-                    df.loc[
-                        (df[config.NET_SALARY].notna())
-                        & (df[config.YEARS_OF_EXPERIENCE].notna())
-                    ]
-                    .groupby([config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE])[
-                        config.NET_SALARY
-                    ]
-                    .median()
-                    .reset_index()
-                )
+        if df_aux[config.YEARS_OF_EXPERIENCE].count() >= config.MINIMUM_RESPONSES:
+            def build():
+                studies = np.unique(df_aux[config.MAX_LVL_STUDIES])
 
-                X = df_aux[config.YEARS_OF_EXPERIENCE].values.reshape(-1, 1) + 0.1
-                y = df_aux[config.NET_SALARY].values.reshape(-1, 1)
+                X = df_aux[config.YEARS_OF_EXPERIENCE].values + 0.1
 
                 fig = px.scatter(
                     df_aux,
@@ -836,488 +810,510 @@ def display_dashboard(df):
                     title="tendencia de salarios segun experiencia, separado por estudios",
                 )
 
-                modelos = {}
-                for studie in studies:
-                    if sum(df_aux[config.MAX_LVL_STUDIES] == studie) > 0:
-                        X_genero = X[df_aux[config.MAX_LVL_STUDIES] == studie]
-                        y_genero = y[df_aux[config.MAX_LVL_STUDIES] == studie]
-                        modelos[studie] = LinearRegression()
-                        modelos[studie].fit(np.log(X_genero), y_genero)
+                modelos = trends.get_log_trends(
+                    cube,
+                    "net_by_studies_and_experience",
+                    config.YEARS_OF_EXPERIENCE,
+                    config.NET_SALARY,
+                    config.MAX_LVL_STUDIES,
+                )
 
                 for studie in studies:
-                    if sum(df_aux[config.MAX_LVL_STUDIES] == studie) > 0:
-                        angular_coefficient = modelos[studie].coef_[0]
-                        intercept = modelos[studie].intercept_
-                        fig.add_trace(
-                            go.Scatter(
-                                x=X[df_aux[config.MAX_LVL_STUDIES] == studie].flatten(),
-                                y=angular_coefficient
-                                * np.log(
-                                    X[df_aux[config.MAX_LVL_STUDIES] == studie] + 0.1
-                                ).flatten()
-                                + intercept,
-                                mode="lines",
-                                name=studie,
+                    angular_coefficient, intercept = modelos[studie]
+                    fig.add_trace(
+                        go.Scatter(
+                            x=X[df_aux[config.MAX_LVL_STUDIES] == studie],
+                            y=angular_coefficient
+                            * np.log(
+                                X[df_aux[config.MAX_LVL_STUDIES] == studie] + 0.1
                             )
+                            + intercept,
+                            mode="lines",
+                            name=studie,
                         )
+                    )
+                return fig
+
+            try:
+                _plot_chart(cube, "education/net_trend", build, theme=None)
+            except Exception as e:
+                st.error(config.ERROR_MSG)
+                st.exception(e)
 
-                try:
-                    st.plotly_chart(fig, theme=None)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
 
-        # Bootcamp
-        st.markdown("### Bootcamp :books:")
-        tabs = st.tabs([config.BOOTCAMP, "¿Cual?", config.TRAINING_IN])
+def display_bootcamp(cube):
+    px = _express()
 
-        with tabs[0]:
-            try:
-                serie = df[config.BOOTCAMP].notna().value_counts().reset_index()
+    st.markdown("### Bootcamp :books:")
+    tabs = st.tabs([config.BOOTCAMP, "¿Cual?", config.TRAINING_IN])
+
+    with tabs[0]:
+        try:
+            def build():
+                answered = cube["answered"][config.BOOTCAMP]
+                serie = pd.Series(
+                    {"Si": answered, "No": cube["rows"] - answered}
+                )
+                serie = serie[serie > 0]
 
-                serie["index"].replace({True: "Si", False: "No"}, inplace=True)
-                # serie
                 fig = px.pie(
                     serie,
-                    names=serie["index"],
-                    values=serie[config.BOOTCAMP],
+                    names=serie.index,
+                    values=serie.values,
                     hole=0.4,
                 )
 
                 fig.update(layout_title_text=config.BOOTCAMP)
+                return fig
 
-                st.plotly_chart(fig, theme=None)
-
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-
-        with tabs[1]:
-            if len(df[df[config.BOOTCAMP].notna()]) == 0:
-                st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_vertical_graph_from_serie(
-                            serie=pd.Series(
-                                sum(
-                                    df[df[config.BOOTCAMP].notnull()][
-                                        config.BOOTCAMP
-                                    ].apply(
-                                        lambda x: x.split(" - ")
-                                        if type(x) == str
-                                        else x
-                                    ),
-                                    [],
-                                )
-                            ).value_counts(),
-                            title=config.BOOTCAMP,
-                            yaxis_title="",
-                            xaxis_title="Cantidad de participantes",
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-        with tabs[2]:
-            if config.TRAINING_IN not in df.columns:
-                st.warning(
-                    f"No se encuentra la columna: -{config.TRAINING_IN}- en el archivo"
-                )
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_vertical_graph_from_serie(
-                            df[config.TRAINING_IN].value_counts(),
-                            "¿De que trato Boot Camp?",
-                            yaxis_title="",
-                            xaxis_title="Cantidad de participantes",
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-        # Contrato laboral
-        st.markdown("### Contrato laboral :scroll:")
-        tabs = st.tabs(
-            [
-                config.CONTRACT,
-                config.EMPLOYMENT_STATUS,
-                config.WORK_MODALITY,
-                "¿Cuántos días a la semana vas a la oficina?",
-                config.ORGANIZATION_SIZE,
-            ]
-        )
+            _plot_chart(cube, "bootcamp/bootcamp", build, theme=None)
 
-        with tabs[0]:
-            if config.CONTRACT not in df.columns:
-                st.warning(
-                    f"No se encuentra la columna: -{config.CONTRACT}- en el archivo"
-                )
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_pie(
-                            df[config.CONTRACT].value_counts(), title=config.CONTRACT
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-        with tabs[1]:
-            if config.EMPLOYMENT_STATUS not in df.columns:
-                st.warning(
-                    f"No se encuentra la columna: -{config.EMPLOYMENT_STATUS}- en el archivo"
-                )
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_pie(
-                            df[config.EMPLOYMENT_STATUS].value_counts(),
-                            title=config.CONTRACT,
-                        ),
-                        theme=None,
-                    )
-                    st.markdown(
-                        f"***Encuestados totales: {df[config.EMPLOYMENT_STATUS].count()}***"
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-        with tabs[2]:
-            if config.WORK_MODALITY not in df.columns:
-                st.warning(
-                    f"No se encuentra la columna: -{config.WORK_MODALITY}- en el archivo"
-                )
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_pie(
-                            df[config.WORK_MODALITY].value_counts(),
-                            title=config.WORK_MODALITY,
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-        with tabs[3]:
-            if (
-                config.DAYS_IN_OFFICE in df.columns
-                and "Híbrido (presencial y remoto)" in df[config.WORK_MODALITY].unique()
-            ):
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_horizontal_histogram(
-                            df[
-                                df[config.WORK_MODALITY]
-                                == "Híbrido (presencial y remoto)"
-                            ],
-                            config.DAYS_IN_OFFICE + config.REWRITTEN_COLUMN_SUFFIX,
-                            streamlit_order_plots.ORDER_5,
-                            yaxis_title="Cantidad de respuestas",
-                            xaxis_title="Días de trabajo en la oficina por semana."
-                        ),
-                        theme=None,
-                    )
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-            else:
-                st.warning(
-                    f"No se encuentra la columna: -{config.DAYS_IN_OFFICE}- en el archivo"
-                )
-        with tabs[4]:
-            if config.DEPENDENTS not in df.columns:
-                st.warning(
-                    f"No se encuentra la columna: -{config.DEPENDENTS}- en el archivo"
-                )
-            else:
-                try:
-                    st.plotly_chart(
-                        streamlit_figures.get_horizontal_histogram(
-                            df,
-                            config.DEPENDENTS + config.REWRITTEN_COLUMN_SUFFIX,
-                            streamlit_order_plots.FIBO_ORDER,
-                            yaxis_title="Cantidad de respuestas",
-                            xaxis_title="Cantidad de gente a cargo"
-                        ),
-                        theme=None,
-                    )
-                    st.markdown(r"""
-                        ***El símbolo  \")\" indica que el límite
-                        no está incluido en el intervalo.***
-                        """)
-                except Exception as e:
-                    st.error(config.ERROR_MSG)
-                    st.exception(e)
-
-        # Herramientas
-        st.markdown("### Herramientas :toolbox:")
-        tabs = st.tabs(
-            [
-                "Plataformas",
-                "Lenguajes",
-                "Frameworks",
-                config.DATABASES_COLUMN,
-                "Testing",
-            ]
-        )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
 
-        with tabs[0]:
+    with tabs[1]:
+        if cube["answered"][config.BOOTCAMP] == 0:
+            st.warning("Faltan muestras, no fue posible desplegar el gráfico.")
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.PLATFORMS_COLUMN].notnull()][
-                                    config.PLATFORMS_COLUMN
-                                ].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title=config.PLATFORMS_COLUMN,
+                _plot_chart(
+                    cube,
+                    "bootcamp/which",
+                    lambda: streamlit_figures.get_vertical_graph_from_serie(
+                        serie=aggregates.get_counts(
+                            cube, config.BOOTCAMP, tags=True
+                        ),
+                        title=config.BOOTCAMP,
                         yaxis_title="",
-                        xaxis_title="Cantidad de respuestas"
+                        xaxis_title="Cantidad de participantes",
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[1]:
+
+    with tabs[2]:
+        if config.TRAINING_IN not in cube["columns"]:
+            st.warning(
+                f"No se encuentra la columna: -{config.TRAINING_IN}- en el archivo"
+            )
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.LANGUAGES].notnull()][
-                                    config.LANGUAGES
-                                ].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title=config.LANGUAGES,
+                _plot_chart(
+                    cube,
+                    "bootcamp/training",
+                    lambda: streamlit_figures.get_vertical_graph_from_serie(
+                        aggregates.get_counts(cube, config.TRAINING_IN),
+                        "¿De que trato Boot Camp?",
                         yaxis_title="",
-                        xaxis_title="Cantidad de respuestas"
+                        xaxis_title="Cantidad de participantes",
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[2]:
+
+
+def display_contract(cube):
+    st.markdown("### Contrato laboral :scroll:")
+    tabs = st.tabs(
+        [
+            config.CONTRACT,
+            config.EMPLOYMENT_STATUS,
+            config.WORK_MODALITY,
+            "¿Cuántos días a la semana vas a la oficina?",
+            config.ORGANIZATION_SIZE,
+        ]
+    )
+
+    with tabs[0]:
+        if config.CONTRACT not in cube["columns"]:
+            st.warning(
+                f"No se encuentra la columna: -{config.CONTRACT}- en el archivo"
+            )
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.FRAMEWORKS].notnull()][
-                                    config.FRAMEWORKS
-                                ].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title=config.FRAMEWORKS,
-                        yaxis_title="",
-                        xaxis_title="Cantidad de respuestas"
+                _plot_chart(
+                    cube,
+                    "contract/contract",
+                    lambda: streamlit_figures.get_pie(
+                        aggregates.get_counts(cube, config.CONTRACT),
+                        title=config.CONTRACT,
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[3]:
+    with tabs[1]:
+        if config.EMPLOYMENT_STATUS not in cube["columns"]:
+            st.warning(
+                f"No se encuentra la columna: -{config.EMPLOYMENT_STATUS}- en el archivo"
+            )
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.DATABASES_COLUMN].notnull()][
-                                    config.DATABASES_COLUMN
-                                ].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title=config.DATABASES_COLUMN,
-                        yaxis_title="",
-                        xaxis_title="Cantidad de respuestas"
+                _plot_chart(
+                    cube,
+                    "contract/status",
+                    lambda: streamlit_figures.get_pie(
+                        aggregates.get_counts(cube, config.EMPLOYMENT_STATUS),
+                        title=config.CONTRACT,
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
+                st.markdown(
+                    f"***Encuestados totales: {cube['answered'][config.EMPLOYMENT_STATUS]}***"
+                )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[4]:
+    with tabs[2]:
+        if config.WORK_MODALITY not in cube["columns"]:
+            st.warning(
+                f"No se encuentra la columna: -{config.WORK_MODALITY}- en el archivo"
+            )
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.QA].notnull()][config.QA].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title=config.QA,
-                        yaxis_title="",
-                        xaxis_title="Cantidad de respuestas"
+                _plot_chart(
+                    cube,
+                    "contract/modality",
+                    lambda: streamlit_figures.get_pie(
+                        aggregates.get_counts(cube, config.WORK_MODALITY),
+                        title=config.WORK_MODALITY,
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-
-        # Bono y beneficios
-        st.markdown("### Bonos y Beneficios :gift:")
-        tabs = st.tabs([config.BONUS, "Beneficios"])
-
-        with tabs[0]:
+    with tabs[3]:
+        days_in_office = (
+            config.DAYS_IN_OFFICE
+            + config.REWRITTEN_COLUMN_SUFFIX
+            + " - "
+            + config.HYBRID_MODALITY
+        )
+        if (
+            days_in_office in cube["counts"]
+            and config.HYBRID_MODALITY in cube["unique"][config.WORK_MODALITY]
+        ):
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_pie(
-                        df[config.BONUS].value_counts(),
-                        title="¿Recibís algún tipo de bono?",
+                _plot_chart(
+                    cube,
+                    "contract/days_in_office",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        aggregates.get_counts(cube, days_in_office),
+                        config.DAYS_IN_OFFICE + config.REWRITTEN_COLUMN_SUFFIX,
+                        streamlit_order_plots.ORDER_5,
+                        yaxis_title="Cantidad de respuestas",
+                        xaxis_title="Días de trabajo en la oficina por semana."
                     ),
                     theme=None,
                 )
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
-        with tabs[1]:
+        else:
+            st.warning(
+                f"No se encuentra la columna: -{config.DAYS_IN_OFFICE}- en el archivo"
+            )
+    with tabs[4]:
+        if config.DEPENDENTS not in cube["columns"]:
+            st.warning(
+                f"No se encuentra la columna: -{config.DEPENDENTS}- en el archivo"
+            )
+        else:
             try:
-                st.plotly_chart(
-                    streamlit_figures.get_vertical_graph_from_serie(
-                        pd.Series(
-                            sum(
-                                df[df[config.BENEFITS].notnull()][
-                                    config.BENEFITS
-                                ].apply(
-                                    lambda x: x.split(" - ") if type(x) == str else x
-                                ),
-                                [],
-                            )
-                        ).value_counts(),
-                        title="Beneficios",
-                        yaxis_title="",
-                        xaxis_title="Número de personas con el beneficio."
+                column = config.DEPENDENTS + config.REWRITTEN_COLUMN_SUFFIX
+                counts = aggregates.get_counts(cube, column)
+                _plot_chart(
+                    cube,
+                    "contract/dependents",
+                    lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                        counts,
+                        column,
+                        streamlit_order_plots.get_category_order(
+                            counts.index.tolist(),
+                            aggregates.get_categories(cube, column),
+                            streamlit_order_plots.FIBO_ORDER,
+                        ),
+                        yaxis_title="Cantidad de respuestas",
+                        xaxis_title="Cantidad de gente a cargo"
                     ),
-                    use_container_width=True,
                     theme=None,
                 )
+                st.markdown(r"""
+                    ***El símbolo  \")\" indica que el límite
+                    no está incluido en el intervalo.***
+                    """)
             except Exception as e:
                 st.error(config.ERROR_MSG)
                 st.exception(e)
 
-        # Conformidad salarial
-        st.markdown("### Conformidad salarial:+1::-1:")
-        tabs = st.tabs(
-            [
-                "Conformidad salarial",
-                "Conformidad salarial semestral",
-                config.WORKPLACE_RECOMMENDATION,
-            ]
-        )
 
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
+def display_tools(cube):
+    st.markdown("### Herramientas :toolbox:")
+    tabs = st.tabs(
+        [
+            "Plataformas",
+            "Lenguajes",
+            "Frameworks",
+            config.DATABASES_COLUMN,
+            "Testing",
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "tools/platforms",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.PLATFORMS_COLUMN, tags=True
+                    ),
+                    title=config.PLATFORMS_COLUMN,
+                    yaxis_title="",
+                    xaxis_title="Cantidad de respuestas"
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[1]:
+        try:
+            _plot_chart(
+                cube,
+                "tools/languages",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.LANGUAGES, tags=True
+                    ),
+                    title=config.LANGUAGES,
+                    yaxis_title="",
+                    xaxis_title="Cantidad de respuestas"
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[2]:
+        try:
+            _plot_chart(
+                cube,
+                "tools/frameworks",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.FRAMEWORKS, tags=True
+                    ),
+                    title=config.FRAMEWORKS,
+                    yaxis_title="",
+                    xaxis_title="Cantidad de respuestas"
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[3]:
+        try:
+            _plot_chart(
+                cube,
+                "tools/databases",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.DATABASES_COLUMN, tags=True
+                    ),
+                    title=config.DATABASES_COLUMN,
+                    yaxis_title="",
+                    xaxis_title="Cantidad de respuestas"
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[4]:
+        try:
+            _plot_chart(
+                cube,
+                "tools/qa",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.QA, tags=True
+                    ),
+                    title=config.QA,
+                    yaxis_title="",
+                    xaxis_title="Cantidad de respuestas"
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+def display_bonus_and_benefits(cube):
+    st.markdown("### Bonos y Beneficios :gift:")
+    tabs = st.tabs([config.BONUS, "Beneficios"])
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "benefits/bonus",
+                lambda: streamlit_figures.get_pie(
+                    aggregates.get_counts(cube, config.BONUS),
+                    title="¿Recibís algún tipo de bono?",
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[1]:
+        try:
+            _plot_chart(
+                cube,
+                "benefits/benefits",
+                lambda: streamlit_figures.get_vertical_graph_from_serie(
+                    aggregates.get_counts(
+                        cube, config.BENEFITS, tags=True
+                    ),
+                    title="Beneficios",
+                    yaxis_title="",
+                    xaxis_title="Número de personas con el beneficio."
+                ),
+                use_container_width=True,
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+def display_salary_compliance(cube):
+    st.markdown("### Conformidad salarial:+1::-1:")
+    tabs = st.tabs(
+        [
+            "Conformidad salarial",
+            "Conformidad salarial semestral",
+            config.WORKPLACE_RECOMMENDATION,
+        ]
+    )
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "compliance/salary",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    aggregates.get_counts(
+                        cube,
                         config.SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX,
-                        streamlit_order_plots.ORDER_1_4,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Conformidad"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-        with tabs[1]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
+                    config.SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX,
+                    streamlit_order_plots.ORDER_1_4,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Conformidad"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[1]:
+        try:
+            _plot_chart(
+                cube,
+                "compliance/semi_annual",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    aggregates.get_counts(
+                        cube,
                         config.SEMI_ANNUAL_SALARY_COMPLIANCE
                         + config.REWRITTEN_COLUMN_SUFFIX,
-                        category_order=streamlit_order_plots.ORDER_1_4,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Conformidad"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-
-        with tabs[2]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
+                    config.SEMI_ANNUAL_SALARY_COMPLIANCE
+                    + config.REWRITTEN_COLUMN_SUFFIX,
+                    category_order=streamlit_order_plots.ORDER_1_4,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Conformidad"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+    with tabs[2]:
+        try:
+            _plot_chart(
+                cube,
+                "compliance/recommendation",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    aggregates.get_counts(
+                        cube,
                         config.WORKPLACE_RECOMMENDATION
                         + config.REWRITTEN_COLUMN_SUFFIX,
-                        category_order=streamlit_order_plots.ORDER_0_10,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Conformidad"
                     ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+                    config.WORKPLACE_RECOMMENDATION
+                    + config.REWRITTEN_COLUMN_SUFFIX,
+                    category_order=streamlit_order_plots.ORDER_0_10,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Conformidad"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
 
-        #  Tamaño de las empresas
-        st.markdown("### Tamaño de las empresas :office:")
-        tabs = st.tabs(
-            [
-                "Tamaño empresa",
-                "Salario BRUTO segun tamaño de la empresa",
-                "Salario NETO segun tamaño de la empresa"
-                ]
-        )
 
-        with tabs[0]:
-            try:
-                st.plotly_chart(
-                    streamlit_figures.get_horizontal_histogram(
-                        df,
-                        config.ORGANIZATION_SIZE,
-                        streamlit_order_plots.COMPANY_SIZE,
-                        yaxis_title="Cantidad de respuestas",
-                        xaxis_title="Cantidad de personas"
-                    ),
-                    theme=None,
-                )
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-        with tabs[1]:
-            try:
-                median_salary = df.groupby(config.ORGANIZATION_SIZE)[
-                    config.GROSS_SALARY
-                ].median()
+def display_organization_size(cube):
+    px = _express()
+
+    st.markdown("### Tamaño de las empresas :office:")
+    tabs = st.tabs(
+        [
+            "Tamaño empresa",
+            "Salario BRUTO segun tamaño de la empresa",
+            "Salario NETO segun tamaño de la empresa"
+            ]
+    )
+
+    with tabs[0]:
+        try:
+            _plot_chart(
+                cube,
+                "organization/size",
+                lambda: streamlit_figures.get_horizontal_histogram_from_counts(
+                    aggregates.get_counts(cube, config.ORGANIZATION_SIZE),
+                    config.ORGANIZATION_SIZE,
+                    streamlit_order_plots.COMPANY_SIZE,
+                    yaxis_title="Cantidad de respuestas",
+                    xaxis_title="Cantidad de personas"
+                ),
+                theme=None,
+            )
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[1]:
+        try:
+            def build():
+                median_salary = aggregates.get_frame(
+                    cube, "gross_by_organization_size"
+                ).set_index(config.ORGANIZATION_SIZE)[config.GROSS_SALARY]
 
                 fig = px.histogram(
                     median_salary,
@@ -1338,15 +1334,18 @@ def display_dashboard(df):
                     categoryorder="array",
                     categoryarray=streamlit_order_plots.COMPANY_SIZE,
                 )
-                st.plotly_chart(fig, theme=None)
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
-        with tabs[2]:
-            try:
-                median_salary = df.groupby(config.ORGANIZATION_SIZE)[
-                    config.NET_SALARY
-                ].median()
+                return fig
+
+            _plot_chart(cube, "organization/gross", build, theme=None)
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+    with tabs[2]:
+        try:
+            def build():
+                median_salary = aggregates.get_frame(
+                    cube, "net_by_organization_size"
+                ).set_index(config.ORGANIZATION_SIZE)[config.NET_SALARY]
 
                 fig = px.histogram(
                     median_salary,
@@ -1367,9 +1366,69 @@ def display_dashboard(df):
                     categoryorder="array",
                     categoryarray=streamlit_order_plots.COMPANY_SIZE,
                 )
-                st.plotly_chart(fig, theme=None)
-            except Exception as e:
-                st.error(config.ERROR_MSG)
-                st.exception(e)
+                return fig
+
+            _plot_chart(cube, "organization/net", build, theme=None)
+        except Exception as e:
+            st.error(config.ERROR_MSG)
+            st.exception(e)
+
+
+# Sections of the dashboard, {name displayed in the selector: function}
+SECTIONS = {
+    "Salarios": display_salaries,
+    "Salarios en dólares": display_dollars,
+    "Regiones": display_regions,
+    "Genero y edades": display_gender_and_ages,
+    "Experiencia": display_experience,
+    "Educacion": display_education,
+    "Bootcamp": display_bootcamp,
+    "Contrato laboral": display_contract,
+    "Herramientas": display_tools,
+    "Bonos y Beneficios": display_bonus_and_benefits,
+    "Conformidad salarial": display_salary_compliance,
+    "Tamaño de las empresas": display_organization_size,
+}
+
+
+def get_sections(cube):
+    """
+    Returns the sections of the dashboard that can be displayed for a survey.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+
+    Returns:
+        list: The names of the sections, in the order they are displayed.
+
+    """
+    sections = list(SECTIONS)
+    if config.PAYMENTS_IN_DOLLARS not in cube["columns"]:
+        sections.remove("Salarios en dólares")
+    return sections
+
+
+def display_dashboard(cube, lazy=True, key="dashboard_section"):
+    """
+    Display the charts of a survey.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+        lazy (bool, optional): If True, only the section chosen in a selector
+            is built and sent to the browser, otherwise every section is displayed.
+        key (str, optional): The key of the section selector.
+
+    Returns:
+        streamlit.delta_generator.DeltaGenerator: The container with the charts.
+
+    """
+    container = st.container()
+    with container:
+        sections = get_sections(cube)
+        if lazy:
+            sections = [st.radio("Sección", sections, horizontal=True, key=key)]
+
+        for section in sections:
+            SECTIONS[section](cube)
 
     return container
@@ -1,7 +1,8 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objs as go
 
+import transform_data.aggregates as aggregates
+
 
 def get_pie(serie, title, layout_showlegend=True):
     """
@@ -41,14 +42,16 @@ def get_horizontal_histogram(
     xaxis_title: str = "",
 ):
     """
-    Create a horizontal histogram using Plotly.
+    Create a horizontal histogram using Plotly. The values are counted, and
+    the numeric ones grouped in bins, before creating the figure.
 
     Args:
         df (pd.DataFrame): A pandas DataFrame containing the data.
         column_name (str): The name of the column in the DataFrame to plot.
         category_order (list): A list specifying the category order for the x-axis.
         norm (str, optional): The normalization mode for the histogram.
-        marginal (str, optional): The type of marginal plot to display.
+        marginal (str, optional): The type of marginal plot to display, only "box"
+            is supported, for numeric columns.
         yaxis_title (str, optional): The title of the y-axis.
         xaxis_title (str, optional): The title of the x-axis.
 
@@ -56,16 +59,109 @@ def get_horizontal_histogram(
         plotly.graph_objs._figure.Figure: A Plotly figure object with the horizontal histogram.
 
     """
-    fig = px.histogram(
-        df,
-        x=column_name,
-        histnorm=norm,
-        marginal=marginal,
+    serie = df[column_name]
+    if pd.api.types.is_numeric_dtype(serie):
+        counts, box = aggregates.to_histogram(serie)
+    else:
+        counts, box = serie.value_counts(), None
+        counts = counts[counts > 0]
+
+    return get_horizontal_histogram_from_counts(
+        counts,
+        column_name,
+        category_order,
+        norm=norm,
+        box=box if marginal == "box" else None,
+        yaxis_title=yaxis_title,
+        xaxis_title=xaxis_title,
     )
-    fig.update(layout_title_text=column_name)
+
+
+def normalize_counts(counts: pd.Series, norm: str = None) -> pd.Series:
+    """
+    Normalize the number of answers like the histnorm of Plotly.
+
+    Args:
+        counts (pd.Series): The number of answers of each value or bin.
+        norm (str, optional): None, "percent" or "probability".
+
+    Returns:
+        pd.Series: The normalized values.
+
+    """
+    if norm == "percent":
+        return counts / counts.sum() * 100
+    if norm == "probability":
+        return counts / counts.sum()
+    return counts
+
+
+def get_horizontal_histogram_from_counts(
+    counts: pd.Series,
+    title: str,
+    category_order: list,
+    norm: str = None,
+    box: dict = None,
+    yaxis_title: str = "",
+    xaxis_title: str = "",
+):
+    """
+    Create a horizontal histogram from the number of answers of each value or bin,
+    so the figure has one bar per value instead of every answer.
+
+    Args:
+        counts (pd.Series): The number of answers, indexed by value, or by the
+            intervals of the bins for numeric columns.
+        title (str): The title of the histogram.
+        category_order (list): A list specifying the category order for the x-axis.
+        norm (str, optional): The normalization mode for the histogram.
+        box (dict, optional): The statistics of the box plot displayed above the
+            histogram (q1, median, q3, lowerfence, upperfence and mean).
+        yaxis_title (str, optional): The title of the y-axis.
+        xaxis_title (str, optional): The title of the x-axis.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: A Plotly figure object with the horizontal histogram.
+
+    """
+    values = normalize_counts(counts, norm)
+
+    if isinstance(counts.index, pd.IntervalIndex):
+        bar = go.Bar(
+            x=counts.index.mid,
+            y=values.values,
+            width=counts.index.length,
+            hovertext=counts.index.astype(str),
+            showlegend=False,
+        )
+    else:
+        bar = go.Bar(x=counts.index, y=values.values, showlegend=False)
+
+    fig = go.Figure(data=[bar])
+    fig.update(layout_title_text=title)
     fig.update_layout(yaxis_title=yaxis_title, xaxis_title=xaxis_title)
     fig.update_xaxes(categoryorder="array", categoryarray=category_order)
 
+    if box is not None:
+        fig.add_trace(
+            go.Box(
+                q1=[box["q1"]],
+                median=[box["median"]],
+                q3=[box["q3"]],
+                lowerfence=[box["lowerfence"]],
+                upperfence=[box["upperfence"]],
+                mean=[box["mean"]],
+                orientation="h",
+                xaxis="x",
+                yaxis="y2",
+                showlegend=False,
+            )
+        )
+        fig.update_layout(
+            yaxis=dict(domain=[0, 0.74]),
+            yaxis2=dict(domain=[0.75, 1], anchor="x", showticklabels=False),
+        )
+
     return fig
 
 
@@ -94,7 +190,7 @@ def get_vertical_histogram(
         xaxis_title: str = "",
         ):
     """
-    Create a vertical histogram with Plotly.
+    Create a vertical histogram with Plotly, from the number of answers of each value.
 
     Args:
         df (pd.DataFrame): Pandas DataFrame containing the data for the histogram.
@@ -107,9 +203,48 @@ def get_vertical_histogram(
         plotly.graph_objs._figure.Figure: Plotly figure object containing the vertical histogram.
 
     """
-    fig = px.histogram(df, y=column, histnorm=norm)
+    counts = df[column].value_counts()
+    return get_vertical_histogram_from_counts(
+        counts[counts > 0],
+        column,
+        norm=norm,
+        yaxis_title=yaxis_title,
+        xaxis_title=xaxis_title,
+    )
+
+
+def get_vertical_histogram_from_counts(
+        counts: pd.Series,
+        title: str,
+        norm: str = None,
+        yaxis_title: str = "",
+        xaxis_title: str = "",
+        ):
+    """
+    Create a vertical histogram from the number of answers of each value.
+
+    Args:
+        counts (pd.Series): The number of answers, indexed by value.
+        title (str): Title of the histogram.
+        norm (str, optional): Normalization mode for the histogram.
+        yaxis_title (str, optional): Title for the y-axis.
+        xaxis_title (str, optional): Title for the x-axis.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object containing the vertical histogram.
+
+    """
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                y=counts.index,
+                x=normalize_counts(counts, norm).values,
+                orientation="h",
+            )
+        ]
+    )
     fig = update_yaxis(fig)
-    fig.update(layout_title_text=column)
+    fig.update(layout_title_text=title)
     fig.update_layout(yaxis_title=yaxis_title, xaxis_title=xaxis_title)
     return fig
 
@@ -133,6 +268,9 @@ def get_vertical_graph_from_serie(
         plotly.graph_objs._figure.Figure: Plotly figure object containing the vertical graph.
 
     """
+    # imported only here, the pages start faster without it
+    import plotly.express as px
+
     fig = px.histogram(serie, y=serie.index, x=serie.values)
     fig = update_yaxis(fig)
     fig.update(layout_title_text=title)
@@ -102,3 +102,30 @@ def get_order(unordered_list: list) -> list:
         position_value[tuples_values[0]]
         for position, tuples_values in enumerate(sorted_items)
     ]
+
+
+def get_category_order(
+        values: list, categories: list = None, default: list = None
+        ) -> list:
+    """
+    Returns the order of the values of a column. The columns grouped in ranges are
+    saved as ordered categories, so their order is read from the file. The files
+    processed by previous versions are ordered with default, or with get_order.
+
+    :param values: The values of the column.
+    :type values: list
+    :param categories: The ordered categories of the column, None if the column
+        isn't an ordered category.
+    :type categories: list
+    :param default: The order used if the column isn't an ordered category.
+    :type default: list
+    :return: The values of the column sorted from the smallest to the biggest.
+    :rtype: list
+    """
+    if categories is not None:
+        return categories
+
+    if default is not None:
+        return default
+
+    return get_order(values)
@@ -0,0 +1,141 @@
+import collections
+import hashlib
+import json
+import threading
+
+import numpy as np
+
+import config
+import transform_data.aggregates as aggregates
+
+
+# Fitted trends of the last tables of the cubes, shared by every session,
+# {(table digest, arguments): trends}
+_CACHE = collections.OrderedDict()
+_LOCK = threading.Lock()
+
+
+def fit_lines(x, y, groups=None, weights=None):
+    """
+    Fits a line y = slope * x + intercept to the points of each group at once,
+    with the closed-form solution of the (weighted) least squares.
+
+    Args:
+        x (np.ndarray): The x values of the points.
+        y (np.ndarray): The y values of the points.
+        groups (np.ndarray, optional): The group of each point, all the points
+            are one group if None.
+        weights (np.ndarray, optional): The weight of each point, 1 if None.
+
+    Returns:
+        dict: The (slope, intercept) of each group, {group: (slope, intercept)}.
+            The slope of a group whose points have the same x is 0.
+
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    weights = np.ones_like(x) if weights is None else np.asarray(weights, dtype="float64")
+    groups = np.zeros(len(x), dtype="int64") if groups is None else np.asarray(groups)
+
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(weights)
+    if not valid.any():
+        return {}
+    labels, codes = np.unique(groups[valid], return_inverse=True)
+    x, y, weights = x[valid], y[valid], weights[valid]
+
+    # the weighted sums of each group
+    def sums(values):
+        return np.bincount(codes, weights=weights * values, minlength=len(labels))
+
+    n = sums(np.ones_like(x))
+    mean_x = sums(x) / n
+    mean_y = sums(y) / n
+    dx = x - mean_x[codes]
+    covariance = np.bincount(codes, weights=weights * dx * (y - mean_y[codes]), minlength=len(labels))
+    variance = np.bincount(codes, weights=weights * dx * dx, minlength=len(labels))
+
+    slopes = np.divide(covariance, variance, out=np.zeros_like(variance), where=variance > 0)
+    intercepts = mean_y - slopes * mean_x
+
+    return {
+        label: (float(slope), float(intercept))
+        for label, slope, intercept in zip(labels.tolist(), slopes, intercepts)
+    }
+
+
+def _table_digest(cube, name):
+    # the same table of the same survey and filters has the same digest
+    table = json.dumps(cube["tables"][name], sort_keys=True, default=str)
+    return hashlib.sha1(table.encode()).hexdigest()
+
+
+def _cached(key, compute):
+    with _LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key]
+
+    trends = compute()
+
+    with _LOCK:
+        _CACHE[key] = trends
+        while len(_CACHE) > config.TREND_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return trends
+
+
+def get_log_trends(cube, name, x, y, group=None):
+    """
+    Fits y = slope * log(x + 0.1) + intercept to the points of a table of the
+    cube, for each value of a column. The trends are computed once for each
+    table, so once for each survey and filters.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+        name (str): The name of the table, like "net_by_experience".
+        x (str): The column of the x values, like config.YEARS_OF_EXPERIENCE.
+        y (str): The column of the y values, like config.NET_SALARY.
+        group (str, optional): The column of the groups, if None there is
+            only one trend with the group None.
+
+    Returns:
+        dict: The (slope, intercept) of each group, {group: (slope, intercept)}.
+
+    """
+    def compute():
+        df = aggregates.get_frame(cube, name)
+        trends = fit_lines(
+            np.log(df[x].values + 0.1),
+            df[y].values,
+            None if group is None else df[group].values,
+        )
+        if group is None:
+            return {None: trends[0]} if trends else {}
+        return trends
+
+    return _cached((_table_digest(cube, name), "log", x, y, group), compute)
+
+
+def get_linear_trend(cube, name, x, y, weight):
+    """
+    Fits y = slope * x + intercept to the points of a table of the cube,
+    weighting each point. The trend is computed once for each table,
+    so once for each survey and filters.
+
+    Args:
+        cube (dict): The aggregates of the survey.
+        name (str): The name of the table, like "experience_and_company".
+        x (str): The column of the x values.
+        y (str): The column of the y values.
+        weight (str): The column of the weights, like "count".
+
+    Returns:
+        tuple: The (slope, intercept) of the line, None if there are no points.
+
+    """
+    def compute():
+        df = aggregates.get_frame(cube, name)
+        trends = fit_lines(df[x].values, df[y].values, weights=df[weight].values)
+        return trends.get(0)
+
+    return _cached((_table_digest(cube, name), "linear", x, y, weight), compute)
@@ -1,107 +1,145 @@
 import streamlit as st
-import pandas as pd
 
 import config
 import graphics.streamlit_dashboard
+import transform_data.aggregates as aggregates
+import transform_data.loader as loader
+import transform_data.storage as storage
 
 if "file_name_to_load" not in st.session_state:
     st.session_state["file_name_to_load"] = None
-if "dataframe" not in st.session_state:
-    st.session_state["dataframe"] = None
+if "cube" not in st.session_state:
+    st.session_state["cube"] = None
 
 # file form
 st.markdown("# Filtros")
 st.markdown("**Agregá filtros a los datos de la encuesta seleccionada para obtener resultados más específicos.**")
-if [file.name for file in config.FOLDER_PATH.glob("*")]:
+if storage.list_surveys():
     with st.form("seleccione un archivo"):
         select_file = st.selectbox(
             "Seleccione una encuesta",
-            [file.name for file in config.FOLDER_PATH.glob("*")],
+            [file.name for file in storage.list_surveys()],
             key="list_of_files_to_delete",
         )
         submit_f1 = st.form_submit_button("Cargar")
         if submit_f1:
+            # the charts of the previous file are not shown with the new one
             st.session_state["file_name_to_load"] = str(select_file)
+            st.session_state["cube"] = None
 else:
     st.session_state["file_name_to_load"] = None
+    st.session_state["cube"] = None
     st.info(f"No hay se encuentran archivos guardados en: {str(config.FOLDER_PATH.absolute())}, cargalos en la seccion ***Archivos***.")
 
 if st.session_state["file_name_to_load"]:
+    # read the file, shared with the other sessions
+    file_name = st.session_state["file_name_to_load"]
+    path = config.FOLDER_PATH.joinpath(file_name)
+    df = loader.load_survey(path)
+    index = loader.load_filter_index(path)
+
     # Respondent filters form
     with st.form("formularioo"):
-        # read the file
-        file_name = st.session_state["file_name_to_load"]
         st.markdown("##### Archivo: ")
         st.markdown(f"###### *{file_name}*")
-        path = config.FOLDER_PATH.joinpath(select_file)
-        df = pd.read_csv(str(path))
 
         # filter positions to display
-        jobs = df[config.POSITIONS].value_counts()
-        otros_jobs = jobs[
-            jobs.values <= config.MIN_NUMBER_OF_PARTICIPANTS_PER_JOB
-        ].sum()
-        other_jobs = pd.Series([otros_jobs], index=["Otros"])
-        jobs_final = pd.concat(
-            [
-                jobs.loc[jobs.values > config.MIN_NUMBER_OF_PARTICIPANTS_PER_JOB],
-                other_jobs,
-            ]
-        )
+        jobs = index.values(config.POSITIONS)
 
         role = st.selectbox(
-            "Seleccione un rol", jobs.loc[jobs.values > 20].index, key="role"
+            "Seleccione un rol",
+            jobs.loc[jobs.values > config.MIN_NUMBER_OF_PARTICIPANTS_PER_JOB].index,
+            key="role",
         )
         ignore_roles = st.checkbox("Mostrar todos los roles")
 
+        min_exp, max_exp = index.bounds(config.YEARS_OF_EXPERIENCE)
         exp = st.slider(
             "Años de experiencia",
-            min_value=int(df[config.YEARS_OF_EXPERIENCE].min()),
-            max_value=int(df[config.YEARS_OF_EXPERIENCE].max()),
-            value=(
-                int(df[config.YEARS_OF_EXPERIENCE].min()),
-                int(df[config.YEARS_OF_EXPERIENCE].max()),
-            ),
+            min_value=int(min_exp),
+            max_value=int(max_exp),
+            value=(int(min_exp), int(max_exp)),
             key="form_exp",
         )
 
         studies = st.selectbox(
             config.MAX_LVL_STUDIES,
-            df[config.MAX_LVL_STUDIES].unique().tolist(),
+            index.values(config.MAX_LVL_STUDIES).index.tolist(),
             key="form_lvl_studies",
         )
         ignore_studies = st.checkbox("Ignorar estudios")
         ignore_payments = True
-        if config.PAYMENTS_IN_DOLLARS in df.columns:
+        if config.PAYMENTS_IN_DOLLARS in index.columns():
             type_of_salary = st.selectbox(
                 config.PAYMENTS_IN_DOLLARS,
-                df[config.PAYMENTS_IN_DOLLARS].unique().tolist(),
+                index.values(config.PAYMENTS_IN_DOLLARS).index.tolist(),
                 key="form_payment",
             )
             ignore_payments = st.checkbox("Ignorar " + config.PAYMENTS_IN_DOLLARS)
 
+        # more filters, every answer is accepted when none is selected
+        selected = {}
+        for column in [
+            config.PROVINCES,
+            config.GENDER,
+            config.CONTRACT,
+            config.WORK_MODALITY,
+            config.ORGANIZATION_SIZE,
+        ]:
+            if column in index.columns():
+                selected[column] = st.multiselect(
+                    column,
+                    index.values(column).index.tolist(),
+                    key="form_" + column,
+                )
+
+        # tools and benefits, only the answers that chose all the selected tags
+        selected_tags = {}
+        for column in index.tag_columns():
+            selected_tags[column] = st.multiselect(
+                column,
+                index.tag_counts(column).index.tolist(),
+                key="form_tags_" + column,
+            )
+
         submit = st.form_submit_button(
             "Generar graficos",
         )
 
-        st.session_state["dataframe"] = None
-
+        # the cube is kept across the reruns of the page, like when a
+        # section of the dashboard is selected, until the form is submitted
         if submit:
+            st.session_state["cube"] = None
+
             # filter df
-            min_exp, max_exp = exp
-            df = df[df[config.YEARS_OF_EXPERIENCE].between(min_exp, max_exp)]
+            equals = {
+                column: values for column, values in selected.items() if values
+            }
             if not ignore_roles:
-                df = df[df[config.POSITIONS] == role]
-            if config.PAYMENTS_IN_DOLLARS in df.columns and not ignore_payments:
-                df = df[df[config.PAYMENTS_IN_DOLLARS] == type_of_salary]
-            if not ignore_payments:
-                df = df[df[config.MAX_LVL_STUDIES] == studies]
+                equals[config.POSITIONS] = role
+            if config.PAYMENTS_IN_DOLLARS in index.columns() and not ignore_payments:
+                equals[config.PAYMENTS_IN_DOLLARS] = type_of_salary
+            if not ignore_studies:
+                equals[config.MAX_LVL_STUDIES] = studies
+
+            rows = index.select(
+                equals=equals,
+                ranges={config.YEARS_OF_EXPERIENCE: exp},
+                tags={column: tags for column, tags in selected_tags.items() if tags},
+            )
+            df = df.iloc[rows]
+
+            # hide the answers that are not in the filtered data
+            df = df.apply(
+                lambda column: column.cat.remove_unused_categories()
+                if column.dtype == "category" else column
+            )
 
             length_df = len(df)
 
             if length_df == 0:
                 st.error("No existen resultados en el archivo :(")
-                st.session_state["dataframe"] = None
+                st.session_state["cube"] = None
                 st.stop()
             elif length_df <= config.MINIMUM_RESPONSES:
                 st.warning(
@@ -117,10 +155,18 @@ if st.session_state["file_name_to_load"]:
             else:
                 st.success(f"Se encontraron {length_df} resultados")
 
-            st.session_state["dataframe"] = df
+            # each session keeps the aggregates of its filtered
+            # rows instead of a copy of the rows
+            st.session_state["cube"] = aggregates.build_cube(
+                df,
+                {
+                    column: index.tag_counts(column, rows)
+                    for column in index.tag_columns()
+                },
+            )
 
-if type(st.session_state["dataframe"]) == pd.DataFrame:
+if st.session_state["cube"] is not None:
     st.markdown("---")
     st.markdown(f"# Resultado de: {file_name}")
     st.markdown("***Se puede interactuar y ampliar todos los gráficos en pantalla completa. Más información en [Plotly.Express](https://plotly.com/python/plotly-express/)***")
-    graphics.streamlit_dashboard.display_dashboard(st.session_state["dataframe"])
+    graphics.streamlit_dashboard.display_dashboard(st.session_state["cube"])
@@ -5,6 +5,10 @@ import streamlit as st
 from pathlib import Path
 
 import config
+import transform_data.columns as columns
+import transform_data.ingest as ingest
+import transform_data.loader as loader
+import transform_data.storage as storage
 from transform_data.transform_data import main
 
 
@@ -18,6 +22,25 @@ if "rename_manually" not in st.session_state:
     st.session_state["rename_manually"] = False
 if "file" not in st.session_state:
     st.session_state["file"] = False
+if "matched_columns" not in st.session_state:
+    st.session_state["matched_columns"] = ({}, {})
+
+# Option of the form to leave an optional column out
+NOT_RENAMED = "(no renombrar)"
+
+
+def show_profile(name):
+    # the time, rows and memory of each stage of the last transform
+    profile = storage.load_report(name, "profile")
+    if not profile:
+        return
+
+    with st.expander(f"Tiempos de la transformación ({profile['seconds']:.2f}s)"):
+        stages = pd.DataFrame(profile["stages"]).set_index("stage")
+        st.dataframe(stages.sort_values("seconds", ascending=False))
+        if profile["peak_memory_mb"] is not None:
+            st.caption(f"Memoria máxima: {profile['peak_memory_mb']:.0f} MB")
+
 
 st.markdown("# Archivos")
 st.markdown("Agregar archivos al programa o borrarlos")
@@ -38,66 +61,61 @@ if not file:
 elif file.name != st.session_state["file_name"]:
     # if :
     
-    # read file
+    # read file from the row with the survey questions,
+    # skipping the first blank lines
     try:
-        df = pd.read_csv(file)
+        df = ingest.read_survey(file)
     except Exception as e:
         st.error(e)
         st.stop()
 
-    # skip the first blank lines when searching for the survey questions
-    if df.columns.str.contains("Unnamed").any() or not set(
-        config.REQUIRED_COLUMNS
-    ).issubset(df.columns):
-        for index, row in df.iterrows():
-            if row.notnull().all() and any(
-                column not in df.columns for column in config.REQUIRED_COLUMNS
-            ):
-                try:
-                    df.columns = df.iloc[index]
-                    # Rename columns
-                    df = df.rename(columns=lambda x: x.replace("  ", " ").rstrip())
-                    df = df.iloc[(index + 1):, :]
-                    # rename columns based on constants.SAME_COLUMNS
-                    df.rename(columns=config.SAME_COLUMNS, inplace=True)
-
-                    for column in df.columns:
-                        if '¿Tuviste ajustes por inflación' in column or "¿Tuviste actualizaciones de tus ingresos" in column:
-                            df.rename(columns={column: '¿Tuviste ajustes por inflación el último año?'}, inplace=True)
-                    if "¿Salir o seguir contestando?" in df.columns:
-                        df.drop(
-                            "¿Salir o seguir contestando?", axis=1, inplace=True
-                        )
-                    break
-                except Exception as e:
-                    st.error(e)
-                    st.stop()
-
-            # stop searching
-            if index == 25:
-                st.error(
-                    "No se encontró ninguna de las columnas correspondientes a la encuesta de sysarmy"
-                )
-                st.stop()
-    
+    if df is None:
+        st.error(
+            "No se encontró ninguna de las columnas correspondientes a la encuesta de sysarmy"
+        )
+        st.stop()
+
+    # the columns with other names similar to the supported columns
+    # are selected in the form below, renamed when the file is loaded
+    renames, ambiguous = columns.match_columns(list(df.columns))
+    st.session_state["matched_columns"] = (renames, ambiguous)
+    st.session_state["rename_manually"] = {
+        column: target for column, (target, _) in renames.items()
+    }
+
     st.session_state["file"] = df
     st.session_state["file_name"] = file.name
 
 if st.session_state["saved file"]:
     st.info("Archivo cargado")
+    show_profile(st.session_state["file_name"])
     st.session_state["file"] = False
 
 # display form to rename columns to supported columns
 if type(st.session_state["file"]) == pd.DataFrame:
-
-    # rename remaining columns manually
-    if not set(config.REQUIRED_COLUMNS).issubset(st.session_state["file"].columns):
-        missing_columns = list(
-            set(config.REQUIRED_COLUMNS) - set(st.session_state["file"].columns)
-        )
-        leftover_columns = list(
-            set(st.session_state["file"].columns) - set(config.REQUIRED_COLUMNS)
-        )
+    renames, ambiguous = st.session_state["matched_columns"]
+    proposed = {target: column for column, (target, _) in renames.items()}
+    if renames:
+        st.markdown("#### Columnas con nombres similares a las de la encuesta:")
+        st.dataframe(pd.DataFrame(
+            [(column, target, score) for column, (target, score) in renames.items()],
+            columns=["Columna", "Columna de la encuesta", "Similitud"],
+        ))
+
+    # the missing columns and the proposed ones, chosen by the user
+    missing_columns = [
+        column for column in config.REQUIRED_COLUMNS
+        if column not in st.session_state["file"].columns
+    ]
+    target_columns = missing_columns + [
+        column for column in proposed if column not in missing_columns
+    ]
+    if target_columns:
+        supported_columns = config.REQUIRED_COLUMNS + config.OPTIONAL_COLUMNS
+        leftover_columns = [
+            column for column in st.session_state["file"].columns
+            if column not in supported_columns
+        ]
 
         rename_dict = {}
 
@@ -106,9 +124,23 @@ if type(st.session_state["file"]) == pd.DataFrame:
                 r"""Es posible que alguna columna esté escrita de manera diferente.
                         Seleccione la columna que mejor responda: """
             )
-            for column in missing_columns:
-                leftover_column = st.selectbox(column, leftover_columns, key=column)
-                rename_dict[leftover_column] = column
+            for column in target_columns:
+                # the proposed column and then the most similar columns first
+                candidates = [candidate for candidate, _ in ambiguous.get(column, [])]
+                options = [proposed[column]] if column in proposed else []
+                options += [
+                    candidate for candidate in candidates
+                    if candidate in leftover_columns and candidate not in options
+                ]
+                options += [other for other in leftover_columns if other not in options]
+                # the optional columns can be left out
+                index = 0
+                if column not in config.REQUIRED_COLUMNS:
+                    options = [NOT_RENAMED] + options
+                    index = 1 if column in proposed else 0
+                leftover_column = st.selectbox(column, options, index=index, key=column)
+                if leftover_column != NOT_RENAMED:
+                    rename_dict[leftover_column] = column
             submit = st.form_submit_button("Renombrar")
 
         if submit:
@@ -117,8 +149,8 @@ if type(st.session_state["file"]) == pd.DataFrame:
     # Display the original column names along with the new names
     # that will be used to replace them
     if st.session_state["rename_manually"]:
-        st.markdown("#### Se renombraron las columnas:")
-        st.write(rename_dict)
+        st.markdown("#### Se renombrarán las columnas:")
+        st.write(st.session_state["rename_manually"])
 
     # Add dollar values inputs
 
@@ -174,6 +206,7 @@ if type(st.session_state["file"]) == pd.DataFrame:
                 blue_dollar,
                 official_dollar,
             )
+        loader.invalidate(storage.processed_path(st.session_state["file_name"]))
         st.session_state["file"] = False
         # st.session_state["file_name"] = False
         if result:
@@ -195,35 +228,33 @@ survey = st.selectbox(
     key="anteriores_encuestas"
 )
 
+offline = st.checkbox(
+    "Usar solo las encuestas ya descargadas",
+    value=config.OFFLINE,
+    key="offline",
+)
+refresh = st.checkbox(
+    "Buscar nuevas versiones de las encuestas ya descargadas",
+    value=False,
+    key="refresh",
+)
+
 download_n_transform = st.button("Descargar", key="download_n_transform", type="primary",)
 
 if download_n_transform:
+    result = False
     with st.spinner("Cargando archivo al programa"):
         try:
-            df = pd.read_csv(config.SURVEYS[survey]["url"])
+            df = ingest.download_survey(survey, offline, refresh)
         except Exception as e:
             st.error(f"""No se pude descargar el archivo 
                 desde {config.SURVEYS[survey]["url"]}""")
             st.exception(e)
-        df = df.rename(columns=lambda x: x.replace("  ", " ").rstrip())
-        df.rename(columns=config.SAME_COLUMNS, inplace=True)
-
-        for column in df.columns:
-            if '¿Tuviste ajustes por inflación' in column or "¿Tuviste actualizaciones de tus ingresos" in column:
-                df.rename(columns={column: '¿Tuviste ajustes por inflación el último año?'}, inplace=True)
-        if "¿Salir o seguir contestando?" in df.columns:
-            df.drop(
-                "¿Salir o seguir contestando?", axis=1, inplace=True
-            )
+            st.stop()
 
         try:
-            result = main(
-                df,
-                survey,
-                config.SURVEYS[survey]["dollar_values"][0],
-                config.SURVEYS[survey]["dollar_values"][1],
-                config.SURVEYS[survey]["dollar_values"][2],
-            )
+            result, _ = ingest.transform_survey(df, survey)
+            loader.invalidate(storage.processed_path(survey))
         except Exception as e:
             st.error(f"""No se pude cargar el archivo 
                 {config.SURVEYS[survey]["url"]}""")
@@ -233,6 +264,36 @@ if download_n_transform:
             st.success("Archivo subido correctamente")
             st.balloons()
 
+    if result:
+        show_profile(survey)
+
+download_all = st.button("Descargar todas", key="download_all")
+
+if download_all:
+    progress_bar = st.progress(0)
+
+    def show_progress(finished, total, result):
+        progress_bar.progress(finished / total)
+        loader.invalidate(storage.processed_path(result["survey"]))
+        if result["ok"]:
+            st.write(
+                f"{result['survey']}: descarga {result['download']:.1f}s, "
+                f"transformación {result['transform']:.1f}s"
+            )
+        else:
+            st.error(f"No se pudo cargar {result['survey']}: {result['error']}")
+
+    start = time.perf_counter()
+    with st.spinner("Cargando todas las encuestas"):
+        results = ingest.ingest_surveys(
+            progress=show_progress, offline=offline, refresh=refresh
+        )
+
+    st.success(
+        f"Se cargaron {sum(result['ok'] for result in results)} de "
+        f"{len(results)} encuestas en {time.perf_counter() - start:.1f}s"
+    )
+
 st.markdown("---")
 # DELETE FILE
 st.subheader("Borrar Archivos")
@@ -240,11 +301,11 @@ st.subheader("Borrar Archivos")
 with st.form("Seleccione un archivo para borrar"):
     delete_file = st.selectbox(
         "Seleccione un archivo para borrar",
-        [file.name for file in config.FOLDER_PATH.glob("*")],
+        [file.name for file in storage.list_surveys()],
         key="list_of_files_to_delete",
     )
     disabled = False
-    if not [file.name for file in config.FOLDER_PATH.glob("*")]:
+    if not [file.name for file in storage.list_surveys()]:
         disabled = True
     delete_button = st.form_submit_button(
         "Borrar",
@@ -255,7 +316,8 @@ with st.form("Seleccione un archivo para borrar"):
         delete_file = Path(config.FOLDER_PATH).joinpath(delete_file)
         st.write(delete_file)
         try:
-            delete_file.unlink(missing_ok=False)
+            storage.delete_survey(delete_file)
+            loader.invalidate(delete_file)
         except Exception as e:
             st.error(e)
         st.success("Se borro correctamente el archivo")
@@ -0,0 +1,3 @@
+from transform_data.cli import main
+
+main()
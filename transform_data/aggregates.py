@@ -0,0 +1,619 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+import config
+import transform_data.storage as storage
+import transform_data.utils as utils
+
+
+# Changes when the content of the cube changes,
+# the cubes of previous versions are built again
+CUBE_VERSION = 3
+
+# Answers counted for the pie charts and histograms of the dashboard
+COUNT_COLUMNS = [
+    config.INFLATION_ADJUSTMENTS,
+    config.PAYMENTS_IN_DOLLARS,
+    config.PROVINCES,
+    config.GENDER,
+    config.AGE + config.REWRITTEN_COLUMN_SUFFIX,
+    config.YEARS_OF_EXPERIENCE + config.REWRITTEN_COLUMN_SUFFIX,
+    config.TIME_IN_CURRENT_COMPANY + config.REWRITTEN_COLUMN_SUFFIX,
+    config.TIME_IN_CURRENT_ROLE + config.REWRITTEN_COLUMN_SUFFIX,
+    config.CAREER + config.REWRITTEN_COLUMN_SUFFIX,
+    config.STUDIES_STATE,
+    config.MAX_LVL_STUDIES,
+    config.TRAINING_IN,
+    config.CONTRACT,
+    config.EMPLOYMENT_STATUS,
+    config.WORK_MODALITY,
+    config.DEPENDENTS + config.REWRITTEN_COLUMN_SUFFIX,
+    config.BONUS,
+    config.SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX,
+    config.SEMI_ANNUAL_SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX,
+    config.WORKPLACE_RECOMMENDATION + config.REWRITTEN_COLUMN_SUFFIX,
+    config.ORGANIZATION_SIZE,
+]
+
+# Columns with several answers joined by " - "
+TAG_COLUMNS = [
+    config.BOOTCAMP,
+    config.PLATFORMS_COLUMN,
+    config.LANGUAGES,
+    config.FRAMEWORKS,
+    config.DATABASES_COLUMN,
+    config.QA,
+    config.BENEFITS,
+]
+
+# Numeric columns displayed as histograms with their box plot
+DISTRIBUTION_COLUMNS = [
+    config.GROSS_SALARY,
+    config.NET_SALARY,
+    config.AGE,
+    config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX,
+]
+
+# Medians of the salaries, {name: (grouped by, salary column)}
+MEDIANS = {
+    "net_by_experience": (
+        [config.YEARS_OF_EXPERIENCE], config.NET_SALARY
+    ),
+    "gross_by_payment_and_experience": (
+        [config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE],
+        config.GROSS_SALARY,
+    ),
+    "net_by_payment_and_experience": (
+        [config.PAYMENTS_IN_DOLLARS, config.YEARS_OF_EXPERIENCE],
+        config.NET_SALARY,
+    ),
+    "gross_by_studies_and_experience": (
+        [config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE],
+        config.GROSS_SALARY,
+    ),
+    "net_by_studies_and_experience": (
+        [config.MAX_LVL_STUDIES, config.YEARS_OF_EXPERIENCE],
+        config.NET_SALARY,
+    ),
+    "gross_by_organization_size": (
+        [config.ORGANIZATION_SIZE], config.GROSS_SALARY
+    ),
+    "net_by_organization_size": (
+        [config.ORGANIZATION_SIZE], config.NET_SALARY
+    ),
+}
+
+
+def _to_native(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _to_counts(counts: pd.Series) -> dict:
+    return {
+        "values": [_to_native(value) for value in counts.index],
+        "counts": counts.tolist(),
+    }
+
+
+def _merge_counts(total: pd.Series, counts: pd.Series) -> pd.Series:
+    # the counts of two parts of a survey, from the most to the least counted
+    if total is None:
+        return counts
+
+    # the categories would drop the empty answers when grouped
+    parts = [
+        serie.set_axis(serie.index.astype(object))
+        if isinstance(serie.index, pd.CategoricalIndex) else serie
+        for serie in [total, counts]
+    ]
+    levels = list(range(counts.index.nlevels))
+    merged = pd.concat(parts).groupby(level=levels, dropna=False, sort=False).sum()
+    return merged.sort_values(ascending=False, kind="stable")
+
+
+def _round_values(values: np.ndarray, digits: int) -> np.ndarray:
+    # the centers of the bins of the given significant digits that contain
+    # the values, the bins of fewer digits contain those of more digits so
+    # the values can be rounded again with the same result
+    with np.errstate(divide="ignore", invalid="ignore"):
+        step = 10.0 ** (np.floor(np.log10(np.abs(values))) - digits + 1)
+        rounded = (np.floor(values / step) + 0.5) * step
+    return np.where(values == 0, values, rounded)
+
+
+def _round_counts(counts: pd.Series, digits: int) -> pd.Series:
+    # the counts of the values of the last level of the index rounded
+    index = counts.index.to_frame(index=False)
+    index.iloc[:, -1] = _round_values(index.iloc[:, -1].to_numpy(float), digits)
+    levels = list(range(counts.index.nlevels))
+    return counts.set_axis(
+        pd.MultiIndex.from_frame(index) if len(levels) > 1 else index.iloc[:, 0]
+    ).groupby(level=levels, sort=False).sum()
+
+
+def _merge_values(total: tuple, counts: pd.Series) -> tuple:
+    # the counts of the values of two parts of a survey, the values are the
+    # last level of the index. The values are rounded to fewer significant
+    # digits while there are more than config.STATISTIC_MAX_VALUES of them
+    digits = total[1] if total else None
+    if digits:
+        counts = _round_counts(counts, digits)
+    counts = _merge_counts(total[0] if total else None, counts)
+    while len(counts) > config.STATISTIC_MAX_VALUES and digits != 1:
+        # the salaries are rounded first to 6 significant digits
+        digits = digits - 1 if digits else 6
+        counts = _round_counts(counts, digits)
+    return counts, digits
+
+
+def _quantiles(values: np.ndarray, counts: np.ndarray, quantiles: list) -> np.ndarray:
+    # like np.quantile of the sorted values, each repeated its count times
+    positions = np.asarray(quantiles) * (counts.sum() - 1)
+    cumulative = np.cumsum(counts)
+    lower = values[np.searchsorted(cumulative, np.floor(positions), side="right")]
+    upper = values[np.searchsorted(cumulative, np.ceil(positions), side="right")]
+    fraction = positions - np.floor(positions)
+    return np.where(
+        fraction >= 0.5,
+        upper - (upper - lower) * (1 - fraction),
+        lower + (upper - lower) * fraction,
+    )
+
+
+def _medians(counts: pd.Series, group_columns: list, column: str) -> pd.DataFrame:
+    # like groupby(group_columns)[column].median(), of the values
+    # of the last level of the index repeated their count times
+    table = counts.rename("count").reset_index().sort_values(column, kind="stable")
+    groups = table.groupby(group_columns, sort=False)["count"]
+    cumulative = groups.cumsum()
+    middle = (groups.transform("sum") - 1) / 2
+    # the first values after the middle position, and after the one before it
+    values = table[column].astype(float)
+    lower = values.where(cumulative > np.floor(middle))
+    upper = values.where(cumulative > np.ceil(middle))
+    keys = [table[group] for group in group_columns]
+    medians = (
+        lower.groupby(keys, sort=False).min() + upper.groupby(keys, sort=False).min()
+    ) / 2
+    return medians.rename(column).reset_index()
+
+
+def _box(values: np.ndarray, counts: np.ndarray) -> dict:
+    if len(values) == 0:
+        return None
+
+    q1, median, q3 = _quantiles(values, counts, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "lowerfence": float(values[values >= q1 - 1.5 * iqr].min()),
+        "upperfence": float(values[values <= q3 + 1.5 * iqr].max()),
+        "mean": float(np.dot(values, counts) / counts.sum()),
+    }
+
+
+def _bin_edges(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    if len(values) == 0:
+        return np.array([0.0, 1.0])
+
+    minimum, maximum = values[0], values[-1]
+    # one bin per integer, like ages
+    if (
+        maximum - minimum < config.MAX_HISTOGRAM_BINS
+        and (values == np.floor(values)).all()
+    ):
+        return np.arange(minimum, maximum + 2) - 0.5
+
+    # the "auto" bins of np.histogram_bin_edges,
+    # which doesn't estimate them for counted values
+    size = counts.sum()
+    q1, q3 = _quantiles(values, counts, [0.25, 0.75])
+    width = (maximum - minimum) / (np.log2(size) + 1.0)
+    if q3 - q1:
+        width = min(2.0 * (q3 - q1) * size ** (-1.0 / 3.0), width)
+    if minimum == maximum:
+        minimum, maximum = minimum - 0.5, maximum + 0.5
+    bins = int(np.ceil((maximum - minimum) / width)) if width else 1
+    return np.linspace(minimum, maximum, min(bins, config.MAX_HISTOGRAM_BINS) + 1)
+
+
+def _histogram(counts: pd.Series, name: str = None) -> tuple:
+    # the bins and box plot of the values of the index of the counts
+    counts = counts.sort_index()
+    values, counts = counts.index.to_numpy(float), counts.to_numpy()
+    edges = _bin_edges(values, counts)
+    binned, edges = np.histogram(values, bins=edges, weights=counts)
+
+    histogram = pd.Series(
+        binned.astype("int64"),
+        index=pd.IntervalIndex.from_breaks(edges, closed="left"),
+        name=name,
+    )
+    return histogram, _box(values, counts)
+
+
+def _numeric(serie: pd.Series) -> pd.Series:
+    values = pd.to_numeric(serie, errors="coerce").astype(float)
+    return values[np.isfinite(values)]
+
+
+def to_histogram(serie: pd.Series) -> tuple:
+    """Groups the values of a numeric column in bins and computes
+    the statistics of its box plot, so that the figures don't need
+    every value.
+
+    :param serie: The numeric column, the non numeric values are ignored.
+    :type serie: pd.Series
+    :return: The number of values in each bin, indexed by the intervals
+        of the bins, and the box plot statistics (None if there are no values).
+    :rtype: tuple[pd.Series, dict]
+    """
+    return _histogram(_numeric(serie).value_counts(), serie.name)
+
+
+def _distribution(counts: pd.Series) -> dict:
+    histogram, box = _histogram(counts)
+
+    return {
+        "edges": histogram.index.left.tolist() + [histogram.index.right[-1]],
+        "counts": histogram.tolist(),
+        "box": box,
+    }
+
+
+def _frame(frame: pd.DataFrame) -> dict:
+    return {
+        "columns": frame.columns.tolist(),
+        "data": [
+            [_to_native(value) for value in row]
+            for row in frame.itertuples(index=False)
+        ],
+    }
+
+
+class CubeBuilder:
+    """Builds the cube of a survey one part of its rows at a time, so a
+    survey read in chunks is never entirely in memory. The counts are
+    added up part by part, the medians and quantiles are computed from
+    the counts of the numeric values, rounded to fewer significant digits
+    when there are more than config.STATISTIC_MAX_VALUES distinct values.
+    The parts must have the same columns and dtypes.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self._columns = None
+        self._answered = None
+        # {name in the cube: value_counts}
+        self._counts = {}
+        self._categories = {}
+        self._tags = {}
+        self._experience = None
+        # {column: {value: None}}, the values in order of appearance
+        self._unique = {}
+        # {name in the cube: (value_counts, significant digits)},
+        # the digits are None while the values aren't rounded
+        self._values = {}
+        self._medians = {}
+
+    def _add_counts(self, name: str, serie: pd.Series):
+        self._counts[name] = _merge_counts(
+            self._counts.get(name), serie.value_counts(dropna=False)
+        )
+        if serie.dtype == "category" and serie.cat.ordered:
+            self._categories[name] = serie.cat.categories.tolist()
+
+    def add(self, df: pd.DataFrame, tag_counts: dict = None):
+        """Adds the rows of a part of the survey.
+
+        :param df: The processed rows.
+        :type df: pd.DataFrame
+        :param tag_counts: The counts of the tags of the multiple choice
+            columns in these rows already known, like those of
+            filters.FilterIndex.tag_counts, {column: counts}.
+            The other columns are split.
+        :type tag_counts: dict
+        """
+        tag_counts = tag_counts or {}
+        self.rows += len(df)
+        self._columns = self._columns or df.columns.tolist()
+        answered = df.notna().sum()
+        self._answered = answered if self._answered is None else self._answered + answered
+
+        for column in COUNT_COLUMNS:
+            if column in df.columns:
+                self._add_counts(column, df[column])
+
+        for column in TAG_COLUMNS:
+            if column in tag_counts:
+                counts = tag_counts[column]
+            elif column in df.columns:
+                counts = utils.split_answers(df[column]).value_counts(dropna=False)
+            else:
+                continue
+            self._tags[column] = _merge_counts(self._tags.get(column), counts)
+
+        # answers of each years of experience and company seniority,
+        # with the rows without seniority to count all the respondents
+        experience = df[config.YEARS_OF_EXPERIENCE].notna()
+        self._experience = _merge_counts(
+            self._experience,
+            df.loc[
+                experience,
+                [config.YEARS_OF_EXPERIENCE, config.TIME_IN_CURRENT_COMPANY],
+            ].value_counts(dropna=False),
+        )
+
+        for column in [config.PAYMENTS_IN_DOLLARS, config.WORK_MODALITY]:
+            if column in df.columns:
+                self._unique.setdefault(column, {}).update(
+                    dict.fromkeys(_to_native(value) for value in df[column].unique())
+                )
+
+        days_in_office = config.DAYS_IN_OFFICE + config.REWRITTEN_COLUMN_SUFFIX
+        if config.WORK_MODALITY in df.columns and days_in_office in df.columns:
+            self._add_counts(
+                days_in_office + " - " + config.HYBRID_MODALITY,
+                df.loc[
+                    df[config.WORK_MODALITY] == config.HYBRID_MODALITY,
+                    days_in_office,
+                ],
+            )
+
+        for column in DISTRIBUTION_COLUMNS:
+            if column in df.columns:
+                self._add_values(self._values, column, _numeric(df[column]))
+
+        for name, (group_columns, salary) in MEDIANS.items():
+            if set(group_columns + [salary]).issubset(df.columns):
+                for column in group_columns:
+                    if df[column].dtype == "category" and df[column].cat.ordered:
+                        self._categories[column] = df[column].cat.categories.tolist()
+                self._add_values(self._medians, name, df[group_columns + [salary]])
+
+        if config.PAYMENTS_IN_DOLLARS in df.columns:
+            payments = df[config.PAYMENTS_IN_DOLLARS]
+
+            # salaries of each type of payment
+            for salary in [config.GROSS_SALARY, config.NET_SALARY]:
+                self._add_values(
+                    self._values, salary + " - " + config.PAYMENTS_IN_DOLLARS,
+                    pd.concat([payments, _numeric(df[salary])], axis=1),
+                )
+
+            # salaries in dollars of the people that are paid in dollars
+            if config.LAST_VALUE_EXCHANGE in df.columns:
+                paid_in_dollars = (
+                    (payments == config.ALL_SALARY_IN_DOLLARS)
+                    & df[config.LAST_VALUE_EXCHANGE].notnull()
+                )
+                for salary in [config.GROSS_SALARY, config.NET_SALARY]:
+                    rows = paid_in_dollars & df[salary].notnull()
+                    self._add_values(
+                        self._values, salary + " - USD", _numeric(
+                            df.loc[rows, salary] / df.loc[rows, config.LAST_VALUE_EXCHANGE]
+                        ),
+                    )
+
+    def _add_values(self, states: dict, name: str, values):
+        # the counts of the rows with all the values, the numeric value last
+        if isinstance(values, pd.DataFrame):
+            values = values.astype({
+                column: object for column in values.columns
+                if values[column].dtype == "category"
+            })
+        states[name] = _merge_values(states.get(name), values.value_counts(sort=False))
+
+    def _to_counts(self, name: str, counts: pd.Series) -> dict:
+        # unused categories
+        result = _to_counts(counts[counts > 0])
+        if name in self._categories:
+            result["categories"] = self._categories[name]
+        return result
+
+    def build(self) -> dict:
+        """Returns the cube of the rows added.
+
+        :return: The aggregates of the survey, with the digest of its content.
+        :rtype: dict
+        """
+        cube = {
+            "version": CUBE_VERSION,
+            "rows": self.rows,
+            "columns": self._columns,
+            "answered": {
+                column: int(count) for column, count in self._answered.items()
+            },
+            "unique": {
+                column: list(values) for column, values in self._unique.items()
+            },
+            "counts": {
+                name: self._to_counts(name, counts)
+                for name, counts in self._counts.items()
+            },
+            "tags": {
+                column: self._to_counts(column, counts)
+                for column, counts in self._tags.items()
+            },
+            "distributions": {},
+            "tables": {},
+        }
+
+        for name, (counts, _) in self._values.items():
+            if name.endswith(" - " + config.PAYMENTS_IN_DOLLARS):
+                cube["distributions"][name] = {
+                    payment: _distribution(
+                        counts[counts.index.get_level_values(0) == payment]
+                        .droplevel(0)
+                    )
+                    for payment in self._unique[config.PAYMENTS_IN_DOLLARS]
+                    if payment is not None
+                }
+            else:
+                cube["distributions"][name] = _distribution(counts)
+
+        for name, (counts, _) in self._medians.items():
+            group_columns, salary = MEDIANS[name]
+            table = _medians(counts, group_columns, salary)
+            # the groups in order, the ordered categories by their order
+            keys = table[group_columns].astype({
+                column: pd.CategoricalDtype(self._categories[column], ordered=True)
+                for column in group_columns if column in self._categories
+            })
+            cube["tables"][name] = _frame(
+                table.loc[keys.sort_values(group_columns, kind="stable").index]
+            )
+
+        cube["tables"]["experience_and_company"] = _frame(
+            self._experience.rename("count").reset_index()
+        )
+
+        # the same rows of the same survey, so the same survey and
+        # filters, have the same digest, it identifies the charts
+        content = json.dumps(cube, sort_keys=True, default=str)
+        cube["digest"] = hashlib.sha1(content.encode()).hexdigest()
+
+        return cube
+
+
+def build_cube(df: pd.DataFrame, tag_counts: dict = None) -> dict:
+    """Computes the counts, medians and distributions displayed by the
+    dashboard, so that the charts can be built without the rows of the
+    survey. The cube can be saved as JSON.
+
+    :param df: The processed survey, or a part of it.
+    :type df: pd.DataFrame
+    :param tag_counts: The counts of the tags of the multiple choice
+        columns already known, like those of filters.FilterIndex.tag_counts,
+        {column: counts}. The other columns are split.
+    :type tag_counts: dict
+    :return: The aggregates of the survey, with the digest of its content.
+    :rtype: dict
+    """
+    builder = CubeBuilder()
+    builder.add(df, tag_counts)
+    return builder.build()
+
+
+def save_cube(cube: dict, name: str):
+    """Saves the cube of a survey next to its reports.
+
+    :param cube: The aggregates of the survey.
+    :type cube: dict
+    :param name: The name of the survey.
+    :type name: str
+    """
+    storage.save_report(cube, name, "cube")
+
+
+def load_cube(path) -> dict:
+    """Reads the cube of a processed survey. If the cube doesn't exist,
+    or it was built by a previous version, it is built from the rows of
+    the survey and saved.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The aggregates of the survey.
+    :rtype: dict
+    """
+    cube = storage.load_report(path.name, "cube")
+    if cube is None or cube.get("version") != CUBE_VERSION:
+        cube = build_cube(storage.load_survey(path))
+        save_cube(cube, path.name)
+
+    return cube
+
+
+def get_counts(
+            cube: dict, column: str, fill_na: str = None, tags: bool = False
+        ) -> pd.Series:
+    """Returns the number of answers of each value of a column,
+    like value_counts.
+
+    :param cube: The aggregates of the survey.
+    :type cube: dict
+    :param column: The name of the column.
+    :type column: str
+    :param fill_na: The value that replaces the unanswered rows,
+        if None they are not counted.
+    :type fill_na: str
+    :param tags: If True, the counts of the values of a column with
+        several answers per row are returned.
+    :type tags: bool
+    :return: The number of answers of each value.
+    :rtype: pd.Series
+    """
+    counts = cube["tags" if tags else "counts"][column]
+    serie = pd.Series(counts["counts"], index=counts["values"], name=column)
+
+    if fill_na is None:
+        return serie[serie.index.notna()]
+
+    return serie.rename(index=lambda value: fill_na if value is None else value)
+
+
+def get_categories(cube: dict, column: str) -> list:
+    """Returns the ordered categories of a column,
+    None if the column isn't ordered.
+
+    :param cube: The aggregates of the survey.
+    :type cube: dict
+    :param column: The name of the column.
+    :type column: str
+    :return: The categories from the smallest to the biggest.
+    :rtype: list
+    """
+    return cube["counts"][column].get("categories")
+
+
+def get_distribution(cube: dict, column: str, group: str = None) -> tuple:
+    """Returns the number of answers in each bin of a numeric column
+    and the statistics of its box plot, like to_histogram.
+
+    :param cube: The aggregates of the survey.
+    :type cube: dict
+    :param column: The name of the column.
+    :type column: str
+    :param group: The type of payment, for the distributions
+        of the salaries of each type of payment.
+    :type group: str
+    :return: The counts, indexed by the intervals of the bins,
+        and the box plot statistics (None if there are no answers).
+    :rtype: tuple[pd.Series, dict]
+    """
+    distribution = cube["distributions"][column]
+    if group is not None:
+        distribution = distribution[group]
+
+    serie = pd.Series(
+        distribution["counts"],
+        index=pd.IntervalIndex.from_breaks(distribution["edges"], closed="left"),
+        name=column, dtype="int64"
+    )
+    return serie, distribution["box"]
+
+
+def get_frame(cube: dict, name: str) -> pd.DataFrame:
+    """Returns a table of the cube, the medians of MEDIANS or
+    the answers of each years of experience and company seniority
+    ("experience_and_company").
+
+    :param cube: The aggregates of the survey.
+    :type cube: dict
+    :param name: The name of the table.
+    :type name: str
+    :return: The table.
+    :rtype: pd.DataFrame
+    """
+    frame = cube["tables"][name]
+    return pd.DataFrame(frame["data"], columns=frame["columns"])
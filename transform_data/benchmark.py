@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+import transform_data.ingest as ingest
+import transform_data.storage as storage
+import transform_data.synthetic as synthetic
+import transform_data.transform_data as transform_data
+
+
+# Answers of the surveys measured by default, up to 5M with --sizes
+SIZES = [5_000, 50_000, 500_000]
+
+# Stages faster than this are not compared, their time is mostly noise
+MIN_SECONDS = 0.05
+
+
+@contextmanager
+def _working_directory(path: Path):
+    # the folders of config are relative to the working directory
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def survey_path(rows: int, seed: int = 0, folder: Path = None) -> Path:
+    """Returns a synthetic survey, written the first time it is used.
+
+    :param rows: The number of answers.
+    :type rows: int
+    :param seed: The seed of the survey.
+    :type seed: int
+    :param folder: The folder of the surveys,
+        config.RAW_FOLDER_PATH / "synthetic" by default.
+    :type folder: Path
+    :return: The absolute path of the CSV file.
+    :rtype: Path
+    """
+    folder = Path(folder or config.RAW_FOLDER_PATH / "synthetic")
+    path = (folder / f"survey_{rows}_{seed}.csv").resolve()
+    if not path.exists():
+        synthetic.write_survey(path, rows, seed)
+    return path
+
+
+def measure(path: Path, rows: int, chunked: bool = False) -> dict:
+    """Transforms a raw survey like an upload does, saving it in an empty
+    temporary folder, and returns the time of each stage.
+
+    :param path: The CSV file of the survey.
+    :type path: Path
+    :param rows: The number of answers of the survey.
+    :type rows: int
+    :param chunked: Transform it with main_chunked instead of main.
+    :type chunked: bool
+    :return: The rows, the total seconds, the rows per second, the seconds
+        reading the file (None with chunked), the peak memory and the
+        seconds of each stage, {stage: seconds}.
+    :rtype: dict
+    """
+    path = Path(path).resolve()
+    name = path.stem
+    dollar_values = list(config.SURVEYS.values())[-1]["dollar_values"]
+
+    with tempfile.TemporaryDirectory() as folder, _working_directory(folder):
+        start = time.perf_counter()
+        if chunked:
+            read = None
+            transform_data.main_chunked(
+                path, name, *dollar_values, prepare=ingest.prepare_survey
+            )
+        else:
+            df = ingest.read_survey(path)
+            read = time.perf_counter() - start
+            transform_data.main(df, name, *dollar_values, force=True)
+        seconds = time.perf_counter() - start
+        profile = storage.load_report(name, "profile")
+
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(rows / seconds),
+        "read": None if read is None else round(read, 4),
+        "peak_memory_mb": profile["peak_memory_mb"],
+        "stages": {stage["stage"]: stage["seconds"] for stage in profile["stages"]},
+    }
+
+
+def run(
+            sizes: list = None, seed: int = 0, repeat: int = 1,
+            chunked: bool = False, folder: Path = None,
+        ) -> list:
+    """Measures the transform of synthetic surveys of several sizes,
+    keeping the fastest of the repetitions of each size.
+
+    :param sizes: The number of answers of each survey, SIZES by default.
+    :type sizes: list
+    :param seed: The seed of the surveys.
+    :type seed: int
+    :param repeat: The number of times each survey is transformed.
+    :type repeat: int
+    :param chunked: Transform them with main_chunked instead of main.
+    :type chunked: bool
+    :param folder: The folder of the synthetic surveys.
+    :type folder: Path
+    :return: The result of measure for each size.
+    :rtype: list[dict]
+    """
+    results = []
+    for rows in sizes or SIZES:
+        path = survey_path(rows, seed, folder)
+        results.append(min(
+            (measure(path, rows, chunked) for _ in range(repeat)),
+            key=lambda result: result["seconds"],
+        ))
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Compares the times with the ones of a previous run,
+    for the sizes measured in both.
+
+    :param results: The results of run.
+    :type results: list[dict]
+    :param baseline: The results of a previous run.
+    :type baseline: list[dict]
+    :param tolerance: The fraction a time can grow without being a regression.
+    :type tolerance: float
+    :return: A description of each regression.
+    :rtype: list[str]
+    """
+    previous = {result["rows"]: result for result in baseline}
+    regressions = []
+
+    for result in results:
+        if result["rows"] not in previous:
+            continue
+        old = previous[result["rows"]]
+        times = [("total", result["seconds"], old["seconds"])] + [
+            (stage, seconds, old["stages"][stage])
+            for stage, seconds in result["stages"].items()
+            if stage in old["stages"]
+        ]
+        for stage, seconds, old_seconds in times:
+            if seconds >= MIN_SECONDS and seconds > old_seconds * (1 + tolerance):
+                regressions.append(
+                    f"{result['rows']} filas, {stage}: "
+                    f"{old_seconds:.3f}s -> {seconds:.3f}s"
+                )
+
+    return regressions
+
+
+def _print_result(result: dict, stages: int = 5):
+    memory = result["peak_memory_mb"]
+    print(
+        f"{result['rows']:>9} filas  {result['seconds']:8.2f}s  "
+        f"{result['rows_per_second']:>8} filas/s  "
+        + ("" if memory is None else f"{memory:.0f} MB")
+    )
+    slowest = sorted(result["stages"].items(), key=lambda item: item[1], reverse=True)
+    for stage, seconds in slowest[:stages]:
+        print(f"{'':>11}{stage:<20}{seconds:8.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo de cada etapa de la transformación "
+        "de encuestas sintéticas"
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=SIZES,
+        help="Cantidad de respuestas de cada encuesta",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--chunked", action="store_true",
+        help="Transformar las encuestas de a partes, con main_chunked",
+    )
+    parser.add_argument("--data", type=Path, help="Carpeta de las encuestas sintéticas")
+    parser.add_argument("--output", type=Path, help="Guardar los resultados en JSON")
+    parser.add_argument("--baseline", type=Path, help="Resultados anteriores a comparar")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    # the warnings of pandas would be printed for every survey
+    warnings.simplefilter("ignore")
+    results = run(args.sizes, args.seed, args.repeat, args.chunked, args.data)
+    for result in results:
+        _print_result(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print("Más lento:", regression)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import config
+import transform_data.aggregates as aggregates
+import transform_data.columns as columns
+import transform_data.ingest as ingest
+import transform_data.storage as storage
+from transform_data.transform_data import main as transform, save_aggregates
+
+
+def _print_progress(finished: int, total: int, result: dict):
+    status = "ok" if result["ok"] else result["error"] or "error"
+    times = ", ".join(
+        f"{step} {result[step]:.1f}s"
+        for step in ["download", "transform"]
+        if result[step] is not None
+    )
+    print(f"[{finished}/{total}] {result['survey']}: {status} ({times})")
+
+
+def ingest_file(
+    path: Path, dollar_values: list = None, force: bool = False, rename: bool = True
+) -> dict:
+    """Transforms and saves a survey read from a CSV file, like the
+    Archivos page does with an uploaded file. The columns similar to the
+    supported columns are renamed and printed, the survey is not
+    transformed if a required column is still missing.
+
+    :param path: The path of the CSV file, the name of the file
+        is the name of the survey.
+    :type path: Path
+    :param dollar_values: The values of the MEP, blue and official dollar.
+    :type dollar_values: list
+    :param force: Transform the survey even if it didn't change.
+    :type force: bool
+    :param rename: Rename the columns similar to the supported columns.
+    :type rename: bool
+    :return: The result with the keys of ingest.ingest_surveys.
+    :rtype: dict
+    """
+    path = Path(path)
+    result = {
+        "survey": path.name,
+        "ok": False,
+        "download": None,
+        "transform": None,
+        "error": None,
+    }
+
+    df = ingest.read_survey(path)
+    if df is None:
+        result["error"] = "no se encontraron las columnas de la encuesta"
+        return result
+
+    if rename:
+        renames, _ = columns.match_columns(list(df.columns))
+        for column, (target, score) in renames.items():
+            print(f"{path.name}: {column!r} -> {target!r} ({score:.2f})")
+        df = df.rename(columns={column: target for column, (target, _) in renames.items()})
+    missing = [column for column in config.REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        result["error"] = "faltan las columnas " + ", ".join(missing)
+        return result
+
+    start = time.perf_counter()
+    result["ok"] = transform(df, path.name, *(dollar_values or [None] * 3), force=force)
+    result["transform"] = time.perf_counter() - start
+    if not result["ok"]:
+        result["error"] = "ninguna respuesta es de Argentina"
+    return result
+
+
+def _selected_surveys(names: list) -> list:
+    # the processed surveys with the given names, with or without extension
+    paths = storage.list_surveys()
+    if not names:
+        return paths
+
+    stems = {Path(name).stem for name in names}
+    unknown = stems - {path.stem for path in paths}
+    if unknown:
+        raise SystemExit(f"No hay encuestas procesadas llamadas: {', '.join(sorted(unknown))}")
+    return [path for path in paths if path.stem in stems]
+
+
+def rebuild(paths: list):
+    """Builds again the cube and the filter index of processed surveys,
+    so the pages only read them. The surveys are read in chunks.
+
+    :param paths: The paths of the processed files.
+    :type paths: list[Path]
+    """
+    for path in paths:
+        start = time.perf_counter()
+        rows = save_aggregates(path)
+        print(f"{path.name}: {rows} filas ({time.perf_counter() - start:.1f}s)")
+
+
+def export(paths: list, output: Path):
+    """Writes the aggregates of processed surveys to a folder, a folder
+    per survey with the cube as JSON and each of its tables as CSV.
+
+    :param paths: The paths of the processed files.
+    :type paths: list[Path]
+    :param output: The folder where the aggregates are written.
+    :type output: Path
+    """
+    for path in paths:
+        cube = aggregates.load_cube(path)
+        folder = Path(output) / path.stem
+        folder.mkdir(parents=True, exist_ok=True)
+
+        (folder / "cube.json").write_text(json.dumps(cube, indent=2, ensure_ascii=False))
+        for name in cube["tables"]:
+            aggregates.get_frame(cube, name).to_csv(folder / (name + ".csv"), index=False)
+        print(f"{path.name}: {folder}")
+
+
+def main(args: list = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m transform_data",
+        description="Procesa las encuestas sin el servidor de streamlit",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="Descarga y transforma las encuestas"
+    )
+    ingest_parser.add_argument(
+        "surveys", nargs="*",
+        help="Nombres de las encuestas de config.SURVEYS, todas si no se "
+        "indica ninguna ni ningún archivo",
+    )
+    ingest_parser.add_argument(
+        "--file", nargs="+", default=[], type=Path,
+        help="Archivos CSV de encuestas, se guardan con el nombre del archivo",
+    )
+    ingest_parser.add_argument(
+        "--dollars", nargs=3, type=int, metavar=("MEP", "BLUE", "OFICIAL"),
+        help="Valores del dólar de los archivos",
+    )
+    ingest_parser.add_argument(
+        "--force", action="store_true",
+        help="Transformar los archivos aunque no hayan cambiado",
+    )
+    ingest_parser.add_argument(
+        "--no-rename", dest="rename", action="store_false",
+        help="No renombrar las columnas de los archivos parecidas a las de la encuesta",
+    )
+    ingest_parser.add_argument("--processes", type=int, default=None)
+    ingest_parser.add_argument("--threads", type=int, default=None)
+    ingest_parser.add_argument(
+        "--offline", action="store_true", default=None,
+        help="Usar solo las encuestas ya descargadas",
+    )
+    ingest_parser.add_argument(
+        "--refresh", action="store_true",
+        help="Buscar nuevas versiones de las encuestas ya descargadas",
+    )
+
+    rebuild_parser = commands.add_parser(
+        "rebuild", help="Construye los agregados y los índices de las encuestas procesadas"
+    )
+    rebuild_parser.add_argument(
+        "surveys", nargs="*", help="Nombres de las encuestas procesadas, todas por defecto"
+    )
+
+    export_parser = commands.add_parser(
+        "export", help="Escribe los agregados de las encuestas procesadas"
+    )
+    export_parser.add_argument("output", type=Path, help="Carpeta de destino")
+    export_parser.add_argument(
+        "surveys", nargs="*", help="Nombres de las encuestas procesadas, todas por defecto"
+    )
+
+    args = parser.parse_args(args)
+    start = time.perf_counter()
+    results = []
+
+    if args.command == "rebuild":
+        rebuild(_selected_surveys(args.surveys))
+    elif args.command == "export":
+        export(_selected_surveys(args.surveys), args.output)
+    else:
+        if args.surveys or not args.file:
+            results = ingest.ingest_surveys(
+                args.surveys or None, args.processes, args.threads,
+                _print_progress, args.offline, args.refresh,
+            )
+        for finished, path in enumerate(args.file, 1):
+            results.append(ingest_file(path, args.dollars, args.force, args.rename))
+            _print_progress(finished, len(args.file), results[-1])
+
+    print(f"Total: {time.perf_counter() - start:.1f}s")
+    if not all(result["ok"] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import argparse
+import functools
+import unicodedata
+from collections import Counter
+
+import pandas as pd
+
+import config
+
+
+def normalize(name: str) -> str:
+    """Returns the name of a column without accents, punctuation,
+    capital letters or repeated spaces, so "¿Gente a cargo?" and
+    "gente  a cargo" are the same name.
+
+    :param name: The name of the column.
+    :type name: str
+    :return: The normalized name.
+    :rtype: str
+    """
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(
+        character if character.isalnum() else " "
+        for character in name
+        if not unicodedata.combining(character)
+    )
+    return " ".join(name.lower().split())
+
+
+def signature(name: str) -> frozenset:
+    """Returns the trigrams of the normalized name of a column,
+    the names with more trigrams in common are more similar.
+
+    :param name: The name of the column.
+    :type name: str
+    :return: The trigrams of the name.
+    :rtype: frozenset
+    """
+    name = " " + normalize(name) + " "
+    return frozenset(name[start:start + 3] for start in range(len(name) - 2))
+
+
+class ColumnIndex:
+    """Inverted index of the trigrams of the known names of each supported
+    column, its own name and the old names of config.SAME_COLUMNS.
+    """
+
+    def __init__(self, aliases: dict):
+        """
+        :param aliases: The supported column of each known name, {name: column}.
+        :type aliases: dict
+        """
+        self.targets = list(aliases.values())
+        self.sizes = []
+        self.postings = {}
+        for position, name in enumerate(aliases):
+            trigrams = signature(name)
+            self.sizes.append(len(trigrams))
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(position)
+
+    def scores(self, name: str) -> dict:
+        """Returns how similar a name is to each supported column,
+        the Dice coefficient of the trigrams of the name and
+        of the most similar known name of the column.
+
+        :param name: The name of a column of a survey.
+        :type name: str
+        :return: The similarity, from 0 to 1, {supported column: score}.
+        :rtype: dict
+        """
+        trigrams = signature(name)
+        shared = Counter(
+            position
+            for trigram in trigrams
+            for position in self.postings.get(trigram, [])
+        )
+
+        scores = {}
+        for position, count in shared.items():
+            score = 2 * count / (len(trigrams) + self.sizes[position])
+            target = self.targets[position]
+            scores[target] = max(scores.get(target, 0), score)
+        return scores
+
+
+@functools.lru_cache(maxsize=1)
+def known_columns() -> ColumnIndex:
+    """Returns the index of the names of the supported columns
+    of config, built once per process.
+
+    :return: The index of the names.
+    :rtype: ColumnIndex
+    """
+    aliases = {
+        column: column
+        for column in config.REQUIRED_COLUMNS + config.OPTIONAL_COLUMNS
+    }
+    aliases.update(config.SAME_COLUMNS)
+    return ColumnIndex(aliases)
+
+
+def match_columns(columns: list, targets: list = None, index: ColumnIndex = None) -> tuple:
+    """Matches the columns of a survey with the supported columns it lacks.
+    A column is renamed when its score is at least config.COLUMN_MATCH_MIN_SCORE
+    and config.COLUMN_MATCH_MIN_MARGIN greater than the score of any other
+    column for the same supported column, or of any other supported column
+    for the same column. The others are ambiguous.
+
+    :param columns: The names of the columns of the survey.
+    :type columns: list
+    :param targets: The supported columns searched, by default the columns
+        of config.REQUIRED_COLUMNS and config.OPTIONAL_COLUMNS that
+        the survey lacks.
+    :type targets: list
+    :param index: The index of the known names, known_columns() by default.
+    :type index: ColumnIndex
+    :return: The columns that are renamed, {column: (supported column, score)},
+        and the candidates of each ambiguous supported column sorted by score,
+        {supported column: [(column, score)]}.
+    :rtype: tuple[dict, dict]
+    """
+    index = index or known_columns()
+    supported = config.REQUIRED_COLUMNS + config.OPTIONAL_COLUMNS
+    if targets is None:
+        targets = [column for column in supported if column not in columns]
+    columns = [column for column in columns if column not in supported]
+
+    scores = {column: index.scores(column) for column in columns}
+    pairs = sorted(
+        (
+            (scores[column].get(target, 0), column, target)
+            for column in columns
+            for target in targets
+        ),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+
+    renames = {}
+    matched = set()
+    rejected = set()
+    for score, column, target in pairs:
+        if score < config.COLUMN_MATCH_MIN_SCORE:
+            break
+        if column in renames or target in matched or target in rejected:
+            continue
+
+        # the best other choice for the column and for the supported column
+        rival = max(
+            [
+                scores[other].get(target, 0) for other in columns
+                if other != column and other not in renames
+            ] + [
+                scores[column].get(other, 0) for other in targets
+                if other != target and other not in matched
+            ],
+            default=0,
+        )
+        if score - rival >= config.COLUMN_MATCH_MIN_MARGIN:
+            renames[column] = (target, round(score, 3))
+            matched.add(target)
+        else:
+            rejected.add(target)
+
+    ambiguous = {
+        target: sorted(
+            (
+                (column, round(scores[column].get(target, 0), 3))
+                for column in columns if column not in renames
+            ),
+            key=lambda candidate: candidate[1],
+            reverse=True,
+        )
+        for target in targets if target not in matched
+    }
+    return renames, ambiguous
+
+
+def _constant(column: str) -> str:
+    # the name of the constant of config with the name of the column
+    for name, value in vars(config).items():
+        if name.isupper() and value == column:
+            return name
+    return repr(column)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Matches the columns of a new survey with the supported "
+        "columns, and prints the entries to add to config.SAME_COLUMNS."
+    )
+    parser.add_argument("path", help="The CSV file of the survey.")
+    args = parser.parse_args()
+
+    import transform_data.ingest as ingest
+
+    header = ingest.find_header(args.path)
+    if header is None:
+        parser.error("None of the first rows has the names of the survey columns")
+    df = ingest.prepare_survey(pd.read_csv(args.path, skiprows=header, nrows=0))
+    renames, ambiguous = match_columns(list(df.columns))
+
+    print("SAME_COLUMNS = {")
+    for column, (target, score) in renames.items():
+        print(f"    {column!r}: {_constant(target)},  # {score}")
+    print("}")
+
+    for target, candidates in ambiguous.items():
+        required = "required" if target in config.REQUIRED_COLUMNS else "optional"
+        print(f"\n{_constant(target)} ({required}), choose one of:")
+        for column, score in candidates[:3]:
+            print(f"    {column!r}  # {score}")
+
+
+if __name__ == "__main__":
+    main()
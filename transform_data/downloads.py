@@ -0,0 +1,197 @@
+import hashlib
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import config
+
+
+# Only one thread at a time writes the index of the cache
+_LOCK = threading.Lock()
+
+
+def _index_path(cache_dir: Path) -> Path:
+    return cache_dir / "index.json"
+
+
+def _read_index(cache_dir: Path) -> dict:
+    path = _index_path(cache_dir)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def object_path(digest: str, cache_dir: Path = None) -> Path:
+    """Returns the path in the cache where the content
+    with a sha256 digest is stored.
+
+    :param digest: The sha256 of the content, in hexadecimal.
+    :type digest: str
+    :param cache_dir: The folder of the cache, config.RAW_FOLDER_PATH by default.
+    :type cache_dir: Path
+    :return: The path of the raw file.
+    :rtype: Path
+    """
+    cache_dir = Path(cache_dir or config.RAW_FOLDER_PATH)
+    return cache_dir / "objects" / (digest + ".csv")
+
+
+def cached_entry(url: str, cache_dir: Path = None) -> dict:
+    """Returns what the cache knows about a url.
+
+    :param url: The url of the raw file.
+    :type url: str
+    :param cache_dir: The folder of the cache, config.RAW_FOLDER_PATH by default.
+    :type cache_dir: Path
+    :return: The sha256, etag, last_modified and checked (the last time
+        the server was asked) of the url, None if it was never downloaded
+        or its content is missing.
+    :rtype: dict
+    """
+    cache_dir = Path(cache_dir or config.RAW_FOLDER_PATH)
+    entry = _read_index(cache_dir).get(url)
+    if entry is None or not object_path(entry["sha256"], cache_dir).exists():
+        return None
+    return entry
+
+
+def store(
+            url: str,
+            content: bytes,
+            etag: str = None,
+            last_modified: str = None,
+            cache_dir: Path = None,
+        ) -> Path:
+    """Saves the content of a url in the cache. The same content
+    downloaded from several urls is stored once.
+
+    :param url: The url of the raw file.
+    :type url: str
+    :param content: The content of the raw file.
+    :type content: bytes
+    :param etag: The ETag header sent by the server.
+    :type etag: str
+    :param last_modified: The Last-Modified header sent by the server.
+    :type last_modified: str
+    :param cache_dir: The folder of the cache, config.RAW_FOLDER_PATH by default.
+    :type cache_dir: Path
+    :return: The path of the raw file.
+    :rtype: Path
+    """
+    cache_dir = Path(cache_dir or config.RAW_FOLDER_PATH)
+    digest = hashlib.sha256(content).hexdigest()
+
+    path = object_path(digest, cache_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # the content is complete or it doesn't exist
+        partial = path.with_suffix(".part" + str(threading.get_ident()))
+        partial.write_bytes(content)
+        partial.replace(path)
+
+    _update_index(
+        url,
+        {
+            "sha256": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "checked": time.time(),
+        },
+        cache_dir,
+    )
+    return path
+
+
+def store_file(url: str, path: Path, cache_dir: Path = None) -> Path:
+    """Saves a local file as the content of a url, so the url can
+    be read offline, for example from a copy of a survey.
+
+    :param url: The url of the raw file.
+    :type url: str
+    :param path: The path of the local file.
+    :type path: Path
+    :param cache_dir: The folder of the cache, config.RAW_FOLDER_PATH by default.
+    :type cache_dir: Path
+    :return: The path of the raw file in the cache.
+    :rtype: Path
+    """
+    return store(url, Path(path).read_bytes(), cache_dir=cache_dir)
+
+
+def _update_index(url: str, entry: dict, cache_dir: Path):
+    with _LOCK:
+        index = _read_index(cache_dir)
+        index[url] = entry
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = _index_path(cache_dir).with_suffix(".part")
+        partial.write_text(json.dumps(index, indent=2, ensure_ascii=False))
+        partial.replace(_index_path(cache_dir))
+
+
+def fetch(
+            url: str,
+            offline: bool = None,
+            refresh: bool = False,
+            cache_dir: Path = None,
+        ) -> Path:
+    """Returns the path of a local copy of a url. A url already in the
+    cache is read from it without asking the server. With refresh, the
+    server is asked if the copy changed with the ETag and Last-Modified
+    headers of the previous download, and the file is downloaded again
+    only if it changed. Offline, or if the server can't be reached, the
+    copy in the cache is used. Local paths are returned as they are.
+
+    :param url: The url of the raw file.
+    :type url: str
+    :param offline: Use only the cache, config.OFFLINE by default.
+    :type offline: bool
+    :param refresh: Ask the server for a new version of a cached url.
+    :type refresh: bool
+    :param cache_dir: The folder of the cache, config.RAW_FOLDER_PATH by default.
+    :type cache_dir: Path
+    :raises FileNotFoundError: If the url is not in the cache when offline.
+    :return: The path of the raw file.
+    :rtype: Path
+    """
+    if "://" not in url:
+        return Path(url)
+
+    offline = config.OFFLINE if offline is None else offline
+    cache_dir = Path(cache_dir or config.RAW_FOLDER_PATH)
+    entry = cached_entry(url, cache_dir)
+
+    if entry is not None and (offline or not refresh):
+        return object_path(entry["sha256"], cache_dir)
+    if offline:
+        raise FileNotFoundError(f"{url} is not in the cache {cache_dir}")
+
+    request = urllib.request.Request(url)
+    if entry is not None:
+        if entry["etag"]:
+            request.add_header("If-None-Match", entry["etag"])
+        if entry["last_modified"]:
+            request.add_header("If-Modified-Since", entry["last_modified"])
+
+    try:
+        with urllib.request.urlopen(request, timeout=config.DOWNLOAD_TIMEOUT) as response:
+            return store(
+                url,
+                response.read(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                cache_dir,
+            )
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry is not None:
+            _update_index(url, dict(entry, checked=time.time()), cache_dir)
+            return object_path(entry["sha256"], cache_dir)
+        if e.code >= 500 and entry is not None:
+            return object_path(entry["sha256"], cache_dir)
+        raise
+    except urllib.error.URLError:
+        if entry is not None:
+            return object_path(entry["sha256"], cache_dir)
+        raise
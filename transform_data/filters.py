@@ -0,0 +1,393 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import config
+import transform_data.storage as storage
+import transform_data.utils as utils
+
+
+# Changes when the content of the index changes,
+# the indexes of previous versions are built again
+INDEX_VERSION = 2
+
+
+def _to_native(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _to_bitmap(rows: np.ndarray, length: int) -> np.ndarray:
+    mask = np.zeros(length, dtype=bool)
+    mask[rows] = True
+    return np.packbits(mask)
+
+
+class FilterIndex:
+    """Index of the rows of a survey used to filter it without scanning
+    the columns. Each value of the filter columns has a bitmap with
+    the rows that answered it, packed in bytes, the range columns
+    keep their values sorted with the position of each row, and each tag
+    of the multiple choice columns has the sorted positions of the rows
+    that chose it (an inverted index), so a combination of filters is
+    resolved with a few bitwise ANDs.
+
+    :param rows: The number of rows of the survey.
+    :type rows: int
+    :param bitmaps: The packed bitmaps, {column: {value: bitmap}}.
+    :type bitmaps: dict
+    :param ranges: The sorted values and their rows, {column: (values, rows)}.
+    :type ranges: dict
+    :param tags: The rows of each tag, {column: {tag: rows}}. A row
+        appears twice if it chose the same tag twice.
+    :type tags: dict
+    """
+
+    def __init__(self, rows: int, bitmaps: dict, ranges: dict, tags: dict):
+        self.rows = rows
+        self._bitmaps = bitmaps
+        self._ranges = ranges
+        self._tags = tags
+
+    def columns(self) -> list:
+        """Returns the filter columns of the survey.
+
+        :return: The names of the columns.
+        :rtype: list
+        """
+        return list(self._bitmaps)
+
+    def values(self, column: str) -> pd.Series:
+        """Returns the number of rows of each value of a filter column,
+        from the most to the least answered, like value_counts.
+
+        :param column: The name of the column.
+        :type column: str
+        :return: The number of rows, indexed by value.
+        :rtype: pd.Series
+        """
+        bitmaps = self._bitmaps.get(column, {})
+        counts = pd.Series(
+            [
+                int(np.unpackbits(bitmap, count=self.rows).sum())
+                for bitmap in bitmaps.values()
+            ],
+            index=list(bitmaps),
+            name=column,
+            dtype="int64",
+        )
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def tag_columns(self) -> list:
+        """Returns the multiple choice columns of the survey.
+
+        :return: The names of the columns.
+        :rtype: list
+        """
+        return list(self._tags)
+
+    def tag_counts(self, column: str, rows: np.ndarray = None) -> pd.Series:
+        """Returns the number of times each tag of a multiple choice
+        column was chosen, from the most to the least chosen, like
+        utils.split_answers(serie).value_counts().
+
+        :param column: The name of the column.
+        :type column: str
+        :param rows: Only the tags of these rows are counted, all by default.
+        :type rows: np.ndarray
+        :return: The number of times each tag was chosen, indexed by tag.
+        :rtype: pd.Series
+        """
+        tags = self._tags.get(column, {})
+        if rows is None:
+            counts = [len(postings) for postings in tags.values()]
+        else:
+            selected = np.zeros(self.rows, dtype=bool)
+            selected[rows] = True
+            counts = [
+                int(selected[postings].sum()) for postings in tags.values()
+            ]
+
+        counts = pd.Series(counts, index=list(tags), name=column, dtype="int64")
+        counts = counts[counts > 0]
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def bounds(self, column: str) -> tuple:
+        """Returns the minimum and maximum values of a range column.
+
+        :param column: The name of the column.
+        :type column: str
+        :return: The minimum and the maximum, None if it has no values.
+        :rtype: tuple
+        """
+        values, _ = self._ranges[column]
+        if len(values) == 0:
+            return None, None
+        return values[0].item(), values[-1].item()
+
+    def _any_of(self, column: str, values: list) -> np.ndarray:
+        bitmap = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in self._bitmaps[column]:
+                bitmap |= self._bitmaps[column][value]
+        return bitmap
+
+    def _between(self, column: str, minimum, maximum) -> np.ndarray:
+        values, rows = self._ranges[column]
+        start = np.searchsorted(values, minimum, side="left")
+        stop = np.searchsorted(values, maximum, side="right")
+        return _to_bitmap(rows[start:stop], self.rows)
+
+    def select(
+                self, equals: dict = None, ranges: dict = None, tags: dict = None
+            ) -> np.ndarray:
+        """Returns the rows that match every filter. A row matches a filter
+        of equals if its value is one of the values of the filter, a
+        filter of ranges if its value is between both limits, inclusive,
+        like Series.between, and a filter of tags if it chose all the tags.
+        Empty values never match.
+
+        :param equals: The accepted values of each filter column,
+            {column: value or list of values}.
+        :type equals: dict
+        :param ranges: The limits of each range column, {column: (minimum, maximum)}.
+        :type ranges: dict
+        :param tags: The tags that must be chosen, {column: list of tags}.
+        :type tags: dict
+        :return: The positions of the rows, sorted.
+        :rtype: np.ndarray
+        """
+        bitmap = None
+
+        for column, values in (equals or {}).items():
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            match = self._any_of(column, values)
+            bitmap = match if bitmap is None else bitmap & match
+
+        for column, (minimum, maximum) in (ranges or {}).items():
+            match = self._between(column, minimum, maximum)
+            bitmap = match if bitmap is None else bitmap & match
+
+        for column, column_tags in (tags or {}).items():
+            for tag in column_tags:
+                match = _to_bitmap(
+                    self._tags[column].get(tag, np.empty(0, dtype=np.int64)),
+                    self.rows,
+                )
+                bitmap = match if bitmap is None else bitmap & match
+
+        if bitmap is None:
+            return np.arange(self.rows)
+
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.rows))
+
+
+def _group_rows(codes: np.ndarray, uniques, rows: np.ndarray) -> dict:
+    # rows grouped by value, the empty values (-1) are not indexed
+    order = np.argsort(codes, kind="stable")
+    limits = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {
+        _to_native(value): rows[order[limits[code]:limits[code + 1]]]
+        for code, value in enumerate(uniques)
+    }
+
+
+class IndexBuilder:
+    """Builds the filter index of a survey one part of its rows at a time,
+    so a survey read in chunks is never entirely in memory. The rows of
+    each value, range and tag are kept for each part and joined when
+    the index is built. The parts must have the same columns and dtypes.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        # {column: {value: [rows of each part]}}
+        self._values = {}
+        # {column: ([values of each part], [rows of each part])}
+        self._ranges = {}
+        # {column: {tag: [rows of each part]}}
+        self._tags = {}
+
+    def add(self, df: pd.DataFrame):
+        """Adds the rows of a part of the survey, after the rows added before.
+
+        :param df: The processed rows.
+        :type df: pd.DataFrame
+        """
+        positions = np.arange(self.rows, self.rows + len(df))
+
+        for column in config.FILTER_COLUMNS:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            values = self._values.setdefault(column, {})
+            for value, rows in _group_rows(codes, uniques, positions).items():
+                values.setdefault(value, []).append(rows)
+
+        for column in config.RANGE_FILTER_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+            answered = ~np.isnan(values)
+            parts = self._ranges.setdefault(column, ([], []))
+            parts[0].append(values[answered])
+            parts[1].append(positions[answered])
+
+        for column in config.TAG_FILTER_COLUMNS:
+            if column not in df.columns:
+                continue
+            # one row per tag, indexed by the position of the answer
+            answers = utils.split_answers(df[column].reset_index(drop=True))
+            codes, uniques = pd.factorize(answers)
+            tags = self._tags.setdefault(column, {})
+            for tag, rows in _group_rows(
+                        codes, uniques, answers.index.to_numpy() + self.rows
+                    ).items():
+                tags.setdefault(tag, []).append(rows)
+
+        self.rows += len(df)
+
+    def build(self) -> FilterIndex:
+        """Returns the index of the rows added.
+
+        :return: The index of the rows of the survey.
+        :rtype: FilterIndex
+        """
+        bitmaps = {
+            column: {
+                value: _to_bitmap(np.concatenate(parts), self.rows)
+                for value, parts in values.items()
+            }
+            for column, values in self._values.items()
+        }
+
+        ranges = {}
+        for column, (values, rows) in self._ranges.items():
+            values, rows = np.concatenate(values), np.concatenate(rows)
+            order = np.argsort(values, kind="stable")
+            ranges[column] = (values[order], rows[order])
+
+        tags = {
+            column: {tag: np.concatenate(parts) for tag, parts in column_tags.items()}
+            for column, column_tags in self._tags.items()
+        }
+
+        return FilterIndex(self.rows, bitmaps, ranges, tags)
+
+
+def build_index(df: pd.DataFrame) -> FilterIndex:
+    """Builds the filter index of the columns of config.FILTER_COLUMNS,
+    config.RANGE_FILTER_COLUMNS and config.TAG_FILTER_COLUMNS found
+    in a survey.
+
+    :param df: The processed survey.
+    :type df: pd.DataFrame
+    :return: The index of the rows of the survey.
+    :rtype: FilterIndex
+    """
+    builder = IndexBuilder()
+    builder.add(df)
+    return builder.build()
+
+
+def _split(concatenated: np.ndarray, lengths: np.ndarray) -> list:
+    limits = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    return [
+        concatenated[limits[n]:limits[n + 1]] for n in range(len(lengths))
+    ]
+
+
+def save_index(index: FilterIndex, name: str):
+    """Saves the filter index of a survey next to its reports.
+
+    :param index: The index of the rows of the survey.
+    :type index: FilterIndex
+    :param name: The name of the survey.
+    :type name: str
+    """
+    labels = {
+        "version": INDEX_VERSION,
+        "rows": index.rows,
+        "bitmaps": [
+            [column, value]
+            for column, bitmaps in index._bitmaps.items()
+            for value in bitmaps
+        ],
+        "ranges": list(index._ranges),
+        "tags": [
+            [column, tag]
+            for column, tags in index._tags.items()
+            for tag in tags
+        ],
+    }
+    bitmaps = [
+        bitmap for bitmaps in index._bitmaps.values() for bitmap in bitmaps.values()
+    ]
+    ranges = list(index._ranges.values())
+    postings = [
+        rows for tags in index._tags.values() for rows in tags.values()
+    ]
+
+    path = storage.report_path(name, "index", "npz")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # one array for all the bitmaps, and the ranges and
+    # the rows of the tags one after the other
+    np.savez(
+        path,
+        labels=np.array(json.dumps(labels, ensure_ascii=False)),
+        bitmaps=np.array(bitmaps, dtype=np.uint8).reshape(
+            len(bitmaps), (index.rows + 7) // 8
+        ),
+        values=np.concatenate([values for values, _ in ranges] + [np.empty(0)]),
+        rows=np.concatenate(
+            [rows for _, rows in ranges] + [np.empty(0, dtype=np.int64)]
+        ),
+        lengths=np.array([len(values) for values, _ in ranges], dtype=np.int64),
+        postings=np.concatenate(postings + [np.empty(0, dtype=np.int64)]),
+        postings_lengths=np.array([len(rows) for rows in postings], dtype=np.int64),
+    )
+
+
+def load_index(path) -> FilterIndex:
+    """Reads the filter index of a processed survey. If the index doesn't
+    exist, or it was built by a previous version, it is built from the
+    rows of the survey and saved.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The index of the rows of the survey.
+    :rtype: FilterIndex
+    """
+    index_path = storage.report_path(path.name, "index", "npz")
+    if index_path.exists():
+        with np.load(index_path) as arrays:
+            labels = json.loads(arrays["labels"].item())
+            if labels["version"] == INDEX_VERSION:
+                bitmaps = {}
+                for bitmap, (column, value) in zip(arrays["bitmaps"], labels["bitmaps"]):
+                    bitmaps.setdefault(column, {})[value] = bitmap
+
+                ranges = {
+                    column: (values, rows)
+                    for column, values, rows in zip(
+                        labels["ranges"],
+                        _split(arrays["values"], arrays["lengths"]),
+                        _split(arrays["rows"], arrays["lengths"]),
+                    )
+                }
+
+                tags = {}
+                for rows, (column, tag) in zip(
+                            _split(arrays["postings"], arrays["postings_lengths"]),
+                            labels["tags"],
+                        ):
+                    tags.setdefault(column, {})[tag] = rows
+
+                return FilterIndex(labels["rows"], bitmaps, ranges, tags)
+
+    index = build_index(storage.load_survey(path))
+    save_index(index, path.name)
+    return index
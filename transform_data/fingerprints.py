@@ -0,0 +1,212 @@
+import hashlib
+import inspect
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import config
+import transform_data.rules as rules
+
+
+# Changes when the content of the fingerprint changes,
+# the surveys of previous versions are transformed again
+FINGERPRINT_VERSION = 2
+
+# The code of the transform and of the stored dtypes, the code of
+# transform_data.rules is added without its tables, versioned by table
+CODE_FILES = ["transform_data.py", "utils.py", "storage.py"]
+
+# The code of the cube and the filter index, when only it changes they
+# are built again from the processed survey
+AGGREGATE_FILES = ["aggregates.py", "filters.py"]
+
+
+def _canonical(value):
+    # the same value gives the same text in every process
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items(), key=repr)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=repr)
+    return repr(value)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def hash_survey(df: pd.DataFrame) -> str:
+    """Returns the hash of the content of a survey before it is transformed,
+    its columns, index and values.
+
+    :param df: The survey as given to main.
+    :type df: pd.DataFrame
+    :return: The sha256 of the survey, in hexadecimal.
+    :rtype: str
+    """
+    digest = hashlib.sha256(json.dumps(_canonical(list(df.columns))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def used_constants(file_names: list) -> list:
+    """Returns the constants of config read by source files of
+    transform_data, the names written as config.NAME in their code.
+
+    :param file_names: The names of the files.
+    :type file_names: list
+    :return: The names of the constants, sorted.
+    :rtype: list
+    """
+    names = set()
+    for file_name in file_names:
+        code = (Path(__file__).parent / file_name).read_text(encoding="utf-8")
+        names.update(re.findall(r"\bconfig\.([A-Z][A-Z0-9_]*)", code))
+    return sorted(names)
+
+
+def hash_config(file_names: list = None) -> str:
+    """Returns the hash of the constants of config read by the transform,
+    so the constants only used by the pages or the ingestion don't
+    change the fingerprint.
+
+    :param file_names: The files that read the constants,
+        CODE_FILES by default.
+    :type file_names: list
+    :return: The sha256 of the constants, in hexadecimal.
+    :rtype: str
+    """
+    constants = {
+        name: getattr(config, name)
+        for name in used_constants(file_names or CODE_FILES)
+    }
+    return _sha256(json.dumps(_canonical(constants)))
+
+
+def _hash_files(file_names: list) -> hashlib.sha256:
+    digest = hashlib.sha256()
+    for file_name in file_names:
+        digest.update((Path(__file__).parent / file_name).read_bytes())
+    return digest
+
+
+def hash_code() -> str:
+    """Returns the hash of the source code of the transform, the files of
+    CODE_FILES and the conditions and matcher of transform_data.rules.
+
+    :return: The sha256 of the code, in hexadecimal.
+    :rtype: str
+    """
+    digest = _hash_files(CODE_FILES)
+    for value in vars(rules).values():
+        if (
+                    (inspect.isclass(value) or inspect.isfunction(value))
+                    and value.__module__ == rules.__name__
+                ):
+            digest.update(inspect.getsource(value).encode())
+    return digest.hexdigest()
+
+
+def hash_aggregates() -> str:
+    """Returns the hash of the source code of the cube and the filter
+    index, the files of AGGREGATE_FILES, and of the constants they read.
+
+    :return: The sha256 of the code and the constants, in hexadecimal.
+    :rtype: str
+    """
+    digest = _hash_files(AGGREGATE_FILES)
+    digest.update(hash_config(AGGREGATE_FILES).encode())
+    return digest.hexdigest()
+
+
+def rule_versions() -> dict:
+    """Returns the version of each table of transform_data.rules.
+
+    :return: The versions, {table name: version}.
+    :rtype: dict
+    """
+    return {
+        table.name: table.version
+        for table in vars(rules).values()
+        if isinstance(table, rules.RuleTable)
+    }
+
+
+def build_fingerprint(df: pd.DataFrame, dollar_values: list) -> dict:
+    """Returns the fingerprint of the transform of a survey: the hash
+    of the survey, the dollar values, the hash of the constants of
+    config, of the code and of the code of the aggregates, and the
+    versions of the rules.
+
+    :param df: The survey as given to main.
+    :type df: pd.DataFrame
+    :param dollar_values: The mep, blue and official dollar values.
+    :type dollar_values: list
+    :return: The fingerprint, serializable to JSON.
+    :rtype: dict
+    """
+    return {
+        "version": FINGERPRINT_VERSION,
+        "survey": hash_survey(df),
+        "dollar_values": [to_label(value) for value in dollar_values],
+        "config": hash_config(),
+        "code": hash_code(),
+        "aggregates": hash_aggregates(),
+        "rules": rule_versions(),
+    }
+
+
+def to_label(value):
+    """Converts a numpy scalar, like the labels of an index,
+    to the python value stored in JSON.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def changed_rules(previous: dict, fingerprint: dict) -> list:
+    """Compares the fingerprint of the last transform of a survey
+    with the current one.
+
+    :param previous: The fingerprint of the last transform, can be None.
+    :type previous: dict
+    :param fingerprint: The current fingerprint.
+    :type fingerprint: dict
+    :return: The names of the rule tables that changed, an empty list if
+        nothing changed, or None if the survey must be transformed again.
+        The code of the aggregates is compared by aggregates_changed.
+    :rtype: list
+    """
+    if previous is None or previous.get("version") != FINGERPRINT_VERSION:
+        return None
+
+    for key in ["survey", "dollar_values", "config", "code"]:
+        if previous[key] != fingerprint[key]:
+            return None
+
+    if set(previous["rules"]) != set(fingerprint["rules"]):
+        return None
+
+    return [
+        table for table, version in fingerprint["rules"].items()
+        if previous["rules"][table] != version
+    ]
+
+
+def aggregates_changed(previous: dict, fingerprint: dict) -> bool:
+    """Checks if the code of the cube and the filter index changed since
+    the last transform of a survey.
+
+    :param previous: The fingerprint of the last transform.
+    :type previous: dict
+    :param fingerprint: The current fingerprint.
+    :type fingerprint: dict
+    :return: True if they must be built again.
+    :rtype: bool
+    """
+    return previous.get("aggregates") != fingerprint["aggregates"]
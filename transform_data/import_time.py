@@ -0,0 +1,97 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import config
+
+
+# Measures the imports in a new interpreter. streamlit is imported first,
+# the server has already imported it when it runs the pages, and the
+# project is added at the end of the path because its streamlit.py
+# would hide the package.
+_CHILD = """
+import importlib, json, sys, time
+import streamlit
+sys.path.append({root!r})
+seconds = {{}}
+for module in {modules!r}:
+    start = time.perf_counter()
+    importlib.import_module(module)
+    seconds[module] = time.perf_counter() - start
+loaded = [module for module in {deferred!r} if module in sys.modules]
+print(json.dumps({{"seconds": seconds, "loaded": loaded}}))
+"""
+
+
+def measure(modules: list = None, deferred: list = None) -> dict:
+    """Measures the time it takes to import the modules of the pages in a
+    new interpreter, like when a container starts, and checks that the
+    slow modules are not imported with them.
+
+    :param modules: The modules imported in order,
+        config.IMPORT_TIME_MODULES by default.
+    :type modules: list
+    :param deferred: The modules that must not be imported,
+        config.DEFERRED_IMPORTS by default.
+    :type deferred: list
+    :return: The seconds of each module (what it added to the
+        previous ones) and the deferred modules that were imported.
+    :rtype: dict
+    """
+    code = _CHILD.format(
+        root=str(Path(__file__).resolve().parent.parent),
+        modules=modules or config.IMPORT_TIME_MODULES,
+        deferred=deferred or config.DEFERRED_IMPORTS,
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=folder,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def check(repeat: int = 3, budget: float = None) -> bool:
+    """Measures the imports several times and compares the fastest
+    total time with the budget.
+
+    :param repeat: The number of measures.
+    :type repeat: int
+    :param budget: The maximum seconds, config.IMPORT_TIME_BUDGET by default.
+    :type budget: float
+    :return: True if the imports are within the budget
+        and no deferred module was imported.
+    :rtype: bool
+    """
+    budget = budget or config.IMPORT_TIME_BUDGET
+    measures = [measure() for _ in range(repeat)]
+    best = min(measures, key=lambda result: sum(result["seconds"].values()))
+    total = sum(best["seconds"].values())
+
+    for module, seconds in best["seconds"].items():
+        print(f"{seconds * 1000:8.1f} ms  {module}")
+    print(f"{total * 1000:8.1f} ms  total (budget {budget * 1000:.0f} ms)")
+    for module in best["loaded"]:
+        print(f"{module} should be imported only when it is used")
+
+    return total <= budget and not best["loaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Checks the time it takes to import the modules of the pages."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, help="The maximum seconds.")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.repeat, args.budget) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import csv
+import io
+import itertools
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import pandas as pd
+
+import config
+import transform_data.downloads as downloads
+from transform_data.transform_data import main
+
+
+def prepare_survey(df: pd.DataFrame) -> pd.DataFrame:
+    """Renames the columns of a survey of config.SURVEYS
+    to the supported columns, and drops the unused ones.
+
+    :param df: The survey as downloaded.
+    :type df: pd.DataFrame
+    :return: The survey ready to be transformed.
+    :rtype: pd.DataFrame
+    """
+    df = df.rename(columns=lambda x: x.replace("  ", " ").rstrip())
+    df.rename(columns=config.SAME_COLUMNS, inplace=True)
+
+    for column in df.columns:
+        if '¿Tuviste ajustes por inflación' in column or "¿Tuviste actualizaciones de tus ingresos" in column:
+            df.rename(columns={column: config.INFLATION_ADJUSTMENTS}, inplace=True)
+    if "¿Salir o seguir contestando?" in df.columns:
+        df.drop(
+            "¿Salir o seguir contestando?", axis=1, inplace=True
+        )
+
+    return df
+
+
+def _column_name(name: str) -> str:
+    # the name of a column after prepare_survey
+    name = name.replace("  ", " ").rstrip()
+    return config.SAME_COLUMNS.get(name, name)
+
+
+def _head_rows(file, rows: int) -> list:
+    # the first rows of a CSV file, read as text without parsing the rest
+    if not hasattr(file, "read"):
+        with open(file, encoding="utf-8-sig", newline="") as text:
+            return list(itertools.islice(csv.reader(text), rows))
+
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        return list(itertools.islice(csv.reader(text), rows))
+    finally:
+        # the file stays open for pandas
+        text.detach()
+        file.seek(0)
+
+
+def find_header(file, rows: int = None) -> int:
+    """Searches the row with the names of the columns of a survey among
+    the first rows of a CSV file, the surveys can have blank lines or
+    notes before it. Each row is scored by the number of names of
+    config.REQUIRED_COLUMNS it has, after renaming them like prepare_survey.
+
+    :param file: The path of the CSV file, or the file opened in binary mode.
+    :type file: Path
+    :param rows: The number of rows searched, config.HEADER_SEARCH_ROWS by default.
+    :type rows: int
+    :return: The number of rows before the names of the columns,
+        the skiprows of pd.read_csv, None if no row has the name
+        of a required column.
+    :rtype: int
+    """
+    required = set(config.REQUIRED_COLUMNS)
+    scores = [
+        len(required & {_column_name(cell) for cell in row})
+        for row in _head_rows(file, rows or config.HEADER_SEARCH_ROWS)
+    ]
+
+    if not scores or max(scores) == 0:
+        return None
+    return scores.index(max(scores))
+
+
+def read_survey(file) -> pd.DataFrame:
+    """Reads an uploaded survey, parsing the file once from
+    the row with the names of the columns.
+
+    :param file: The path of the CSV file, or the file opened in binary mode.
+    :type file: Path
+    :return: The survey ready to be transformed, None if
+        the names of the columns were not found.
+    :rtype: pd.DataFrame
+    """
+    header = find_header(file)
+    if header is None:
+        return None
+    return prepare_survey(pd.read_csv(file, skiprows=header, header=0))
+
+
+def download_survey(
+            survey: str, offline: bool = None, refresh: bool = False
+        ) -> pd.DataFrame:
+    """Reads a survey of config.SURVEYS from the cache of downloads,
+    downloading it only the first time, or with refresh if it changed
+    since the last time.
+
+    :param survey: The name of the survey.
+    :type survey: str
+    :param offline: Use only the cache, config.OFFLINE by default.
+    :type offline: bool
+    :param refresh: Ask the server for a new version of a downloaded survey.
+    :type refresh: bool
+    :return: The survey ready to be transformed.
+    :rtype: pd.DataFrame
+    """
+    path = downloads.fetch(config.SURVEYS[survey]["url"], offline, refresh)
+    return prepare_survey(pd.read_csv(path))
+
+
+def transform_survey(df: pd.DataFrame, survey: str) -> tuple:
+    """Transforms and saves a survey of config.SURVEYS
+    with its dollar values.
+
+    :param df: The survey ready to be transformed.
+    :type df: pd.DataFrame
+    :param survey: The name of the survey.
+    :type survey: str
+    :return: The result of main and the seconds it took.
+    :rtype: tuple[bool, float]
+    """
+    start = time.perf_counter()
+    dollar_values = config.SURVEYS[survey]["dollar_values"]
+    result = main(
+        df,
+        survey,
+        dollar_values[0],
+        dollar_values[1],
+        dollar_values[2],
+    )
+    return result, time.perf_counter() - start
+
+
+def _download(survey: str, offline: bool, refresh: bool) -> tuple:
+    start = time.perf_counter()
+    df = download_survey(survey, offline, refresh)
+    return df, time.perf_counter() - start
+
+
+def ingest_surveys(
+            surveys: list = None,
+            processes: int = None,
+            threads: int = None,
+            progress=None,
+            offline: bool = None,
+            refresh: bool = False,
+        ) -> list:
+    """Downloads and transforms several surveys of config.SURVEYS at the
+    same time. The downloads run in a pool of threads and each survey is
+    transformed in a pool of processes as soon as it is downloaded, so
+    the total time is close to the time of the slowest survey.
+
+    :param surveys: The names of the surveys, all by default.
+    :type surveys: list
+    :param processes: The number of surveys transformed at the same time,
+        config.INGEST_PROCESSES by default.
+    :type processes: int
+    :param threads: The number of surveys downloaded at the same time,
+        config.DOWNLOAD_THREADS by default.
+    :type threads: int
+    :param progress: Called with (finished, total, result)
+        each time a survey is finished.
+    :type progress: callable
+    :param offline: Use only the cache of downloads, config.OFFLINE by default.
+    :type offline: bool
+    :param refresh: Ask the server for new versions of the downloaded surveys.
+    :type refresh: bool
+    :return: One result per survey, in the order they finished, with the keys
+        survey, ok, download (seconds), transform (seconds) and error.
+    :rtype: list[dict]
+    """
+    surveys = list(config.SURVEYS) if surveys is None else list(surveys)
+    processes = processes or config.INGEST_PROCESSES
+    threads = threads or config.DOWNLOAD_THREADS
+
+    results = []
+
+    def finish(result):
+        results.append(result)
+        if progress is not None:
+            progress(len(results), len(surveys), result)
+
+    with ThreadPoolExecutor(max_workers=threads) as download_pool, \
+            ProcessPoolExecutor(max_workers=processes) as transform_pool:
+        pending = {
+            download_pool.submit(_download, survey, offline, refresh): ("download", survey, None)
+            for survey in surveys
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, survey, download_time = pending.pop(future)
+                result = {
+                    "survey": survey,
+                    "ok": False,
+                    "download": download_time,
+                    "transform": None,
+                    "error": None,
+                }
+
+                try:
+                    if step == "download":
+                        df, download_time = future.result()
+                        transform = transform_pool.submit(transform_survey, df, survey)
+                        pending[transform] = ("transform", survey, download_time)
+                        continue
+
+                    result["ok"], result["transform"] = future.result()
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+
+                result["download"] = download_time
+                finish(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    import transform_data.cli as cli
+
+    cli.main(["ingest"] + sys.argv[1:])
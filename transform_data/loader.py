@@ -0,0 +1,129 @@
+import collections
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+import config
+import transform_data.aggregates as aggregates
+import transform_data.filters as filters
+import transform_data.storage as storage
+
+
+# Processed surveys, cubes and filter indexes shared by every session
+# of the streamlit server, {(path, kind): (state of the files, data)},
+# from the least to the most recently used
+_CACHE = collections.OrderedDict()
+_LOCK = threading.Lock()
+
+# One lock per (path, kind), held while the data is read, so a slow read
+# only blocks the sessions waiting for the same data
+_READ_LOCKS = collections.defaultdict(threading.Lock)
+
+# The files read for each kind of data, the cube and the index are
+# built from the processed survey when their own file is missing or old
+_FILES = {
+    "survey": lambda path: [path],
+    "cube": lambda path: [storage.report_path(path.name, "cube"), path],
+    "index": lambda path: [storage.report_path(path.name, "index", "npz"), path],
+}
+
+
+def _file_key(paths: list) -> tuple:
+    # the modification time and size of each file, None if it doesn't exist
+    key = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            key.append(None)
+        else:
+            key.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+
+def _load(path: Path, kind: str, reader):
+    path = Path(path).resolve()
+
+    with _LOCK:
+        read_lock = _READ_LOCKS[(path, kind)]
+
+    with read_lock:
+        # the state of the files before the read, a file
+        # changed during the read is read again the next time
+        key = _file_key(_FILES[kind](path))
+        with _LOCK:
+            cached = _CACHE.get((path, kind))
+            if cached is not None and cached[0] == key:
+                _CACHE.move_to_end((path, kind))
+                return cached[1]
+
+        data = reader(path)
+        with _LOCK:
+            _CACHE[(path, kind)] = (key, data)
+            _CACHE.move_to_end((path, kind))
+            while len(_CACHE) > config.LOADER_CACHE_SIZE:
+                evicted, _ = _CACHE.popitem(last=False)
+                # the lock of the data being read again is kept
+                if not _READ_LOCKS[evicted].locked():
+                    del _READ_LOCKS[evicted]
+
+    return data
+
+
+def load_survey(path: Path) -> pd.DataFrame:
+    """Reads a processed survey only once per process. The file is read
+    again if its modification time or size changed since the last read.
+
+    The returned dataframe is shared between sessions,
+    so it must not be modified in place.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The processed survey.
+    :rtype: pd.DataFrame
+    """
+    return _load(path, "survey", storage.load_survey)
+
+
+def load_cube(path: Path) -> dict:
+    """Reads the cube of a processed survey only once per process,
+    it is read again when its file or the processed file changes.
+
+    The returned cube is shared between sessions,
+    so it must not be modified in place.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The aggregates of the survey.
+    :rtype: dict
+    """
+    return _load(path, "cube", aggregates.load_cube)
+
+
+def load_filter_index(path: Path) -> filters.FilterIndex:
+    """Reads the filter index of a processed survey only once per process,
+    it is read again when its file or the processed file changes.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The index of the rows of the survey.
+    :rtype: filters.FilterIndex
+    """
+    return _load(path, "index", filters.load_index)
+
+
+def invalidate(path: Path = None):
+    """Removes a processed survey, its cube and its filter index from the cache,
+    or every survey if path is None.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    """
+    with _LOCK:
+        if path is None:
+            _CACHE.clear()
+        else:
+            path = Path(path).resolve()
+            for kind in ["survey", "cube", "index"]:
+                _CACHE.pop((path, kind), None)
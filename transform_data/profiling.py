@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+
+
+def resident_memory() -> int:
+    """Returns the memory of the process that is in RAM.
+
+    :return: The resident memory in bytes, None if the
+        system doesn't have /proc/self/statm.
+    :rtype: int
+    """
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _to_megabytes(size: int) -> float:
+    return None if size is None else round(size / 2**20, 1)
+
+
+class StageProfiler:
+    """Records the wall time, the rows before and after, and the peak
+    resident memory of each stage of the transform of a survey. While a
+    stage runs a thread samples the memory every config.PROFILE_INTERVAL
+    seconds, so the peak of very short stages can be missed.
+
+    The stages with the same name, like the stages of each chunk of
+    main_chunked, are added together in the report.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self._peak = None
+
+    def _sample(self, stop: threading.Event):
+        while not stop.wait(config.PROFILE_INTERVAL):
+            self._update_peak(resident_memory())
+
+    def _update_peak(self, memory: int):
+        if memory is not None and (self._peak is None or memory > self._peak):
+            self._peak = memory
+
+    @contextmanager
+    def measure(self, name: str, rows: int):
+        """Measures the code run inside the with block as a stage.
+        The rows after the stage are the same as before unless
+        the "rows_out" key of the yielded record is changed.
+
+        :param name: The name of the stage.
+        :type name: str
+        :param rows: The number of rows before the stage.
+        :type rows: int
+        """
+        record = {"stage": name, "rows_in": rows, "rows_out": rows}
+        memory = resident_memory()
+        self._peak = memory
+
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stop,), daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            stop.set()
+            sampler.join()
+
+        self._update_peak(resident_memory())
+        record["peak_memory"] = self._peak
+        record["memory_growth"] = (
+            None if memory is None else self._peak - memory
+        )
+        self.stages.append(record)
+
+    def run(self, name: str, stage, df, *args):
+        """Runs a stage that receives a survey and returns it.
+
+        :param name: The name of the stage.
+        :type name: str
+        :param stage: The stage, called with df and args.
+        :type stage: function
+        :param df: The survey.
+        :type df: pd.DataFrame
+        :return: The survey returned by the stage.
+        :rtype: pd.DataFrame
+        """
+        with self.measure(name, len(df)) as record:
+            df = stage(df, *args)
+            record["rows_out"] = len(df)
+        return df
+
+    def report(self) -> dict:
+        """Returns the measures of the stages, serializable to JSON.
+
+        :return: The total seconds and peak memory, and one entry per stage
+            with its seconds, rows_in, rows_out, rows_dropped,
+            peak_memory_mb and memory_growth_mb.
+        :rtype: dict
+        """
+        stages = {}
+        for record in self.stages:
+            stage = stages.setdefault(record["stage"], {
+                "stage": record["stage"],
+                "seconds": 0,
+                "rows_in": 0,
+                "rows_out": 0,
+                "peak_memory": None,
+                "memory_growth": None,
+            })
+            stage["seconds"] += record["seconds"]
+            stage["rows_in"] += record["rows_in"]
+            stage["rows_out"] += record["rows_out"]
+            for key in ["peak_memory", "memory_growth"]:
+                if record[key] is not None:
+                    stage[key] = max(stage[key] or 0, record[key])
+
+        stages = [
+            {
+                "stage": stage["stage"],
+                "seconds": round(stage["seconds"], 4),
+                "rows_in": stage["rows_in"],
+                "rows_out": stage["rows_out"],
+                "rows_dropped": stage["rows_in"] - stage["rows_out"],
+                "peak_memory_mb": _to_megabytes(stage["peak_memory"]),
+                "memory_growth_mb": _to_megabytes(stage["memory_growth"]),
+            }
+            for stage in stages.values()
+        ]
+        peaks = [stage["peak_memory_mb"] for stage in stages if stage["peak_memory_mb"] is not None]
+
+        return {
+            "seconds": round(sum(stage["seconds"] for stage in stages), 4),
+            "peak_memory_mb": max(peaks) if peaks else None,
+            "stages": stages,
+        }
@@ -0,0 +1,429 @@
+import functools
+import hashlib
+import re
+
+import config
+
+
+# --- # --- #
+
+# Conditions of the rules. A plain string is a word that
+# must be contained in the value, in lower case.
+
+
+class All:
+    """All the conditions must be met."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def __repr__(self):
+        return f"All{self.conditions!r}"
+
+
+class Any:
+    """At least one of the conditions must be met."""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def __repr__(self):
+        return f"Any{self.conditions!r}"
+
+
+class Cased:
+    """The word must be contained in the value, respecting the case."""
+
+    def __init__(self, word: str):
+        self.word = word
+
+    def __repr__(self):
+        return f"Cased({self.word!r})"
+
+
+class StartsWith:
+    """The value, in lower case, must start with prefix."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    def __repr__(self):
+        return f"StartsWith({self.prefix!r})"
+
+
+class Length:
+    """The length of the value must be between minimum and maximum,
+    ignoring the surrounding spaces if strip is True and measured
+    on the value in lower case if lower is True."""
+
+    def __init__(
+                self, minimum: int = 0, maximum: int = None,
+                strip: bool = False, lower: bool = False
+            ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.strip = strip
+        self.lower = lower
+
+    def __repr__(self):
+        return (
+            f"Length({self.minimum!r}, {self.maximum!r}, "
+            f"{self.strip!r}, {self.lower!r})"
+        )
+
+
+# --- # --- #
+
+# Engine
+
+
+def _collect_words(condition, words: set, cased_words: set):
+    if isinstance(condition, str):
+        words.add(condition)
+    elif isinstance(condition, Cased):
+        cased_words.add(condition.word)
+    elif isinstance(condition, (All, Any)):
+        for sub_condition in condition.conditions:
+            _collect_words(sub_condition, words, cased_words)
+
+
+class _WordMatcher:
+    """Finds which of a set of words are contained in a string with a
+    single scan of a precompiled regex.
+
+    The regex is an alternation of all the words, longest first, inside a
+    lookahead, so it reports the longest word starting at every position
+    of the string. The shorter words found at the same position are its
+    prefixes, which are precomputed.
+    """
+
+    def __init__(self, words: set):
+        words = sorted(words, key=len, reverse=True)
+        self._regex = None
+        if words:
+            self._regex = re.compile(
+                "(?=(" + "|".join(re.escape(word) for word in words) + "))"
+            )
+        self._prefixes = {
+            word: frozenset(prefix for prefix in words if word.startswith(prefix))
+            for word in words
+        }
+
+    def find(self, string: str) -> set:
+        found = set()
+        if self._regex is None:
+            return found
+
+        for match in self._regex.finditer(string):
+            found |= self._prefixes[match.group(1)]
+
+        return found
+
+
+def _is_met(condition, value: str, lower: str, found: set, cased_found: set) -> bool:
+    if isinstance(condition, str):
+        return condition in found
+    if isinstance(condition, Cased):
+        return condition.word in cased_found
+    if isinstance(condition, All):
+        return all(
+            _is_met(sub_condition, value, lower, found, cased_found)
+            for sub_condition in condition.conditions
+        )
+    if isinstance(condition, Any):
+        return any(
+            _is_met(sub_condition, value, lower, found, cased_found)
+            for sub_condition in condition.conditions
+        )
+    if isinstance(condition, StartsWith):
+        return lower.startswith(condition.prefix)
+    if isinstance(condition, Length):
+        string = lower if condition.lower else value
+        length = len(string.strip()) if condition.strip else len(string)
+        return condition.minimum <= length and (
+            condition.maximum is None or length <= condition.maximum
+        )
+
+    raise TypeError(f"Unknown condition: {condition!r}")
+
+
+class RuleTable:
+    """An ordered list of (result, condition) rules. A value is replaced by
+    the result of the first rule whose condition is met, or returned
+    unchanged if none is met. Values that are not strings are returned
+    unchanged.
+
+    The words of all the rules are searched with one scan per value and the
+    results of the last config.RULE_CACHE_SIZE distinct values are memoized,
+    so a repeated value is usually evaluated only once.
+    """
+
+    def __init__(self, name: str, rules: list):
+        self.name = name
+        self.rules = rules
+
+        words, cased_words = set(), set()
+        for _, condition in rules:
+            _collect_words(condition, words, cased_words)
+        self._words = _WordMatcher(words)
+        self._cased_words = _WordMatcher(cased_words)
+
+        # changes when the rules of the table change
+        self.version = hashlib.sha1(repr(rules).encode()).hexdigest()[:12]
+
+        # bounded, the tables live as long as the streamlit server
+        self._cached = functools.lru_cache(maxsize=config.RULE_CACHE_SIZE)(self._evaluate)
+
+    def __call__(self, value):
+        if type(value) != str:
+            return value
+        return self._cached(value)
+
+    def _evaluate(self, value: str):
+        lower = value.lower()
+        found = self._words.find(lower)
+        cased_found = self._cased_words.find(value)
+
+        for rule_result, condition in self.rules:
+            if _is_met(condition, value, lower, found, cased_found):
+                return rule_result
+        return value
+
+    def __repr__(self):
+        return f"RuleTable({self.name!r}, version={self.version!r})"
+
+
+# --- # --- #
+
+# Rule tables
+
+BENEFITS = RuleTable("benefits", [
+    ("Obra Social Prepaga", Any(All("obra", "social"), "prepaga")),
+    ("Home office", Any(All("home", Any("office", "working")), "remoto")),
+    ("Día de cumpleaños libre", Any(All(Any("día", "dia"), "cumple"), "cumpleaños")),
+    ("Horarios flexibles", All("viernes", "f")),
+    ("Días off", All(Any("día", "dia"), Any("off", "libre"))),
+    ("Caja Navideña", All("caja", "navid")),
+    ("Semana laboral de 4 días", All(Any("día", "dia"), "4")),
+    ("Masajes", "masajes"),
+    ("No utilizo", StartsWith("no ")),
+])
+
+JOBS = RuleTable("jobs", [
+    ("SysAdmin / DevOps / SRE", Any("devops", "infra", "sysadmin")),
+    ("Manager / Director", "manager"),
+    ("RPA", "rpa"),
+    ("Fullstack", "full"),
+    ("Cloud Engineer", "cloud"),
+    ("Cybersecurity", Any("cyber", "secur", "ciber", "pentest", All("seg", "inf"))),
+    ("UX/UI Designer", Any("ux", "designer")),
+    ("Technical Leader", Any("lead", "lider")),
+    ("DBA", Any("dba", Cased("BD"))),
+    ("Soporte IT", Any("soport", "supp")),
+    ("QA / Tester", Any("test", "qa")),
+    ("VP / C-Level", Any(Cased("CIO"), Cased("CEO"), Cased("CTO"), "c-")),
+    ("Machine Learning Engineer", Any("machin", "nlp", "mlops", Cased("AI"))),
+    ("HelpDesk", "help"),
+    ("Analista Funcional", Any(All(Cased("funcion"), "analista"), "funcion", "functional")),
+    ("Developer", "developer"),
+    ("Technical Writer", "writer"),
+])
+
+PLATFORMS = RuleTable("platforms", [
+    ("Office 365", Any("office", "o365")),
+    ("Teradata", "teradata"),
+    ("Cisco", "cisco"),
+    ("SAS", "sas"),
+    ("Azure", "azure"),
+    ("Figma", "figma"),
+    ("Odoo", "odoo"),
+    ("Postman", "postman"),
+    ("Microstrategy", "microstrategy"),
+    ("Excel", "excel"),
+    ("Jira", "jira"),
+    ("Oracle", "oracle"),
+    ("Fortinet", "fortinet"),
+    ("Grafana", "grafana"),
+    ("Gitlab", "gitlab"),
+    ("Informatica", "informatica"),
+    ("Miro", "miro"),
+    ("Databricks", "databricks"),
+    ("UiPath", "uipath"),
+    ("Amazon Web Services", "aws"),
+    ("Plesk", "plesk"),
+    ("Confluence", "confluen"),
+    ("Terraform", "terraform"),
+    ("CRM", "crm"),
+    ("Looker", "looker"),
+    ("Mikrotik", Any("microtik", "mikrotik")),
+    ("Qlik View/ Qlik Sense", "qlik"),
+    ("PL/ SQL", All("pl", "sql")),
+    ("ClickUp", All("click", "up")),
+    ("ServiceNow", All("service", "now")),
+    ("Power BI", All("power", "bi")),
+    ("Github Actions", All("github", "action")),
+    ("Control-M", All("control", "m")),
+    ("VirtualBox", All("virtual", "box")),
+    ("BigQuery", All("big", "query")),
+    ("Android Studio", All("android", "studio")),
+    ("Visual Studio", Any(All("visual", "studio"), "vsc")),
+])
+
+LANGUAGES = RuleTable("languages", [
+    ("PL/ SQL", All("pl", "sql")),
+    ("Visual Fox Pro", All("visual", "fox")),
+    ("Visual Basic", All("visual", "basic")),
+    ("PowerShell", All("power", "shell")),
+    ("PowerScript", All("power", Any("script", "builder"))),
+    ("SAS", "sas"),
+    ("Qlik", "qlik"),
+    ("Excel", "excel"),
+    ("Oracle", "oracle"),
+    ("Dax", "dax"),
+])
+
+FRAMEWORKS = RuleTable("frameworks", [
+    ("Nest Js", "nest"),
+    ("Svelte Js", "svelte"),
+    ("Jira", "jira"),
+    ("Yii", "yii"),
+    ("Symfony", "symfony"),
+    ("Angular", "angular"),
+    (".NET Core", ".net"),
+    ("Tailwind", "tailwind"),
+    ("React Native", All("react", "native")),
+    ("Phoenix ", All("pho", "ix")),
+    ("Material UI", All("material", "ui")),
+    ("React.js", "react"),
+    ("Gin Gonic", All("gin", Any(Length(3, 3, strip=True, lower=True), "gonic"))),
+    ("Spring Boot", All("spring", "boot")),
+    ("FastAPI", All("fast", "api")),
+    ("Oracle", "oracle"),
+    ("Vertx", "vert"),
+    ("Xamarin", "xamarin"),
+    ("Micronaut", "micronaut"),
+    ("Grails", "grails"),
+    ("Play Framework", "play"),
+    ("Unity", "unity"),
+    ("Ninguno de los anteriores", Any(Length(maximum=1, lower=True), "ningun")),
+    ("Pandas/ Numpy", Any("pandas", "numpy")),
+])
+
+DATABASES = RuleTable("databases", [
+    ("BigQuery", All("big", "query")),
+    ("Microsoft SQL Server", All("sql", "server")),
+    ("Firebird", All("fire", "bird")),
+    ("Firebase", All("fire", "base")),
+    ("SOQL", Any("soql", "salesforce")),
+    ("InfluxDB", Any("influxdb", "influx")),
+    ("Snowflake", "snowf"),
+    ("Ninguna de las anteriores", Any(StartsWith("no "), Length(maximum=1, lower=True))),
+])
+
+TESTING_TOOLS = RuleTable("testing_tools", [
+    ("Pytest", "pytest"),
+    ("Tosca", "tosca"),
+    ("Ninguna de las anteriores", Any("ning", Length(maximum=1), StartsWith("no "))),
+    ("Jasmine", "jasmine"),
+    ("Mockito", "mockito"),
+    ("QMetry", "qmetry"),
+    ("ScalaTest", "scalatest"),
+    ("Locust", "locust"),
+    ("GTest", "gtest"),
+    ("Insomnia", "insomnia"),
+    ("Jmeter", "jmeter"),
+    ("Playwright", "playwright"),
+    ("WebDriverIO", All("webdriver", "io")),
+    ("Quick & Nimble", All("quick", "nimble")),
+    ("Test Manual", All("manual", "test")),
+    ("React Testing Library", All("testing", "react")),
+    ("Unittest", All("unit", "test")),
+    ("Eclipse RCPTT", Any("eclipse", "rcptt")),
+])
+
+CAREERS = RuleTable("careers", [
+    ("Licenciatura en Economía", "econom"),
+    ("Traductorado", "traduc"),
+    ("Licenciatura en Sociología", "sociolog"),
+    ("Marketing", "marketing"),
+    ("Contador Público", "contador"),
+    ("Filosofía", "filosof"),
+    ("Licenciatura en Ciencia Política", "política"),
+    ("Licenciatura en Psicología", "psicolog"),
+    ("Analista de Computación", All("analista ", "computac")),
+    ("Diseño Industrial", All("diseño ", "industrial")),
+    ("Tecnicatura en Programación", All("program", "tecnicatura ")),
+    ("Licenciatura en Comunicación Social", All("comunicaci", "social")),
+    ("Licenciatura en Comunicación", All(StartsWith("lic"), "comunicaci")),
+    ("Licenciatura en Comunicación", All("comunicaci", Length(maximum=14))),
+    ("Licenciatura en Gestión de la Información", All(StartsWith("lic"), "gesti", "inform")),
+    ("Licenciatura en Ciencia de Datos", All(StartsWith("lic"), "en ciencia", " de datos")),
+    ("Ciencia de Datos", "ciencia de datos"),
+    ("Licenciatura en Matemática", All(StartsWith("lic"), "matem")),
+    ("Licenciatura en Física", All(StartsWith("lic"), Any("fisica", "física"))),
+    ("Recursos Humanos", Any("recursos humanos", "hr", "rrhh")),
+    ("Ciberseguridad", All("ciber", "seguridad")),
+    ("Seguridad Informática", All("inf", "seguridad")),
+    ("Ingeniería en Mecatrónica", All(StartsWith("ing"), "meca")),
+    ("Tecnicatura en Desarrollo Web", All(StartsWith("tec"), "web", "desarrollo")),
+    ("Derecho", Any("abog", "derecho")),
+    ("Licenciatura en Relaciones Internacionales", All(StartsWith("lic"), "inter", "rela")),
+])
+
+BOOTCAMPS = RuleTable("bootcamps", [
+    ("ADA ITW", "ada"),
+    # the value is in lower case, so "SAP" is never found
+    ("SAP", "SAP"),
+    ("Alkemy", "alkemy"),
+    ("Udemy", "udemy"),
+    ("Nucba", "nucba"),
+    ("Accenture", "accentur"),
+    ("Platzi", "platzi"),
+    ("Soy Henry", "henry"),
+    ("Globant", "globant"),
+    ("Egg Educacion", "egg"),
+    ("Codo a Codo", "codo "),
+    ("Freecodecamp", "free"),
+    ("Acámica", Any("acamica", "acámica")),
+    ("BootCamp MercadoLibre", Any("mercado", "meli")),
+    ("Mindhub", All("mind", "hub")),
+    ("Comunidad IT", All("comunidad", "it")),
+    ("Coderhouse", All("code", "house")),
+    ("Digital House", All("digital", "house")),
+    ("Educación IT", All("educaci", "it")),
+    ("Argentina Programa", All("argentina", "programa")),
+    ("Plataforma 5", All("plataforma", "5")),
+    ("Open BootCamp", All("open", "bootcamp")),
+    ("Mujeres en Tecnologia", Any("mujeres", "met ", All("met", Length(maximum=3)))),
+    ("UTN", Any(All("utn", Length(maximum=3)), " utn", "utn ")),
+])
+
+BOOTCAMP_THEMES = RuleTable("bootcamp_themes", [
+    ("Full Stack Developer", Any("full", "mern")),
+    ("Javascript", "javas"),
+    ("Certified Tech Developer", "certified tech developer"),
+    ("Java", "java"),
+    ("Salesforce", "salesfor"),
+    (".NET", ".net"),
+    ("Python", "python"),
+    ("DevOps", "devops"),
+    ("Web Developer", "web"),
+    ("UX/UI", Any(All("ux", "ui"), "ux")),
+    ("Frontend", "front"),
+    ("Backend", All("back", "end")),
+    ("Data Analyst", All("data", "aly")),
+    ("Data Science", All("dat", Any("scien", "cien"))),
+    ("Big Data", All("dat", Any("big", "engin"))),
+    ("QA Testing", Any("qa", "test")),
+    ("React.js", "react"),
+    ("Desarrollo Mobile", Any("mobile", "movil", "android", "swift", "ios")),
+    ("SAP", Any(StartsWith("sap "), All(StartsWith("sap"), Length(maximum=3)))),
+    (
+        "Ninguna de las anteriores",
+        Any(
+            StartsWith("no "),
+            All(StartsWith("no"), Length(maximum=3)),
+            Length(1, 1),
+        ),
+    ),
+])
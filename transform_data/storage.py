@@ -0,0 +1,421 @@
+import glob
+import json
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import config
+
+
+def processed_path(name: str, file_format: str = None) -> Path:
+    """Returns the path in config.FOLDER_PATH where a processed
+    survey called name is stored.
+
+    :param name: The name of the survey, with or without extension.
+    :type name: str
+    :param file_format: One of config.FILE_FORMATS,
+        config.FILE_FORMAT by default.
+    :type file_format: str
+    :return: The path of the processed file.
+    :rtype: Path
+    """
+    file_format = file_format or config.FILE_FORMAT
+    return config.FOLDER_PATH / (Path(name).stem + "." + file_format)
+
+
+def list_surveys() -> list[Path]:
+    """Returns the processed surveys saved in config.FOLDER_PATH,
+    ignoring any other file stored in the folder.
+
+    :return: The paths of the processed files sorted by name.
+    :rtype: list[Path]
+    """
+    if not config.FOLDER_PATH.exists():
+        return []
+
+    return sorted(
+        path for path in config.FOLDER_PATH.glob("*")
+        if path.is_file() and path.suffix[1:] in config.FILE_FORMATS
+    )
+
+
+def _downcast(values: pd.Series) -> pd.Series:
+    # the smallest numeric dtype that keeps every value as it is
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return values
+    if pd.api.types.is_integer_dtype(values.dtype):
+        return pd.to_numeric(values, downcast="integer")
+    if values.dtype == "float64":
+        compact = values.astype("float32")
+        if compact.astype("float64").equals(values):
+            return compact
+    return values
+
+
+def to_storage_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Prepares the dtypes of a processed survey to be stored in a
+    columnar file and kept in memory. Text columns with few distinct
+    answers are converted to categories (dictionary encoded in the file),
+    text columns that mix strings with numbers are converted to strings,
+    and numeric columns are stored in the smallest dtype that keeps
+    their values (int8 for the answers from 1 to 10, float32 for the
+    ages and salaries without decimals...). The ranges of the
+    "(valores reescritos)" columns are already ordered categories.
+
+    :param df: The processed survey.
+    :type df: pd.DataFrame
+    :return: A copy of the survey with the storage dtypes.
+    :rtype: pd.DataFrame
+    """
+    df = df.copy()
+
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        not_null = values.notna()
+
+        # pyarrow can't store columns with mixed types
+        if not values[not_null].map(type).eq(str).all():
+            values = values.where(~not_null, values.astype(str))
+
+        if values.nunique() <= len(values) * config.CATEGORY_MAX_UNIQUE_RATIO:
+            values = values.astype("category")
+
+        df[column] = values
+
+    for column in df.columns[df.dtypes != object]:
+        df[column] = _downcast(df[column])
+
+    return df
+
+
+def from_storage_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Reverts the categories and the numeric dtypes of to_storage_dtypes,
+    so a stored survey has the dtypes it had when it was processed. The
+    ordered categories are kept, and the columns that mixed strings with
+    numbers stay strings.
+
+    :param df: The stored survey.
+    :type df: pd.DataFrame
+    :return: A copy of the survey with the dtypes of the transform.
+    :rtype: pd.DataFrame
+    """
+    df = df.copy()
+
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype) and not values.cat.ordered:
+            df[column] = values.astype(object)
+        elif pd.api.types.is_bool_dtype(values.dtype):
+            continue
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            df[column] = values.astype("int64")
+        elif pd.api.types.is_float_dtype(values.dtype):
+            df[column] = values.astype("float64")
+
+    return df
+
+
+def save_survey(df: pd.DataFrame, name: str, file_format: str = None) -> Path:
+    """Saves a processed survey in config.FOLDER_PATH.
+
+    :param df: The processed survey.
+    :type df: pd.DataFrame
+    :param name: The name of the survey.
+    :type name: str
+    :param file_format: One of config.FILE_FORMATS,
+        config.FILE_FORMAT by default.
+    :type file_format: str
+    :return: The path of the saved file.
+    :rtype: Path
+    """
+    path = processed_path(name, file_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix == ".csv":
+        df.to_csv(path)
+    elif path.suffix == ".parquet":
+        to_storage_dtypes(df).to_parquet(path, engine="pyarrow")
+    elif path.suffix == ".feather":
+        # feather files can't store the index of the dataframe
+        to_storage_dtypes(df).reset_index().to_feather(path)
+    else:
+        raise ValueError(f"Unsupported file format: {path.suffix}")
+
+    return path
+
+
+def _unify_types(types: list, dictionaries: bool) -> pa.DataType:
+    # the type of a column that has these types in different chunks
+    types = [data_type for data_type in types if not pa.types.is_null(data_type)]
+    if not types:
+        return pa.null()
+
+    if all(data_type == types[0] for data_type in types):
+        if dictionaries or not pa.types.is_dictionary(types[0]) or types[0].ordered:
+            return types[0]
+
+    # the numbers are downcast in each chunk
+    if all(pa.types.is_signed_integer(data_type) for data_type in types):
+        return max(types, key=lambda data_type: data_type.bit_width)
+
+    if all(
+                pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+                for data_type in types
+            ):
+        return pa.float64()
+
+    if dictionaries and any(pa.types.is_dictionary(data_type) for data_type in types) and all(
+                pa.types.is_dictionary(data_type) or pa.types.is_string(data_type)
+                for data_type in types
+            ):
+        return pa.dictionary(pa.int32(), pa.string())
+
+    return pa.string()
+
+
+def _cast_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    columns = []
+    for field in schema:
+        column = table.column(field.name)
+        if pa.types.is_dictionary(field.type) and not pa.types.is_dictionary(column.type):
+            # text can't be cast to categories
+            column = pc.dictionary_encode(column.cast(field.type.value_type))
+        columns.append(column.cast(field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class SurveyWriter:
+    """Saves a processed survey in config.FOLDER_PATH one chunk at a time,
+    so only one chunk is in memory. The chunks are stored in a temporary
+    folder and copied to the file when it is closed, with the types of
+    their columns unified: numbers that are integers in some chunks are
+    stored as floats, and text that is a category in some chunks is
+    stored as a category. The feather files store as text the categories
+    that are not ordered, since their categories can't change between chunks.
+
+    :param name: The name of the survey.
+    :type name: str
+    :param file_format: One of config.FILE_FORMATS,
+        config.FILE_FORMAT by default.
+    :type file_format: str
+    """
+
+    def __init__(self, name: str, file_format: str = None):
+        self.path = processed_path(name, file_format)
+        if self.path.suffix[1:] not in config.FILE_FORMATS:
+            raise ValueError(f"Unsupported file format: {self.path.suffix}")
+        self.rows = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._folder = tempfile.TemporaryDirectory(
+            dir=self.path.parent, prefix="." + self.path.stem + "."
+        )
+        self._parts = []
+
+    def write(self, df: pd.DataFrame):
+        """Adds the rows of a chunk to the survey.
+
+        :param df: The processed chunk.
+        :type df: pd.DataFrame
+        """
+        folder = Path(self._folder.name)
+
+        if self.path.suffix == ".csv":
+            part = folder / self.path.name
+            df.to_csv(part, mode="a", header=not part.exists())
+            self._parts = [part]
+        else:
+            df = to_storage_dtypes(df)
+            if self.path.suffix == ".feather":
+                df = df.reset_index()
+            table = pa.Table.from_pandas(
+                df, preserve_index=self.path.suffix == ".parquet"
+            )
+            part = folder / (str(len(self._parts)) + ".parquet")
+            pq.write_table(table, part)
+            self._parts.append(part)
+
+        self.rows += len(df)
+
+    def close(self) -> Path:
+        """Writes the survey with the chunks added so far
+        and removes the temporary folder.
+
+        :return: The path of the saved file.
+        :rtype: Path
+        """
+        try:
+            if not self._parts:
+                raise ValueError("The survey has no chunks")
+
+            if self.path.suffix == ".csv":
+                self._parts[0].replace(self.path)
+                return self.path
+
+            schemas = [pq.read_schema(part) for part in self._parts]
+            if any(schema.names != schemas[0].names for schema in schemas):
+                raise ValueError("The chunks of the survey have different columns")
+
+            dictionaries = self.path.suffix == ".parquet"
+            schema = pa.schema(
+                [
+                    pa.field(name, _unify_types(
+                        [chunk_schema.field(name).type for chunk_schema in schemas],
+                        dictionaries,
+                    ))
+                    for name in schemas[0].names
+                ],
+                metadata=schemas[0].metadata,
+            )
+
+            # the file is replaced once it is complete
+            partial = Path(self._folder.name) / self.path.name
+            if dictionaries:
+                writer = pq.ParquetWriter(partial, schema)
+            else:
+                writer = pa.ipc.new_file(
+                    partial, schema,
+                    options=pa.ipc.IpcWriteOptions(compression="lz4"),
+                )
+            with writer:
+                for part in self._parts:
+                    writer.write_table(_cast_table(pq.read_table(part), schema))
+            partial.replace(self.path)
+        finally:
+            self._folder.cleanup()
+
+        return self.path
+
+
+def load_survey(path: Path) -> pd.DataFrame:
+    """Reads a processed survey, the format is
+    chosen based on the extension of the file.
+    The survey has the dtypes of to_storage_dtypes.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :return: The processed survey.
+    :rtype: pd.DataFrame
+    """
+    path = Path(path)
+
+    if path.suffix == ".csv":
+        # the dtypes of the columnar files, lost in the text
+        return to_storage_dtypes(pd.read_csv(path, index_col=0))
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, engine="pyarrow")
+    if path.suffix == ".feather":
+        df = pd.read_feather(path).set_index("index")
+        df.index.name = None
+        return df
+
+    raise ValueError(f"Unsupported file format: {path.suffix}")
+
+
+def iter_survey(path: Path, chunksize: int = None):
+    """Reads a processed survey chunksize rows at a time, so the whole
+    survey is never in memory. The chunks have the dtypes of
+    to_storage_dtypes, and together the rows and values of load_survey.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :param chunksize: The maximum number of rows of each chunk,
+        config.CHUNK_SIZE by default.
+    :type chunksize: int
+    :return: The chunks of the processed survey.
+    :rtype: Iterator[pd.DataFrame]
+    """
+    path = Path(path)
+    chunksize = chunksize or config.CHUNK_SIZE
+
+    if path.suffix == ".csv":
+        with pd.read_csv(path, index_col=0, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield to_storage_dtypes(chunk)
+    elif path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif path.suffix == ".feather":
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for number in range(reader.num_record_batches):
+                batch = reader.get_batch(number)
+                for start in range(0, batch.num_rows, chunksize):
+                    df = batch.slice(start, chunksize).to_pandas().set_index("index")
+                    df.index.name = None
+                    yield df
+    else:
+        raise ValueError(f"Unsupported file format: {path.suffix}")
+
+
+def report_path(name: str, kind: str, extension: str = "json") -> Path:
+    """Returns the path in config.REPORTS_FOLDER_PATH where a report
+    about the processing of a survey is stored.
+
+    :param name: The name of the survey, with or without extension.
+    :type name: str
+    :param kind: The kind of report, part of the file name.
+    :type kind: str
+    :param extension: The extension of the report file.
+    :type extension: str
+    :return: The path of the report.
+    :rtype: Path
+    """
+    return config.REPORTS_FOLDER_PATH / (
+        Path(name).stem + "." + kind + "." + extension
+    )
+
+
+def save_report(report: dict, name: str, kind: str) -> Path:
+    """Saves a report about the processing of a survey as JSON.
+
+    :param report: The report, must be serializable to JSON.
+    :type report: dict
+    :param name: The name of the survey.
+    :type name: str
+    :param kind: The kind of report.
+    :type kind: str
+    :return: The path of the saved report.
+    :rtype: Path
+    """
+    path = report_path(name, kind)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return path
+
+
+def load_report(name: str, kind: str) -> dict:
+    """Reads a report about the processing of a survey.
+
+    :param name: The name of the survey.
+    :type name: str
+    :param kind: The kind of report.
+    :type kind: str
+    :return: The report, None if it doesn't exist.
+    :rtype: dict
+    """
+    path = report_path(name, kind)
+    if not path.exists():
+        return None
+
+    return json.loads(path.read_text())
+
+
+def delete_survey(path: Path):
+    """Deletes a processed survey and its reports.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    """
+    path = Path(path)
+    path.unlink(missing_ok=False)
+
+    if config.REPORTS_FOLDER_PATH.exists():
+        for report in config.REPORTS_FOLDER_PATH.glob(glob.escape(path.stem) + ".*.*"):
+            # <stem>.<kind>.<extension>, not the reports of "<stem>.<other>"
+            if report.name[len(path.stem) + 1:].count(".") == 1:
+                report.unlink()
@@ -0,0 +1,283 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+# Rows generated at a time, each block has its own random generator
+# so a survey is the same whatever the number of rows written before
+BLOCK_ROWS = 100_000
+
+# Answers of the columns with one answer, with the fraction left blank
+CHOICES = {
+    config.COUNTRIES: (["Argentina"] * 9 + ["Chile", "Uruguay"], 0),
+    config.PROVINCES: (config.ARGENTINE_PROVINCES, 0),
+    config.PAYMENTS_IN_DOLLARS: (
+        [
+            config.ALL_SALARY_IN_DOLLARS,
+            "Cobro parte del salario en dólares",
+            "Mi sueldo está dolarizado (pero cobro en moneda local)",
+        ],
+        0.7,
+    ),
+    config.SALARY_COMPLIANCE: ([1, 2, 3, 4], 0),
+    config.SEMI_ANNUAL_SALARY_COMPLIANCE: ([1, 2, 3, 4], 0),
+    config.POSITIONS: (
+        [
+            "Developer", "Developer", "Developer", "SysAdmin / DevOps / SRE",
+            "Technical Leader", "QA / Tester", "Data Engineer", "Data Scientist",
+            "BI Analyst / Data Analyst", "Manager / Director", "Project Manager",
+            "Architect", "Infraestructura", "Lider de proyecto", "Help Desk",
+            "Analista funcional", "Cyber security analyst", "Product Owner",
+            "Soporte técnico", "ux designer", "Data Wizard",
+        ],
+        0,
+    ),
+    config.TIME_IN_CURRENT_ROLE: (list(range(0, 15)), 0.02),
+    config.DAYS_IN_OFFICE: ([0, 1, 2, 3, 4, 5], 0.5),
+    config.WORKPLACE_RECOMMENDATION: (list(range(0, 11)), 0),
+    config.MAX_LVL_STUDIES: (
+        [
+            "Universitario", "Terciario", "Secundario",
+            "Posgrado/Especialización", "Maestría", "Doctorado",
+        ],
+        0.05,
+    ),
+    config.STUDIES_STATE: (["Completo", "En curso", "Incompleto"], 0.1),
+    config.CAREER: (
+        [
+            "Ingeniería en Sistemas de Información", "Licenciatura en Sistemas",
+            "Ingeniería en Informática", "Economía", "Lic. en Ciencia de Datos",
+            "Tecnicatura en programación ", "Analista de Computación",
+            "Recursos Humanos", "Abogacía", "Lic. Matemática", "Contador público",
+            "Lic en comunicación", "Diseño industrial", "Psicología",
+        ],
+        0.15,
+    ),
+    config.UNIV: (["UBA", "UTN", "UNLP", "UNC", "UADE", "ITBA", "UNLaM"], 0.1),
+    config.BOOTCAMP: (
+        [
+            "No", "No", "no, nunca", "Si, Coderhouse", "Digital House / Acamica",
+            "Platzi y Udemy", "Alkemy; Soy Henry", "Mercado Libre",
+            "Argentina Programa", "codo a codo", "Open bootcamp", "ada itw",
+            "Plataforma 5", "Mujeres en tecnologia", "freecodecamp",
+        ],
+        0.5,
+    ),
+    config.TRAINING_IN: (
+        [
+            "Full Stack", "Javascript", "Java", "Python", "Data Science",
+            "UX/UI", "QA", "No", "SAP", "Frontend", "Back end", "MERN",
+            "Data analytics", "Desarrollo android", ".net",
+        ],
+        0.5,
+    ),
+    config.U_HAVE_GUARDS: (["No", "Sí, pasiva", "Sí, activa"], 0),
+    config.GENDER: (config.VALID_GENDER_CATEGORIES + ["Hombre", "Otro"], 0),
+    config.ORGANIZATION_SIZE: (
+        [
+            "10001+", "5001-10000", "2001-5000", "1001-2000", "501-1000",
+            "201-500", "101-200", "51-100", "11-50", "2-10", "1 (solamente yo)",
+        ],
+        0,
+    ),
+    config.CONTRACT: (["Staff (planta permanente)", "Contractor", "Freelance"], 0),
+    config.WORK_MODALITY: (
+        ["100% remoto", config.HYBRID_MODALITY, "100% presencial"], 0
+    ),
+    config.BONUS: (["No", "Un sueldo", "Menos de un sueldo", "3+ sueldos"], 0),
+    config.EMPLOYMENT_STATUS: (["Full-Time", "Part-Time"], 0),
+    config.INFLATION_ADJUSTMENTS: (["No", "Uno", "Dos", "Tres", "Más de tres"], 0),
+}
+
+# Answers of the multiple choice columns, the names are written in several
+# ways like in the real surveys, some with commas inside parentheses.
+# The rest of the answers are free text, most of them written only once.
+MULTIPLE_CHOICES = {
+    config.BENEFITS: [
+        "Obra social", "Prepaga", "Home office", "Día de cumpleaños libre",
+        "Viernes flex", "Días off", "Caja navideña", "Semana de 4 días",
+        "Masajes", "No tengo", "Gimnasio", "Capacitaciones (cursos, libros)",
+        "Bono extra", "Clases de idiomas", "Comidas pagas / subsidiadas",
+    ],
+    config.PLATFORMS_COLUMN: [
+        "Amazon Web Services", "aws", "Azure", "Docker", "Kubernetes", "Linux",
+        "Office365", "o365", "jira", "Power BI", "Visual Studio Code", "vsc",
+        "Google Cloud Platform (GCP, App Engine)", "Oracle cloud", "SAP",
+        "pl/sql", "Big Query", "Windows Server", "VMWare", "Terraform",
+    ],
+    config.LANGUAGES: [
+        "Python", "Javascript", "Java", "SQL", "PL/SQL", "Visual Basic",
+        "PowerShell", "Excel", "C#", "Go", "Rust", "Dax", "TypeScript",
+        "HTML", "CSS", "PHP", "Bash/Shell", "Kotlin",
+    ],
+    config.FRAMEWORKS: [
+        "React.js", "Angular", ".NET", "Django", "Flask", "Spring Boot",
+        "Node.js", "Pandas", "numpy", "Nest", "FastAPI", "Ninguno", "Tailwind",
+        "react native", "Vue.js", "Laravel", "Express",
+    ],
+    config.DATABASES_COLUMN: [
+        "MySQL", "PostgreSQL", "Microsoft SQL Server", "MongoDB", "Redis",
+        "Oracle", "BigQuery", "snowflake", "no uso", "Firebase", "MariaDB",
+        "Elasticsearch", "SQLite",
+    ],
+    config.QA: [
+        "Selenium", "Jest", "pytest", "Cypress", "Postman", "Ninguna",
+        "JUnit", "JMeter", "unit test", "Playwright", "Test manual",
+    ],
+}
+
+# Fraction of the multiple choice answers that are free text
+FREE_TEXT = 0.08
+
+
+def _choices(rng: np.random.Generator, values: list, rows: int, blank: float) -> np.ndarray:
+    answers = np.array(values, dtype=object)[rng.integers(len(values), size=rows)]
+    if blank:
+        answers[rng.random(rows) < blank] = np.nan
+    return answers
+
+
+def _multiple_choices(
+            rng: np.random.Generator, column: str, values: list, rows: int
+        ) -> list:
+    # up to 5 answers per row, a tenth of the rows without answers
+    counts = rng.integers(1, 6, size=rows)
+    counts[rng.random(rows) < 0.1] = 0
+    picks = rng.integers(len(values), size=(rows, 5))
+
+    # the free text answers, with the frequencies of Zipf's law
+    free = rng.random((rows, 5)) < FREE_TEXT
+    texts = rng.zipf(1.3, size=(rows, 5)) % 100_000
+    values = list(values)
+    label = column.split()[0].lower()
+
+    answers = []
+    for count, row, row_free, row_texts in zip(
+                counts.tolist(), picks.tolist(), free.tolist(), texts.tolist()
+            ):
+        if count == 0:
+            answers.append(np.nan)
+            continue
+        chosen = dict.fromkeys(
+            f"{label} {text}" if is_free else values[pick]
+            for pick, is_free, text in zip(row[:count], row_free, row_texts)
+        )
+        answers.append(", ".join(chosen))
+    return answers
+
+
+def _with_text(rng: np.random.Generator, numbers: np.ndarray, texts: list, fraction: float) -> np.ndarray:
+    # numbers with a fraction of the answers written as text
+    answers = numbers.astype(object)
+    written = rng.random(len(numbers)) < fraction
+    answers[written] = np.array(texts, dtype=object)[
+        rng.integers(len(texts), size=written.sum())
+    ]
+    return answers
+
+
+def generate_block(rows: int, seed: int = 0, block: int = 0) -> pd.DataFrame:
+    """Generates the answers of a raw survey, with the columns of
+    config.REQUIRED_COLUMNS and config.OPTIONAL_COLUMNS and the values
+    written as in the real surveys: names with different spellings,
+    free text, numbers written as text and outliers.
+
+    :param rows: The number of answers.
+    :type rows: int
+    :param seed: The seed of the survey.
+    :type seed: int
+    :param block: The number of the block in the survey,
+        each block has different answers.
+    :type block: int
+    :return: The raw survey, like a downloaded one.
+    :rtype: pd.DataFrame
+    """
+    rng = np.random.default_rng([seed, block])
+    df = pd.DataFrame(index=pd.RangeIndex(rows))
+
+    for column, (values, blank) in CHOICES.items():
+        df[column] = _choices(rng, values, rows, blank)
+    for column, values in MULTIPLE_CHOICES.items():
+        df[column] = _multiple_choices(rng, column, values, rows)
+
+    # salaries with a long tail, some written in thousands or in dollars
+    gross = rng.lognormal(12.5, 0.8, rows).round()
+    small = rng.random(rows) < 0.03
+    gross[small] = (gross[small] / 1000).round()
+    df[config.GROSS_SALARY] = gross
+    df[config.NET_SALARY] = (gross * rng.uniform(0.6, 0.9, rows)).round()
+    df.loc[rng.random(rows) < 0.01, config.NET_SALARY] = np.nan
+
+    df[config.LAST_VALUE_EXCHANGE] = _with_text(
+        rng,
+        rng.normal(370, 20, rows).round(1),
+        [
+            "blue", "oficial 210", "mep 380", "no", "No se", "$ 370,50",
+            "dolar blue", "crypto 390", "bna 215", "no aplica", "350 pesos",
+            "200 y 300",
+        ],
+        0.3,
+    )
+    df.loc[rng.random(rows) < 0.75, config.LAST_VALUE_EXCHANGE] = np.nan
+
+    df[config.YEARS_OF_EXPERIENCE] = _with_text(
+        rng, rng.gamma(2, 4, rows).round(), ["dos", "1 año", "60", "-"], 0.01
+    )
+    df[config.TIME_IN_CURRENT_COMPANY] = _with_text(
+        rng, rng.gamma(1.5, 2, rows).round(1), ["0.5", "recién entro"], 0.01
+    )
+    # a number in the form of the survey, only the outliers are wrong
+    dependents = rng.poisson(1, rows)
+    dependents[rng.random(rows) < 0.005] = 500
+    df[config.DEPENDENTS] = dependents
+    df[config.AGE] = _with_text(
+        rng, rng.normal(32, 8, rows).clip(16, 80).round(),
+        ["treinta", "30 años", "25-30", "150"], 0.01,
+    )
+
+    return df
+
+
+def write_survey(path: Path, rows: int, seed: int = 0) -> Path:
+    """Writes a synthetic raw survey as a CSV file, a block at a time, so
+    surveys of millions of answers are written without having them in
+    memory. The same rows and seed always write the same file.
+
+    :param path: The path of the CSV file.
+    :type path: Path
+    :param rows: The number of answers.
+    :type rows: int
+    :param seed: The seed of the survey.
+    :type seed: int
+    :return: The path of the CSV file.
+    :rtype: Path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        for block, start in enumerate(range(0, rows, BLOCK_ROWS)):
+            df = generate_block(min(BLOCK_ROWS, rows - start), seed, block)
+            df.to_csv(file, header=block == 0, index=False)
+
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Escribe una encuesta sintética con las columnas "
+        "y el tipo de respuestas de las encuestas reales"
+    )
+    parser.add_argument("rows", type=int, help="Cantidad de respuestas")
+    parser.add_argument("path", type=Path, help="Archivo CSV")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_survey(args.path, args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,30 +3,451 @@ import re
 import numpy as np
 import pandas as pd
 
+import transform_data.aggregates as aggregates
+import transform_data.filters as filters
+import transform_data.fingerprints as fingerprints
+import transform_data.profiling as profiling
+import transform_data.rules as rules
 import transform_data.utils as utils
+import transform_data.storage as storage
 import config
 
 
+# Jobs with "data" in their name answered only once are replaced with
+DATA_JOB = 'BI Analyst / Data Analyst'
+
+
+def _survey_counts(key: str, count, counts: dict = None, collect: dict = None) -> pd.Series:
+    # The counts of the values of the survey that decide which values are
+    # kept, count() on the rows of df. When the survey is transformed in
+    # chunks, the first pass adds the counts of each chunk to collect and
+    # gets None, so it leaves the values as they are, and the second pass
+    # gets the counts of the whole survey from counts.
+    if counts is not None:
+        return counts[key]
+
+    chunk_counts = count()
+    if collect is None:
+        return chunk_counts
+
+    if key in collect:
+        chunk_counts = collect[key].add(chunk_counts, fill_value=0).astype("int64")
+    collect[key] = chunk_counts
+    return None
+
+
+def _fix_tags(
+            df: pd.DataFrame, column: str, fix, replace_fix,
+            fill: str, report: dict, counts: dict = None, collect: dict = None
+        ) -> list:
+    # the tags chosen less than config.MIN_AMOUNT times are replaced with fill
+    df[column] = df[column].apply(utils.cut_string)
+    tags = _survey_counts(
+        column,
+        lambda: utils.apply_unique(utils.flatten(df[column]), fix, report).value_counts(),
+        counts,
+        collect,
+    )
+    if tags is None:
+        return [column]
+    valid_tags = tags[tags >= config.MIN_AMOUNT].index.to_list()
+    df.loc[df[column].notna(), column].apply(lambda x: utils.replace_list_values(x, valid_tags, fill, replace_fix))
+    df[column] = df[column].apply(lambda x: ' - '.join(x) if type(x) == list else x)
+    return [column]
+
+
+# Steps of main that use the tables of transform_data.rules, each one
+# changes the survey in place and returns the columns it rewrote
+
+
+def _transform_benefits(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Con qué beneficios contas
+    return _fix_tags(df, config.BENEFITS, utils.fix_benefit_name, utils.fix_benefit_name, "Otros", report, counts, collect)
+
+
+def _transform_platforms(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Plataformas que utilizas en tu puesto actual
+    return _fix_tags(df, config.PLATFORMS_COLUMN, utils.fix_platform_name, utils.fix_platform_name, config.FILL_WITH, report, counts, collect)
+
+
+def _transform_languages(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Lenguajes de programación o tecnologías que utilices en tu puesto actual
+    return _fix_tags(df, config.LANGUAGES, utils.fix_languages_name, utils.fix_languages_name, config.FILL_WITH, report, counts, collect)
+
+
+def _transform_frameworks(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Frameworks, herramientas y librerías que utilices en tu puesto actual
+    return _fix_tags(df, config.FRAMEWORKS, utils.fix_framework_name, utils.fix_languages_name, config.FILL_WITH, report, counts, collect)
+
+
+def _transform_databases(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Bases de datos
+    return _fix_tags(df, config.DATABASES_COLUMN, utils.fix_DB_name, utils.fix_DB_name, config.FILL_WITH, report, counts, collect)
+
+
+def _transform_qa(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # QA / Testing
+    return _fix_tags(df, config.QA, utils.fix_testing_tool_name, utils.fix_testing_tool_name, config.FILL_WITH, report, counts, collect)
+
+
+def _transform_bootcamps(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # ¿Participaste de algún Boot Camp?
+
+    bootcamps = utils.get_strings(df[config.BOOTCAMP])
+    bootcamps_lower = bootcamps.str.lower()
+    values_to_avoid = (
+        (bootcamps_lower.str.contains("no", regex=False, na=False) & (bootcamps.str.len() < 3)) |
+        bootcamps_lower.str.contains("no,", regex=False, na=False)
+    )
+    bootcamps[values_to_avoid] = np.NaN
+
+    # Normalize the separation of bootcamps
+    values_to_reset = bootcamps.str.startswith("Si,", na=False) | bootcamps_lower.str.contains("ux/ui", regex=False, na=False)
+    bootcamps[values_to_reset] = bootcamps[values_to_reset].str.replace(r"Si,|ux/ui", " ", regex=True)
+
+    # the remaining "/" are separators too
+    separators_regex = r"\s*(?: / | y |, |;)\s*|/"
+
+    bootcamps = bootcamps.str.replace(separators_regex, " - ", regex=True)
+    df[config.BOOTCAMP] = bootcamps.str.strip().str.split(" - ")
+
+    bootcamps_list = _survey_counts(
+        config.BOOTCAMP,
+        lambda: utils.apply_unique(utils.flatten(df[config.BOOTCAMP]), utils.fix_bootcamp_name, report).value_counts(),
+        counts,
+        collect,
+    )
+    if bootcamps_list is None:
+        return [config.BOOTCAMP]
+    valid_bootcamps = bootcamps_list[bootcamps_list >= config.MIN_AMOUNT].index.to_list()
+    df.loc[df[config.BOOTCAMP].notna(), config.BOOTCAMP].apply(lambda x: utils.replace_list_values(x, valid_bootcamps, config.FILL_WITH, utils.fix_bootcamp_name))
+    df[config.BOOTCAMP] = df[config.BOOTCAMP].apply(lambda x: ' - '.join(x) if type(x) == list else x)
+    return [config.BOOTCAMP]
+
+
+def _transform_careers(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Carrera
+
+    df.loc[df[config.CAREER].isna() & df[config.STUDIES_STATE].notna(), config.STUDIES_STATE] = np.NaN
+    df[config.CAREER] = utils.apply_unique(df[config.CAREER], utils.group_careers, report)
+    df.loc[df[config.CAREER].notna() & df[config.STUDIES_STATE].isna(), config.CAREER] = np.NaN
+    return [config.STUDIES_STATE, config.CAREER]
+
+
+def _transform_training(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # Si participaste de un Boot Camp, ¿qué carrera estudiaste
+
+    if config.TRAINING_IN not in df.columns:
+        return []
+
+    df[config.TRAINING_IN] = utils.apply_unique(df[config.TRAINING_IN], utils.fix_bootcamp_theme_name, report)
+    valid_bootcamp_theme = _survey_counts(
+        config.TRAINING_IN,
+        lambda: utils.apply_unique(df[config.TRAINING_IN], utils.fix_bootcamp_theme_name, report, "valid_bootcamp_themes").value_counts(),
+        counts,
+        collect,
+    )
+    if valid_bootcamp_theme is None:
+        return [config.TRAINING_IN]
+    valid_bootcamp_theme = valid_bootcamp_theme[valid_bootcamp_theme > config.MIN_AMOUNT].index.to_list()
+    df[config.TRAINING_IN] = utils.apply_unique(df[config.TRAINING_IN], lambda x: config.FILL_WITH if (isinstance(x, str) and x not in valid_bootcamp_theme) else x, report, "rare_bootcamp_themes")
+    return [config.TRAINING_IN]
+
+
+def _rewrite_rare_careers(
+            df: pd.DataFrame, report: dict,
+            counts: dict = None, collect: dict = None
+        ) -> list:
+    # The careers that appear rarely repeated are rewritten with the value constants.FILL_WITH
+    carreer_counts = _survey_counts(
+        config.CAREER, lambda: df.groupby(config.CAREER).size(), counts, collect
+    )
+    if carreer_counts is None:
+        return []
+    rare_carreers = carreer_counts[carreer_counts < config.MIN_AMOUNT].index
+    df[config.CAREER + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.CAREER], lambda x: config.FILL_WITH if x in rare_carreers else x, report, "rare_careers")
+    return [config.CAREER + config.REWRITTEN_COLUMN_SUFFIX]
+
+
+# The steps that use each table of transform_data.rules, the only ones
+# repeated when just the tables change: (steps on the rows kept before
+# the last filters of main, steps on the processed survey)
+RULE_STEPS = {
+    rules.BENEFITS.name: ([_transform_benefits], []),
+    # the groups of the jobs are not stored
+    rules.JOBS.name: ([], []),
+    rules.PLATFORMS.name: ([_transform_platforms], []),
+    # the frameworks are replaced with the names of the languages
+    rules.LANGUAGES.name: ([_transform_languages, _transform_frameworks], []),
+    rules.FRAMEWORKS.name: ([_transform_frameworks], []),
+    rules.DATABASES.name: ([_transform_databases], []),
+    rules.TESTING_TOOLS.name: ([_transform_qa], []),
+    rules.CAREERS.name: ([_transform_careers], [_rewrite_rare_careers]),
+    rules.BOOTCAMPS.name: ([_transform_bootcamps], []),
+    rules.BOOTCAMP_THEMES.name: ([_transform_training], []),
+}
+
+
+def _save(df: pd.DataFrame, name: str, report: dict):
+    storage.save_survey(df, name)
+    storage.save_report(report, name, "memo")
+    aggregates.save_cube(aggregates.build_cube(df), name)
+    filters.save_index(filters.build_index(df), name)
+
+
+def _retransform(
+            df: pd.DataFrame, name: str, tables: list, dropped: list,
+            profiler: profiling.StageProfiler
+        ):
+    # repeats the steps of the rule tables that changed on the rows
+    # they saw in the last transform, the processed rows and the ones
+    # dropped after the steps, and replaces their columns
+    with profiler.measure("load", len(df)) as record:
+        processed = storage.from_storage_dtypes(
+            storage.load_survey(storage.processed_path(name))
+        )
+        rows = df.loc[df.index.isin(processed.index.append(pd.Index(dropped)))].copy()
+        record["rows_out"] = len(rows)
+
+    report = storage.load_report(name, "memo") or {}
+    steps = dict.fromkeys(step for table in tables for step in RULE_STEPS[table][0])
+    final_steps = dict.fromkeys(step for table in tables for step in RULE_STEPS[table][1])
+
+    for step in steps:
+        with profiler.measure(_STEP_NAMES[step], len(rows)):
+            for column in step(rows, report):
+                processed[column] = rows.loc[processed.index, column]
+    for step in final_steps:
+        with profiler.measure(_STEP_NAMES[step], len(processed)):
+            step(processed, report)
+
+    with profiler.measure("save", len(processed)):
+        _save(processed, name, report)
+
+
 def main(
             df: pd.DataFrame,
             name: str,
             mep_dollar: int = None,
             blue_dollar: int = None,
-            official_dollar: int = None
+            official_dollar: int = None,
+            force: bool = False,
         ):
 
-    max_wage_in_arg = None
-    start_salary = None
-    step_salary = None
-    max_exchange_value = None
+    # the time, rows and memory of each stage, saved next to the processed
+    # survey as the "profile" report, or as the "skip" report when the
+    # survey wasn't transformed again so the profile of the transform is kept
+    profiler = profiling.StageProfiler()
+
+    # the survey is skipped if nothing changed since its last transform,
+    # only the steps of the rule tables are repeated if just they changed,
+    # and only the cube and the filter index are built if just their code changed
+    with profiler.measure("fingerprint", len(df)):
+        fingerprint = fingerprints.build_fingerprint(df, [mep_dollar, blue_dollar, official_dollar])
+        previous = storage.load_report(name, "fingerprint")
+    if not force and storage.processed_path(name).exists():
+        tables = fingerprints.changed_rules(previous, fingerprint)
+        if tables is not None and all(table in RULE_STEPS for table in tables):
+            if tables:
+                _retransform(df, name, tables, previous["dropped"], profiler)
+            elif fingerprints.aggregates_changed(previous, fingerprint):
+                with profiler.measure("aggregates", len(df)):
+                    save_aggregates(storage.processed_path(name))
+            fingerprint["dropped"] = previous["dropped"]
+            storage.save_report(fingerprint, name, "fingerprint")
+            storage.save_report(profiler.report(), name, "skip")
+            return True
+
+    # calls saved by applying the transforms to the distinct values
+    report = {}
+
+    df, rule_rows = _transform(df, mep_dollar, blue_dollar, official_dollar, report, profiler=profiler)
+    if df is None:
+        return False
 
-    if blue_dollar:
-        max_wage_in_arg = config.MAX_WAGE_IN_USD * blue_dollar
-        start_salary = round(blue_dollar * config.MIN_WAGE_IN_USD, -4)
-        step_salary = start_salary
-    if blue_dollar and official_dollar:
-        max_exchange_value = blue_dollar + official_dollar
+    # Save data
+    with profiler.measure("save", len(df)):
+        _save(df, name, report)
+    storage.save_report(profiler.report(), name, "profile")
+    fingerprint["dropped"] = [
+        fingerprints.to_label(label) for label in rule_rows.difference(df.index)
+    ]
+    storage.save_report(fingerprint, name, "fingerprint")
+    return True
+
+
+def _add_report(total: dict, report: dict):
+    # adds the calls of the transforms of a chunk to the report of the survey
+    for name, entry in report.items():
+        if name in total:
+            rows = total[name]["rows"] + entry["rows"]
+            calls = total[name]["calls"] + entry["calls"]
+            entry = {
+                "rows": rows,
+                "calls": calls,
+                "hit_rate": round(1 - calls / rows, 4) if rows else 0,
+            }
+        total[name] = entry
+
+
+def save_aggregates(path, chunksize: int = None) -> int:
+    """Builds and saves the cube and the filter index of a processed
+    survey, reading chunksize rows at a time so the whole survey is
+    never in memory.
+
+    :param path: The path of the processed file.
+    :type path: Path
+    :param chunksize: The number of rows read at a time,
+        config.CHUNK_SIZE by default.
+    :type chunksize: int
+    :return: The number of rows of the survey.
+    :rtype: int
+    """
+    cube = aggregates.CubeBuilder()
+    index = filters.IndexBuilder()
+    for chunk in storage.iter_survey(path, chunksize):
+        chunk = storage.from_storage_dtypes(chunk)
+        cube.add(chunk)
+        index.add(chunk)
+
+    aggregates.save_cube(cube.build(), path.name)
+    filters.save_index(index.build(), path.name)
+    return index.rows
+
+
+def main_chunked(
+            path,
+            name: str,
+            mep_dollar: int = None,
+            blue_dollar: int = None,
+            official_dollar: int = None,
+            chunksize: int = None,
+            prepare=None,
+        ) -> bool:
+    """Same transform as main for a survey read from a CSV file, reading
+    a chunk of rows at a time so the whole survey is never in memory.
+    The first pass counts the values that decide which answers are kept
+    (the tags chosen at least config.MIN_AMOUNT times, the rare jobs and
+    careers...) and the second pass applies them to each chunk and writes
+    it. The cube and the filter index are built reading the saved survey
+    in chunks, with save_aggregates.
+
+    :param path: The path of the CSV file, or anything read by pd.read_csv.
+    :type path: Path
+    :param name: The name of the survey.
+    :type name: str
+    :param mep_dollar: The value of the MEP dollar.
+    :type mep_dollar: int
+    :param blue_dollar: The value of the blue dollar.
+    :type blue_dollar: int
+    :param official_dollar: The value of the official dollar.
+    :type official_dollar: int
+    :param chunksize: The number of rows read at a time,
+        config.CHUNK_SIZE by default.
+    :type chunksize: int
+    :param prepare: Called with each chunk before it is transformed,
+        like transform_data.ingest.prepare_survey.
+    :type prepare: callable
+    :return: False if no row is from Argentina.
+    :rtype: bool
+    """
+    chunksize = chunksize or config.CHUNK_SIZE
+    dollar_values = (mep_dollar, blue_dollar, official_dollar)
+
+    def read_chunks():
+        with pd.read_csv(path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk if prepare is None else prepare(chunk)
+
+    # First pass: the counts of the whole survey
+    counts = {}
+    counts_report = {}
+    counts_profiler = profiling.StageProfiler()
+    for chunk in read_chunks():
+        report = {}
+        _transform(chunk, *dollar_values, report, collect=counts, profiler=counts_profiler)
+        _add_report(counts_report, report)
+
+    if not counts:
+        return False
+
+    # the jobs replaced with DATA_JOB are counted as DATA_JOB
+    # when looking for the rare jobs
+    data_jobs = counts["data_jobs"]
+    data_jobs = data_jobs.loc[data_jobs.values <= 1].index
+    positions = counts[config.POSITIONS]
+    counts[config.POSITIONS] = positions.groupby(
+        positions.index.where(~positions.index.isin(data_jobs), DATA_JOB)
+    ).sum()
+
+    # Second pass: the answers are kept or replaced based on the counts
+    writer = storage.SurveyWriter(name)
+    survey_report = {}
+    profiler = profiling.StageProfiler()
+    written = 0
+    for chunk in read_chunks():
+        report = {}
+        chunk, _ = _transform(chunk, *dollar_values, report, counts=counts, profiler=profiler)
+        if chunk is not None:
+            with profiler.measure("write", len(chunk)):
+                writer.write(chunk)
+            written += len(chunk)
+        _add_report(survey_report, report)
+    with profiler.measure("save", written):
+        saved_path = writer.close()
+
+    # the transforms called only while counting
+    for transform, entry in counts_report.items():
+        survey_report.setdefault(transform, entry)
+
+    with profiler.measure("aggregates", written):
+        storage.save_report(survey_report, name, "memo")
+        save_aggregates(saved_path, chunksize)
+
+    # the stages of the second pass, and of the first one under "counting"
+    profile = profiler.report()
+    profile["counting"] = counts_profiler.report()
+    storage.save_report(profile, name, "profile")
+
+    # without the fingerprint of this transform, the next main
+    # transforms the whole survey
+    storage.report_path(name, "fingerprint").unlink(missing_ok=True)
+    return True
+
+
+# Stages of _transform, each one receives the survey and the context of
+# the transform (the report, the counts and the dollar values) and returns
+# the survey. They are measured separately by transform_data.profiling.
 
+
+def _stage_country(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # check if the values are from Argentina
     if config.COUNTRIES in df.columns:
         df = df[df[config.COUNTRIES] == 'Argentina']
@@ -34,10 +455,10 @@ def main(
             ~(df[config.PROVINCES].isin(config.ARGENTINE_PROVINCES)),
             config.PROVINCES
         ] == np.NaN
+    return df
 
-    if len(df) == 0:
-        return False
 
+def _stage_salaries(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Último salario mensual o retiro BRUTO (en tu moneda local)
 
     # nullify invalid characters
@@ -62,67 +483,94 @@ def main(
     df.loc[df[config.NET_SALARY] < config.MIN_WAGE_IN_USD, config.NET_SALARY] = np.NaN
 
     # Values greater than max_wage_in_arg are nullify
+    max_wage_in_arg = context["max_wage_in_arg"]
     if max_wage_in_arg:
         df.loc[(df[config.GROSS_SALARY] > max_wage_in_arg), config.GROSS_SALARY] = np.NaN
         df.loc[(df[config.NET_SALARY] > max_wage_in_arg), config.NET_SALARY] = np.NaN
+    return df
 
+
+def _stage_payments(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Pagos en dólares
 
     if config.PAYMENTS_IN_DOLLARS in df.columns:
         # fill null values
         df.loc[df[config.PAYMENTS_IN_DOLLARS].isna(), config.PAYMENTS_IN_DOLLARS] = config.FILL_NULL_VALUES
+    return df
+
 
+def _stage_exchange_rate(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Si tu sueldo está dolarizado:
     # ¿Cuál fue el último valor del dólar que tomaron?
 
-    if config.LAST_VALUE_EXCHANGE in df.columns:
-        # Override alphanumeric values:
-        # values that do not answer the question are nullify
-        values_to_avoid = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str) and  not (bool(re.search(r'\d+', x))) and ("no " in x.lower() or ("no" in x.lower() and len(x) < 3)))
-        df.loc[values_to_avoid, config.LAST_VALUE_EXCHANGE] = np.NaN
-
-        if official_dollar and type(official_dollar) == str:
-            # the official dollar value is replaced
-            # with predefined official_dollar
-            values_to_reset = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str)  and (bool(re.search(r'\d+', x))) and ("oficial" in x.lower() or "banco nac" in x.lower() or "bna" in x.lower()))
-            df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = official_dollar
-
-        if mep_dollar and type(mep_dollar) == str:
-            values_to_reset = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str) and (bool(re.search(r'\d+', x))) and ("mep" in x.lower() or "crypto" in x.lower() or "cripto" in x.lower()))
-            df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = mep_dollar
-
-        if blue_dollar and type(blue_dollar) == str:
-            values_to_reset = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str) and not (bool(re.search(r'\d+', x))) and "blue" in x.lower())
-            df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = blue_dollar
-
-        # replace the remaining non-numeric values with np.NaN
-        values_to_reset = df[config.LAST_VALUE_EXCHANGE].apply(lambda x:isinstance(x, str) and not (bool(re.search(r'\d+', x))))
-        df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = np.NaN
-
-        # extract numbers from alphanumeric values
-        if df[config.LAST_VALUE_EXCHANGE].dtype == str:
-            df[config.LAST_VALUE_EXCHANGE] = df[config.LAST_VALUE_EXCHANGE].str.replace(r",",".").str.replace(r"\$", "", regex=True)
-            values_to_reset = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str) and x.isalnum())
-            df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE].apply(utils.extract_numbers)
-
-        # converts strings that do not contain numbers and periods to NaN and converts numeric strings to numeric values
-        values_to_avoid = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: isinstance(x, str) and (bool(re.search(r'[^\d.]+', x))))
-        df.loc[values_to_avoid, config.LAST_VALUE_EXCHANGE] = np.NaN
-
-        # transform values to numeric values and filter them
-        df[config.LAST_VALUE_EXCHANGE] = pd.to_numeric(df[config.LAST_VALUE_EXCHANGE], errors='coerce')
-        if max_exchange_value:
-            df.loc[df[config.LAST_VALUE_EXCHANGE] > max_exchange_value, config.LAST_VALUE_EXCHANGE] = np.NaN
-
-        # Salaries are rewritten by calculating the value in ARG based on the exchange value
-        df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.GROSS_SALARY]] *= df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.LAST_VALUE_EXCHANGE]]
-        df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.NET_SALARY]] *= df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.LAST_VALUE_EXCHANGE]]
-        # Values in dollars without exchange rate are nullify
-        df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].isnull()), [config.GROSS_SALARY]] = np.NaN
-        df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].isnull()), [config.NET_SALARY]] = np.NaN
-
-        df[config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX] = df[config.LAST_VALUE_EXCHANGE].apply(lambda x: utils.find_nearest_multiple(x, 5)).replace(0.0, np.NaN)
-
+    if config.LAST_VALUE_EXCHANGE not in df.columns:
+        return df
+
+    # the answers that are strings, in lower case and
+    # whether they contain a number, shared by the following filters
+    exchange = utils.get_strings(df[config.LAST_VALUE_EXCHANGE])
+    exchange_lower = exchange.str.lower()
+    has_number = exchange.str.contains(r'\d', na=False)
+
+    # Override alphanumeric values:
+    # values that do not answer the question are nullify
+    values_to_avoid = ~has_number & (
+        exchange_lower.str.contains("no ", regex=False, na=False) |
+        (
+            exchange_lower.str.contains("no", regex=False, na=False) &
+            (exchange.str.len() < 3)
+        )
+    )
+    df.loc[values_to_avoid, config.LAST_VALUE_EXCHANGE] = np.NaN
+    exchange[values_to_avoid] = np.NaN
+    exchange_lower[values_to_avoid] = np.NaN
+
+    # (dollar value, whether the answer has a number, words in the answer)
+    dollar_values = [
+        (context["official_dollar"], True, r'oficial|banco nac|bna'),
+        (context["mep_dollar"], True, r'mep|crypto|cripto'),
+        (context["blue_dollar"], False, r'blue'),
+    ]
+    for dollar_value, with_number, regex in dollar_values:
+        if dollar_value and type(dollar_value) == str:
+            # the values are replaced with the predefined dollar value
+            values_to_reset = (has_number == with_number) & exchange_lower.str.contains(regex, na=False)
+            df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = dollar_value
+            exchange[values_to_reset] = dollar_value
+            exchange_lower[values_to_reset] = dollar_value.lower()
+            has_number[values_to_reset] = bool(re.search(r'\d', dollar_value))
+
+    # replace the remaining non-numeric values with np.NaN
+    values_to_reset = exchange.notna() & ~has_number
+    df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = np.NaN
+
+    # extract numbers from alphanumeric values
+    if df[config.LAST_VALUE_EXCHANGE].dtype == str:
+        df[config.LAST_VALUE_EXCHANGE] = df[config.LAST_VALUE_EXCHANGE].str.replace(r",",".").str.replace(r"\$", "", regex=True)
+        values_to_reset = utils.get_strings(df[config.LAST_VALUE_EXCHANGE]).str.isalnum().fillna(False).astype(bool)
+        df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE] = utils.extract_single_number(df.loc[values_to_reset, config.LAST_VALUE_EXCHANGE])
+
+    # converts strings that do not contain numbers and periods to NaN and converts numeric strings to numeric values
+    values_to_avoid = utils.get_strings(df[config.LAST_VALUE_EXCHANGE]).str.contains(r'[^\d.]', na=False)
+    df.loc[values_to_avoid, config.LAST_VALUE_EXCHANGE] = np.NaN
+
+    # transform values to numeric values and filter them
+    df[config.LAST_VALUE_EXCHANGE] = pd.to_numeric(df[config.LAST_VALUE_EXCHANGE], errors='coerce')
+    if context["max_exchange_value"]:
+        df.loc[df[config.LAST_VALUE_EXCHANGE] > context["max_exchange_value"], config.LAST_VALUE_EXCHANGE] = np.NaN
+
+    # Salaries are rewritten by calculating the value in ARG based on the exchange value
+    df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.GROSS_SALARY]] *= df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.LAST_VALUE_EXCHANGE]]
+    df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.NET_SALARY]] *= df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].notnull()), [config.LAST_VALUE_EXCHANGE]]
+    # Values in dollars without exchange rate are nullify
+    df.loc[(df[config.GROSS_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].isnull()), [config.GROSS_SALARY]] = np.NaN
+    df.loc[(df[config.NET_SALARY] < config.MAX_WAGE_IN_USD) & (df[config.LAST_VALUE_EXCHANGE].isnull()), [config.NET_SALARY]] = np.NaN
+
+    df[config.LAST_VALUE_EXCHANGE + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.LAST_VALUE_EXCHANGE], lambda x: utils.find_nearest_multiple(x, 5), context["report"], "exchange_multiple").replace(0.0, np.NaN)
+    return df
+
+
+def _stage_salary_comparison(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Compare two salaries
     # Net salary values greater than gross salary and the difference
     # is greater than a total gross salary are nullify
@@ -132,122 +580,58 @@ def main(
     # Swapping Net salary with gross salary
     swap_values = df[(df[config.GROSS_SALARY] < df[config.NET_SALARY])][[config.GROSS_SALARY]]
     df.loc[swap_values.index, [config.GROSS_SALARY, config.NET_SALARY]] = df.loc[swap_values.index, [config.NET_SALARY, config.GROSS_SALARY]].values
+    return df
+
 
+def _stage_positions(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Trabajo de
 
     df.loc[df[config.POSITIONS].notna(), config.POSITIONS].apply(utils.group_jobs)
 
     # restaurant jobs that have the word "data" are replaced
     # with "BI Analyst / Data Analyst"
-    data_jobs = df.loc[df[config.POSITIONS].apply(lambda x: "data" in x.lower()), config.POSITIONS].value_counts()
-    data_jobs = data_jobs.loc[data_jobs.values <= 1].index
-    df.loc[df[config.POSITIONS].apply(lambda x: x in data_jobs), config.POSITIONS] = 'BI Analyst / Data Analyst'
-
-    # Con qué beneficios contas
-
-    df[config.BENEFITS] = df[config.BENEFITS].apply(utils.cut_string)
-    benefits = pd.Series(sum(df.loc[df[config.BENEFITS].notna(), config.BENEFITS], []))
-    benefits = benefits.apply(utils.fix_benefit_name).value_counts()
-    valid_benefits = benefits[benefits >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.BENEFITS].notna(), config.BENEFITS].apply(lambda x: utils.replace_list_values(x, valid_benefits, "Otros", utils.fix_benefit_name))
-    df[config.BENEFITS] = df[config.BENEFITS].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
+    report = context["report"]
+    data_jobs = _survey_counts(
+        "data_jobs",
+        lambda: df.loc[utils.apply_unique(df[config.POSITIONS], lambda x: "data" in x.lower(), report, "data_jobs"), config.POSITIONS].value_counts(),
+        context["counts"],
+        context["collect"],
+    )
+    if data_jobs is not None:
+        data_jobs = data_jobs.loc[data_jobs.values <= 1].index
+        df.loc[utils.apply_unique(df[config.POSITIONS], lambda x: x in data_jobs, report, "rare_data_jobs"), config.POSITIONS] = DATA_JOB
+    return df
+
+
+def _stage_dependents(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # ¿Cuántas personas a cargo tenés?
 
     df[config.DEPENDENTS] = df[config.DEPENDENTS].astype('float64').clip(lower=0, upper=config.MAXIMUM_PEOPLE_IN_CHARGE)
+    return df
 
-    # Plataformas que utilizas en tu puesto actual
-
-    df[config.PLATFORMS_COLUMN] = df[config.PLATFORMS_COLUMN].apply(utils.cut_string)
-    platforms_s = pd.Series(sum(df.loc[df[config.PLATFORMS_COLUMN].notna(), config.PLATFORMS_COLUMN], []))
-    platforms_s = platforms_s.apply(utils.fix_platform_name).value_counts()
-    platforms = platforms_s[platforms_s >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.PLATFORMS_COLUMN].notna(), config.PLATFORMS_COLUMN].apply(lambda x: utils.replace_list_values(x, platforms, config.FILL_WITH, utils.fix_platform_name))
-    df[config.PLATFORMS_COLUMN] = df[config.PLATFORMS_COLUMN].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
-    # Lenguajes de programación o tecnologías que utilices en tu puesto actual
-
-    df[config.LANGUAGES] = df[config.LANGUAGES].apply(utils.cut_string)
-    languages_s = pd.Series(sum(df.loc[df[config.LANGUAGES].notna(), config.LANGUAGES], []))
-    languages_s = languages_s.apply(utils.fix_languages_name).value_counts()
-    languages = languages_s[languages_s >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.LANGUAGES].notna(), config.LANGUAGES].apply(lambda x: utils.replace_list_values(x, languages, config.FILL_WITH, utils.fix_languages_name))
-    df[config.LANGUAGES] = df[config.LANGUAGES].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
-    # Frameworks, herramientas y librerías que utilices en tu puesto actual
-
-    df[config.FRAMEWORKS] = df[config.FRAMEWORKS].apply(utils.cut_string)
-    frameworks_s = pd.Series(sum(df.loc[df[config.FRAMEWORKS].notna(), config.FRAMEWORKS], []))
-    frameworks_s = frameworks_s.apply(utils.fix_framework_name).value_counts()
-    frameworks = frameworks_s[frameworks_s >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.FRAMEWORKS].notna(), config.FRAMEWORKS].apply(lambda x: utils.replace_list_values(x, frameworks, config.FILL_WITH, utils.fix_languages_name))
-    df[config.FRAMEWORKS] = df[config.FRAMEWORKS].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
-    # Bases de datos
-
-    df[config.DATABASES_COLUMN] = df[config.DATABASES_COLUMN].apply(utils.cut_string)
-    db_s = pd.Series(sum(df.loc[df[config.DATABASES_COLUMN].notna(), config.DATABASES_COLUMN], []))
-    db_s = db_s.apply(utils.fix_DB_name).value_counts()
-    db = db_s[db_s >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.DATABASES_COLUMN].notna(), config.DATABASES_COLUMN].apply(lambda x: utils.replace_list_values(x, db, config.FILL_WITH, utils.fix_DB_name))
-    df[config.DATABASES_COLUMN] = df[config.DATABASES_COLUMN].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
-    # QA / Testing
-
-    df[config.QA] = df[config.QA].apply(utils.cut_string)
-    qa_serie = pd.Series(sum(df.loc[df[config.QA].notna(), config.QA], []))
-    qa_serie = qa_serie.apply(utils.fix_testing_tool_name).value_counts()
-    valid_qa = qa_serie[qa_serie >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.QA].notna(), config.QA].apply(lambda x: utils.replace_list_values(x, valid_qa, config.FILL_WITH, utils.fix_testing_tool_name))
-    df[config.QA] = df[config.QA].apply(lambda x: ' - '.join(x) if type(x) == list else x)
-
-    # ¿Participaste de algún Boot Camp?
-
-    df.loc[df[config.BOOTCAMP].apply(lambda x: type(x) == str and (("no" in x.lower() and len(x) < 3) or "no," in x.lower())), config.BOOTCAMP] = np.NaN
-
-    # Normalize the separation of bootcamps
-    df[config.BOOTCAMP] = df[config.BOOTCAMP].apply(lambda x: x.replace("Si,", " ").replace("ux/ui", " ") if isinstance(x, str) and (x.startswith("Si,") or "ux/ui" in x.lower()) else x)
-
-    separators_regex = r"\s*(?: / | y |, |;)\s*"
-
-    df[config.BOOTCAMP] = df[config.BOOTCAMP].apply(lambda x: re.sub(separators_regex, " - ", x) if isinstance(x, str) else x)
-    df[config.BOOTCAMP] = df[config.BOOTCAMP].str.replace("/", " - ")
-    df[config.BOOTCAMP] = df[config.BOOTCAMP].apply(lambda x: x.strip().split(" - ") if isinstance(x, str) else x)
-
-    bootcamps_list = pd.Series(sum(df.loc[df[config.BOOTCAMP].notna(), config.BOOTCAMP], []))
-    bootcamps_list = bootcamps_list.apply(utils.fix_bootcamp_name).value_counts()
-    valid_bootcamps = bootcamps_list[bootcamps_list >= config.MIN_AMOUNT].index.to_list()
-    df.loc[df[config.BOOTCAMP].notna(), config.BOOTCAMP].apply(lambda x: utils.replace_list_values(x, valid_bootcamps, config.FILL_WITH, utils.fix_bootcamp_name))
-    df[config.BOOTCAMP] = df[config.BOOTCAMP].apply(lambda x: ' - '.join(x) if type(x) == list else x)
 
+def _stage_studies(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Máximo nivel de estudios
 
     df.loc[df[config.MAX_LVL_STUDIES].isna(), config.MAX_LVL_STUDIES] = config.FILL_NULL_VALUES
+    return df
 
-    # Carrera
-
-    df.loc[df[config.CAREER].isna() & df[config.STUDIES_STATE].notna(), config.STUDIES_STATE] = np.NaN
-    df[config.CAREER] = df[config.CAREER].apply(utils.group_careers)
-    df.loc[df[config.CAREER].notna() & df[config.STUDIES_STATE].isna(), config.CAREER] = np.NaN
-
-    # Si participaste de un Boot Camp, ¿qué carrera estudiaste
-
-    if config.TRAINING_IN in df.columns:
-        df[config.TRAINING_IN] = df[config.TRAINING_IN].apply(utils.fix_bootcamp_theme_name)
-        valid_bootcamp_theme = df[config.TRAINING_IN].apply(utils.fix_bootcamp_theme_name).value_counts()
-        valid_bootcamp_theme = valid_bootcamp_theme[valid_bootcamp_theme > config.MIN_AMOUNT].index.to_list()
-        df[config.TRAINING_IN] = df[config.TRAINING_IN].apply(lambda x: config.FILL_WITH if (isinstance(x, str) and x not in valid_bootcamp_theme) else x)
 
+def _stage_age(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Tengo (edad)
 
-    values_to_avoid = df[config.AGE].apply(lambda x: isinstance(x, str) and not (bool(re.search(r'[\d+]', x))))
+    age = utils.get_strings(df[config.AGE])
+    values_to_avoid = age.notna() & ~age.str.contains(r'[\d+]', na=False)
     df.loc[values_to_avoid, config.AGE] = np.NaN
-    values_to_avoid = df[config.AGE].apply(lambda x: isinstance(x, str) and (bool(re.search(r'[a-zA-Z-]', x))))
-    df.loc[values_to_avoid, config.AGE] = df[values_to_avoid][config.AGE].apply(utils.extract_numbers)
+    values_to_avoid = ~values_to_avoid & age.str.contains(r'[a-zA-Z-]', na=False)
+    df.loc[values_to_avoid, config.AGE] = utils.extract_single_number(age[values_to_avoid])
     df[config.AGE] = pd.to_numeric(df[config.AGE], errors='coerce')
     df.loc[df[config.AGE] > config.MAX_AGE, config.AGE] = np.NaN
     df.drop(index=df[df[config.AGE] < config.MIN_AGE].index, inplace=True)
+    return df
+
 
+def _stage_experience(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Antigüedad en la empresa actual
     df[config.TIME_IN_CURRENT_COMPANY] = pd.to_numeric(df[config.TIME_IN_CURRENT_COMPANY], errors='coerce')
     df[config.TIME_IN_CURRENT_ROLE] = pd.to_numeric(df[config.TIME_IN_CURRENT_ROLE], errors='coerce')
@@ -264,52 +648,161 @@ def main(
     # the years of experience are nullify if they began when
     # the person was not of legal age
     df.loc[df[config.YEARS_OF_EXPERIENCE] > (df[config.AGE] - 17), config.YEARS_OF_EXPERIENCE] = np.NaN
+    return df
 
+
+def _stage_gender(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Me identifico (género)
 
     # rename invalid responses
-    if not df[config.GENDER].apply(lambda x: x not in config.VALID_GENDER_CATEGORIES).all():
-        df.loc[df[config.GENDER].apply(lambda x: x not in config.VALID_GENDER_CATEGORIES), config.GENDER] = config.FILL_NO_VALID_GENDERS_WITH
+    invalid_genders = utils.apply_unique(df[config.GENDER], lambda x: x not in config.VALID_GENDER_CATEGORIES, context["report"], "invalid_genders")
+    if not invalid_genders.all():
+        df.loc[invalid_genders, config.GENDER] = config.FILL_NO_VALID_GENDERS_WITH
+    return df
+
 
+def _stage_chart_columns(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Add columns to chart
+    report = context["report"]
 
     # Transform the data to strings and add • so that streamlit
     # can better read the plotly histogram in separate columns
-    df[config.SEMI_ANNUAL_SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX] = df[config.SEMI_ANNUAL_SALARY_COMPLIANCE].apply(lambda x: "•" + str(x))
-    df[config.SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX] = df[config.SALARY_COMPLIANCE].apply(lambda x: "•" + str(x))
-    df[config.WORKPLACE_RECOMMENDATION + config.REWRITTEN_COLUMN_SUFFIX] = df[config.WORKPLACE_RECOMMENDATION].apply(lambda x: "•" + str(x))
+    df[config.SEMI_ANNUAL_SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.SEMI_ANNUAL_SALARY_COMPLIANCE], lambda x: "•" + str(x), report, config.SEMI_ANNUAL_SALARY_COMPLIANCE)
+    df[config.SALARY_COMPLIANCE + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.SALARY_COMPLIANCE], lambda x: "•" + str(x), report, config.SALARY_COMPLIANCE)
+    df[config.WORKPLACE_RECOMMENDATION + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.WORKPLACE_RECOMMENDATION], lambda x: "•" + str(x), report, config.WORKPLACE_RECOMMENDATION)
     if config.DAYS_IN_OFFICE in df.columns:
-        df[config.DAYS_IN_OFFICE + config.REWRITTEN_COLUMN_SUFFIX] = df[config.DAYS_IN_OFFICE].apply(lambda x: "•" + str(x))
+        df[config.DAYS_IN_OFFICE + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.DAYS_IN_OFFICE], lambda x: "•" + str(x), report, config.DAYS_IN_OFFICE)
 
 
     # Ages are grouped to be able to plot the data in columns of a histogram
-    df[config.AGE + config.REWRITTEN_COLUMN_SUFFIX] = df[config.AGE].apply(lambda x: utils.to_category_number_category2(x, config.START_AGE, config.STOP_AGE, config.STEP_AGE))
+    df[config.AGE + config.REWRITTEN_COLUMN_SUFFIX] = utils.to_number_categories(df[config.AGE], config.START_AGE, config.STOP_AGE, config.STEP_AGE)
 
     # salaries are grouped to be able to plot the data in columns
     # of a histogram
+    max_wage_in_arg = context["max_wage_in_arg"]
+    step_salary = context["step_salary"]
+    start_salary = context["start_salary"]
     if max_wage_in_arg and step_salary and start_salary:
-        df.loc[df[config.GROSS_SALARY].notna(), config.GROSS_SALARY + config.REWRITTEN_COLUMN_SUFFIX] = df.loc[df[config.GROSS_SALARY].notna(), config.GROSS_SALARY].apply(lambda x: utils.to_category_number_category2(x, start_salary, max_wage_in_arg, step_salary))
-        df.loc[df[config.NET_SALARY].notna(), config.GROSS_SALARY + config.REWRITTEN_COLUMN_SUFFIX] = df.loc[df[config.GROSS_SALARY].notna(), config.GROSS_SALARY].apply(lambda x: utils.to_category_number_category2(x, start_salary, max_wage_in_arg, step_salary))
+        df[config.GROSS_SALARY + config.REWRITTEN_COLUMN_SUFFIX] = utils.to_number_categories(df[config.GROSS_SALARY], start_salary, max_wage_in_arg, step_salary).where(df[config.GROSS_SALARY].notna())
 
     for column in config.COLUMNS_TO_CAREGORIZE_AS_FIBONACCI:
-        df.loc[df[column].notna(), column + config.REWRITTEN_COLUMN_SUFFIX] = df.loc[df[column].notna(), column].apply(lambda x: utils.to_fibonacci_category(x))
+        df[column + config.REWRITTEN_COLUMN_SUFFIX] = utils.to_fibonacci_categories(df[column]).where(df[column].notna())
+    return df
 
+
+def _stage_rare_positions(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # The roles that appear rarely repeated are rewritten with
     # the value constants.FILL_WITH
-    carreer_counts = df.groupby(config.POSITIONS).size()
-    rare_carreers = carreer_counts[carreer_counts < config.MIN_AMOUNT].index
-    df[config.POSITIONS + config.REWRITTEN_COLUMN_SUFFIX] = df[config.POSITIONS].map(lambda x: config.FILL_WITH if x in rare_carreers else x)
+    carreer_counts = _survey_counts(
+        config.POSITIONS, lambda: df.groupby(config.POSITIONS).size(), context["counts"], context["collect"]
+    )
+    if carreer_counts is not None:
+        rare_carreers = carreer_counts[carreer_counts < config.MIN_AMOUNT].index
+        df[config.POSITIONS + config.REWRITTEN_COLUMN_SUFFIX] = utils.apply_unique(df[config.POSITIONS], lambda x: config.FILL_WITH if x in rare_carreers else x, context["report"], "rare_positions")
+    return df
 
-    # The careers that appear rarely repeated are rewritten with the value constants.FILL_WITH
-    carreer_counts = df.groupby(config.CAREER).size()
-    rare_carreers = carreer_counts[carreer_counts < config.MIN_AMOUNT].index
-    df[config.CAREER + config.REWRITTEN_COLUMN_SUFFIX] = df[config.CAREER].map(lambda x: config.FILL_WITH if x in rare_carreers else x)
 
+def _stage_organization_size(df: pd.DataFrame, context: dict) -> pd.DataFrame:
     # Cantidad de personas en tu organización
 
-    df[config.ORGANIZATION_SIZE] = df[config.ORGANIZATION_SIZE].apply(utils.rewrite_number_people)
+    df[config.ORGANIZATION_SIZE] = utils.apply_unique(df[config.ORGANIZATION_SIZE], utils.rewrite_number_people, context["report"])
+    return df
+
+
+def _rule_stage(step):
+    # the stage of a step of RULE_STEPS
+    def stage(df: pd.DataFrame, context: dict) -> pd.DataFrame:
+        step(df, context["report"], context["counts"], context["collect"])
+        return df
+    stage.step = step
+    return stage
+
+
+# The stages of _transform in order, (name, stage)
+STAGES = [
+    ("country", _stage_country),
+    ("salaries", _stage_salaries),
+    ("payments", _stage_payments),
+    ("exchange_rate", _stage_exchange_rate),
+    ("salary_comparison", _stage_salary_comparison),
+    ("positions", _stage_positions),
+    ("benefits", _rule_stage(_transform_benefits)),
+    ("dependents", _stage_dependents),
+    ("platforms", _rule_stage(_transform_platforms)),
+    ("languages", _rule_stage(_transform_languages)),
+    ("frameworks", _rule_stage(_transform_frameworks)),
+    ("databases", _rule_stage(_transform_databases)),
+    ("qa", _rule_stage(_transform_qa)),
+    ("bootcamps", _rule_stage(_transform_bootcamps)),
+    ("studies", _stage_studies),
+    ("careers", _rule_stage(_transform_careers)),
+    ("training", _rule_stage(_transform_training)),
+    ("age", _stage_age),
+    ("experience", _stage_experience),
+    ("gender", _stage_gender),
+    ("chart_columns", _stage_chart_columns),
+    ("rare_positions", _stage_rare_positions),
+    ("rare_careers", _rule_stage(_rewrite_rare_careers)),
+    ("organization_size", _stage_organization_size),
+]
+
+# The names of the steps of RULE_STEPS in the profiles
+_STEP_NAMES = {
+    stage.step: name for name, stage in STAGES if hasattr(stage, "step")
+}
+
+# The survey is not transformed if no row is left after the first stage,
+# and the rows after the last one are the rows seen by the rule steps
+_COUNTRY_STAGE = "country"
+_RULE_ROWS_STAGE = "training"
+
+
+def _transform(
+            df: pd.DataFrame,
+            mep_dollar: int,
+            blue_dollar: int,
+            official_dollar: int,
+            report: dict,
+            counts: dict = None,
+            collect: dict = None,
+            profiler: profiling.StageProfiler = None,
+        ) -> tuple:
+    # The transform of main, returns the processed rows and the rows seen
+    # by the steps of the rule tables, or None if no row is from Argentina.
+    # counts and collect are given when the survey is transformed in
+    # chunks, see _survey_counts. The stages are measured by profiler.
+
+    context = {
+        "report": report,
+        "counts": counts,
+        "collect": collect,
+        "mep_dollar": mep_dollar,
+        "blue_dollar": blue_dollar,
+        "official_dollar": official_dollar,
+        "max_wage_in_arg": None,
+        "start_salary": None,
+        "step_salary": None,
+        "max_exchange_value": None,
+    }
 
-    # Save data
-    config.FOLDER_PATH.mkdir(parents=True, exist_ok=True)
-    df.to_csv(config.FOLDER_PATH / name)
-    return True
+    if blue_dollar:
+        context["max_wage_in_arg"] = config.MAX_WAGE_IN_USD * blue_dollar
+        context["start_salary"] = round(blue_dollar * config.MIN_WAGE_IN_USD, -4)
+        context["step_salary"] = context["start_salary"]
+    if blue_dollar and official_dollar:
+        context["max_exchange_value"] = blue_dollar + official_dollar
+
+    rule_rows = None
+    for name, stage in STAGES:
+        if profiler is None:
+            df = stage(df, context)
+        else:
+            df = profiler.run(name, stage, df, context)
+
+        if name == _COUNTRY_STAGE and len(df) == 0:
+            return None, None
+        # the rows seen by the steps of the rule tables
+        if name == _RULE_ROWS_STAGE:
+            rule_rows = df.index
+
+    return df, rule_rows
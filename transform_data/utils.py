@@ -1,5 +1,8 @@
 import re
 import numpy as np
+import pandas as pd
+
+import transform_data.rules as rules
 
 
 def extract_numbers(string: str) -> str:
@@ -21,6 +24,132 @@ def extract_numbers(string: str) -> str:
     return np.NaN
 
 
+def extract_single_number(serie: pd.Series) -> pd.Series:
+    """Vectorized version of extract_numbers, the number found in each
+    string is returned as a float, NaN if no number or
+    multiple numbers are found.
+
+    :param serie: The strings to search for a number.
+    :type serie: pd.Series
+    :return: The number found in each string.
+    :rtype: pd.Series
+    """
+    serie = serie.str.replace(",", ".", regex=False)
+    first_number = serie.str.extract(r'(\d+)', expand=False)
+
+    return first_number.where(serie.str.count(r'\d+') == 1).astype(float)
+
+
+def get_strings(serie: pd.Series) -> pd.Series:
+    """Replaces the values of a serie that are not strings with NaN,
+    so that the .str methods can be used on columns
+    that mix strings with other values.
+
+    :param serie: The serie to filter.
+    :type serie: pd.Series
+    :return: A serie of strings and NaN values.
+    :rtype: pd.Series
+    """
+    try:
+        is_string = serie.str.len().notna()
+    except AttributeError:
+        # there are no strings in the serie
+        is_string = pd.Series(False, index=serie.index)
+
+    return serie.astype(object).where(is_string)
+
+
+def flatten(serie: pd.Series) -> pd.Series:
+    """Flattens a serie of lists into a serie with one row per element
+    of the lists, keeping the index of the row each element comes from.
+    Null values and empty lists are dropped.
+
+    :param serie: A serie of lists.
+    :type serie: pd.Series
+    :return: The elements of all the lists.
+    :rtype: pd.Series
+    """
+    values = serie.dropna().explode()
+    return values[values.notna()]
+
+
+def split_answers(serie: pd.Series, separator: str = " - ") -> pd.Series:
+    """Splits the answers of a multiple choice column saved as a string,
+    with the values joined by separator, into one row per value.
+
+    :param serie: The joined answers.
+    :type serie: pd.Series
+    :param separator: The separator between the values.
+    :type separator: str
+    :return: The values of all the answers.
+    :rtype: pd.Series
+    """
+    return flatten(get_strings(serie).str.split(separator))
+
+
+def apply_unique(
+            serie: pd.Series, function,
+            report: dict = None, name: str = None
+        ) -> pd.Series:
+    """Same result as serie.apply(function), but the function is called
+    once per distinct value and the results are mapped back to the rows.
+    Columns that mix values of different types that compare as equal
+    (like 1 and 1.0) are applied row by row.
+
+    :param serie: The values to transform.
+    :type serie: pd.Series
+    :param function: A function that receives a single value.
+    :type function: function
+    :param report: If given, the number of rows and calls is saved in
+        report[name].
+    :type report: dict
+    :param name: The name of the transform in the report.
+    :type name: str
+    :return: The transformed values.
+    :rtype: pd.Series
+    """
+    values = serie.to_numpy()
+    mixed_types = serie.dtype == object and pd.api.types.infer_dtype(
+        values, skipna=True
+    ) not in ("string", "integer", "floating", "boolean", "empty")
+
+    if len(serie) == 0 or mixed_types:
+        result = serie.apply(function)
+        calls = len(serie)
+    else:
+        codes, uniques = pd.factorize(values)
+        results = np.empty(len(uniques) + 1, dtype=object)
+        results[:len(uniques)] = [function(value) for value in uniques]
+        calls = len(uniques)
+
+        # the null values are the code -1, the last result
+        missing = codes == -1
+        if missing.any():
+            missing_values = values[missing]
+            if len({type(value) for value in missing_values}) == 1:
+                results[-1] = function(missing_values[0])
+                calls += 1
+            else:
+                # None and NaN can give different results
+                results = results[codes]
+                results[missing] = [function(value) for value in missing_values]
+                codes = np.arange(len(codes))
+                calls += len(missing_values)
+
+        result = pd.Series(
+            results[codes], index=serie.index, name=serie.name
+        ).infer_objects()
+
+    if report is not None:
+        report[name or getattr(function, "__name__", "apply")] = {
+            "rows": len(serie),
+            "calls": calls,
+            "hit_rate": round(1 - calls / len(serie), 4) if len(serie) else 0,
+        }
+
+    return result
+
+
 def replace_list_values(
             list_of_values: list[str],
             list_of_valid_values: list[str],
@@ -98,46 +227,7 @@ def fix_benefit_name(benefit: str) -> str:
     :return: The fixed name of the benefit.
     :rtype: str
     """
-    if (
-            ("obra" in benefit.lower() and "social" in benefit.lower()) or
-            ("prepaga" in benefit.lower())
-            ):
-        return "Obra Social Prepaga"
-    if (
-            (
-                "home" in benefit.lower() and
-                ("office" in benefit.lower() or "working" in benefit.lower())
-                ) or
-            ("remoto" in benefit.lower())
-            ):
-        return "Home office"
-    if (
-            (
-                ("día" in benefit.lower() or "dia" in benefit.lower()) and
-                "cumple" in benefit.lower()) or
-            ("cumpleaños" in benefit.lower())
-            ):
-        return "Día de cumpleaños libre"
-    if ("viernes" in benefit.lower() and "f" in benefit.lower()):
-        return "Horarios flexibles"
-    if (
-            ("día" in benefit.lower() or "dia" in benefit.lower()) and
-            ("off" in benefit.lower() or "libre" in benefit.lower())
-            ):
-        return "Días off"
-    if ("caja" in benefit.lower() and "navid" in benefit.lower()):
-        return "Caja Navideña"
-    if (
-            ("día" in benefit.lower() or "dia" in benefit.lower()) and
-            ("4" in benefit.lower())
-            ):
-        return "Semana laboral de 4 días"
-    elif ("masajes" in benefit.lower()):
-        return "Masajes"
-    elif benefit.lower().startswith("no "):
-        return "No utilizo"
-
-    return benefit
+    return rules.BENEFITS(benefit)
 
 
 def group_jobs(job: str) -> str:
@@ -151,69 +241,7 @@ def group_jobs(job: str) -> str:
     :return: A string representing the group of the career.
     :rtype: str
     """
-    if type(job) != str:
-        return job
-
-    if (
-            ("devops" in job.lower()) or
-            ("infra" in job.lower()) or
-            ("sysadmin" in job.lower())
-            ):
-        return "SysAdmin / DevOps / SRE"
-    if "manager" in job.lower():
-        return 'Manager / Director'
-    if "rpa" in job.lower():
-        return 'RPA'
-    if "full" in job.lower():
-        return "Fullstack"
-    if "cloud" in job.lower():
-        return 'Cloud Engineer'
-    if (
-            ("cyber" in job.lower()) or
-            ("secur" in job.lower()) or
-            ("ciber" in job.lower()) or
-            ("pentest" in job.lower()) or
-            ("seg" in job.lower() and "inf" in job.lower())
-            ):
-        return "Cybersecurity"
-    if ("ux" in job.lower()) or ("designer" in job.lower()):
-        return 'UX/UI Designer'
-    if "lead" in job.lower() or "lider" in job.lower():
-        return 'Technical Leader'
-    if ("dba" in job.lower()) or ("BD" in job):
-        return "DBA"
-    if ("soport" in job.lower()) or ("supp" in job.lower()):
-        return "Soporte IT"
-    if ("test" in job.lower()) or ("qa" in job.lower()):
-        return "QA / Tester"
-    if (
-            ("CIO" in job) or
-            ("CEO" in job) or
-            ("CTO" in job) or
-            "c-" in job.lower()
-            ):
-        return "VP / C-Level"
-    if (
-            ("machin" in job.lower()) or
-            ("nlp" in job.lower()) or
-            ("mlops" in job.lower()) or
-            ("AI" in job)
-            ):
-        return "Machine Learning Engineer"
-    if "help" in job.lower():
-        return "HelpDesk"
-    if (
-            ("funcion" in job and "analista" in job.lower()) or
-            ("funcion" in job.lower()) or
-            ("functional" in job.lower())
-            ):
-        return "Analista Funcional"
-    if "developer" in job.lower():
-        return "Developer"
-    if "writer" in job.lower():
-        return 'Technical Writer'
-
-    return job
+    return rules.JOBS(job)
 
 
 def fix_platform_name(platform: str) -> str:
@@ -224,87 +252,7 @@ def fix_platform_name(platform: str) -> str:
     :return: The fixed name of the platform.
     :rtype: str
     """
-    if type(platform) != str:
-        return platform
-
-    if "office" in platform.lower() or "o365" in platform.lower():
-        return "Office 365"
-    elif "teradata" in platform.lower():
-        return "Teradata"
-    elif "cisco" in platform.lower():
-        return "Cisco"
-    elif "sas" in platform.lower():
-        return "SAS"
-    elif "azure" in platform.lower():
-        return "Azure"
-    elif "figma" in platform.lower():
-        return "Figma"
-    elif "odoo" in platform.lower():
-        return "Odoo"
-    elif "postman" in platform.lower():
-        return "Postman"
-    elif "microstrategy" in platform.lower():
-        return "Microstrategy"
-    elif "excel" in platform.lower():
-        return "Excel"
-    elif "jira" in platform.lower():
-        return "Jira"
-    elif "oracle" in platform.lower():
-        return "Oracle"
-    elif "fortinet" in platform.lower():
-        return "Fortinet"
-    elif "grafana" in platform.lower():
-        return "Grafana"
-    elif "gitlab" in platform.lower():
-        return "Gitlab"
-    elif "informatica" in platform.lower():
-        return "Informatica"
-    elif "miro" in platform.lower():
-        return "Miro"
-    elif "databricks" in platform.lower():
-        return "Databricks"
-    elif "uipath" in platform.lower():
-        return "UiPath"
-    elif "aws" in platform.lower():
-        return "Amazon Web Services"
-    elif "plesk" in platform.lower():
-        return "Plesk"
-    elif "confluen" in platform.lower():
-        return "Confluence"
-    elif "terraform" in platform.lower():
-        return "Terraform"
-    elif "crm" in platform.lower():
-        return "CRM"
-    elif "looker" in platform.lower():
-        return "Looker"
-    elif "microtik" in platform.lower() or "mikrotik" in platform.lower():
-        return "Mikrotik"
-    elif "qlik" in platform.lower():
-        return "Qlik View/ Qlik Sense"
-    elif "pl" in platform.lower() and "sql" in platform.lower():
-        return "PL/ SQL"
-    elif "click" in platform.lower() and "up" in platform.lower():
-        return "ClickUp"
-    elif "service" in platform.lower() and "now" in platform.lower():
-        return "ServiceNow"
-    elif "power" in platform.lower() and "bi" in platform.lower():
-        return "Power BI"
-    elif "github" in platform.lower() and "action" in platform.lower():
-        return "Github Actions"
-    elif "control" in platform.lower() and "m" in platform.lower():
-        return "Control-M"
-    elif "virtual" in platform.lower() and "box" in platform.lower():
-        return "VirtualBox"
-    elif "big" in platform.lower() and "query" in platform.lower():
-        return "BigQuery"
-    elif "android" in platform.lower() and "studio" in platform.lower():
-        return "Android Studio"
-    elif (
-            ("visual" in platform.lower() and "studio" in platform.lower()) or
-            "vsc" in platform.lower()
-            ):
-        return "Visual Studio"
-    return platform
+    return rules.PLATFORMS(platform)
 
 
 def fix_languages_name(languages: str) -> str:
@@ -315,34 +263,7 @@ def fix_languages_name(languages: str) -> str:
     :return: The fixed name of the programming language.
     :rtype: str
     """
-    if type(languages) != str:
-        return languages
-
-    if "pl" in languages.lower() and "sql" in languages.lower():
-        return "PL/ SQL"
-    elif "visual" in languages.lower() and "fox" in languages.lower():
-        return "Visual Fox Pro"
-    elif "visual" in languages.lower() and "basic" in languages.lower():
-        return "Visual Basic"
-    elif "power" in languages.lower() and "shell" in languages.lower():
-        return "PowerShell"
-    elif (
-            "power" in languages.lower() and
-            ("script" in languages.lower() or "builder" in languages.lower())
-            ):
-        return "PowerScript"
-    elif "sas" in languages.lower():
-        return "SAS"
-    elif "qlik" in languages.lower():
-        return "Qlik"
-    elif "excel" in languages.lower():
-        return "Excel"
-    elif "oracle" in languages.lower():
-        return "Oracle"
-    elif "dax" in languages.lower():
-        return "Dax"
-
-    return languages
+    return rules.LANGUAGES(languages)
 
 
 def fix_framework_name(framework: str) -> str:
@@ -353,64 +274,7 @@ def fix_framework_name(framework: str) -> str:
     :return: The fixed name the frameworks.
     :rtype: str
     """
-    if type(framework) != str:
-        return framework
-
-    lower_framework = framework.lower()
-
-    if "nest" in lower_framework:
-        return "Nest Js"
-    if "svelte" in lower_framework:
-        return "Svelte Js"
-    if "jira" in lower_framework:
-        return "Jira"
-    if "yii" in lower_framework:
-        return "Yii"
-    if "symfony" in lower_framework:
-        return "Symfony"
-    if "angular" in lower_framework:
-        return "Angular"
-    if ".net" in lower_framework:
-        return ".NET Core"
-    elif "tailwind" in lower_framework:
-        return "Tailwind"
-    elif "react" in lower_framework and "native" in lower_framework:
-        return "React Native"
-    elif "pho" in lower_framework and "ix" in lower_framework:
-        return "Phoenix "
-    elif "material" in lower_framework and "ui" in lower_framework:
-        return "Material UI"
-    elif "react" in lower_framework:
-        return "React.js"
-    elif (
-            "gin" in lower_framework and
-            (len(lower_framework.strip()) == 3 or "gonic" in lower_framework)
-            ):
-        return "Gin Gonic"
-    elif "spring" in lower_framework and "boot" in lower_framework:
-        return "Spring Boot"
-    elif "fast" in lower_framework and "api" in lower_framework:
-        return "FastAPI"
-    elif "oracle" in lower_framework:
-        return "Oracle"
-    elif "vert" in lower_framework:
-        return "Vertx"
-    elif "xamarin" in lower_framework:
-        return "Xamarin"
-    elif "micronaut" in lower_framework:
-        return "Micronaut"
-    elif "grails" in lower_framework:
-        return "Grails"
-    elif "play" in lower_framework:
-        return "Play Framework"
-    elif "unity" in lower_framework:
-        return "Unity"
-    elif len(lower_framework) < 2 or "ningun" in lower_framework:
-        return "Ninguno de los anteriores"
-    elif "pandas" in lower_framework or "numpy" in lower_framework:
-        return "Pandas/ Numpy"
-
-    return framework
+    return rules.FRAMEWORKS(framework)
 
 
 def fix_DB_name(db_name: str) -> str:
@@ -421,29 +285,7 @@ def fix_DB_name(db_name: str) -> str:
     :return: The fixed name of the database.
     :rtype: str
     """
-    if type(db_name) != str:
-        return db_name
-
-    db_name_lower = db_name.lower()
-
-    if "big" in db_name_lower and "query" in db_name_lower:
-        return "BigQuery"
-    if "sql" in db_name_lower and "server" in db_name_lower:
-        return "Microsoft SQL Server"
-    if "fire" in db_name_lower and "bird" in db_name_lower:
-        return "Firebird"
-    if "fire" in db_name_lower and "base" in db_name_lower:
-        return "Firebase"
-    if "soql" in db_name_lower or "salesforce" in db_name_lower:
-        return "SOQL"
-    if "influxdb" in db_name_lower or "influx" in db_name_lower:
-        return "InfluxDB"
-    if "snowf" in db_name_lower:
-        return "Snowflake"
-    elif db_name_lower.startswith("no ") or len(db_name_lower) < 2:
-        return "Ninguna de las anteriores"
-
-    return db_name
+    return rules.DATABASES(db_name)
 
 
 def fix_testing_tool_name(tool: str) -> str:
@@ -454,47 +296,7 @@ def fix_testing_tool_name(tool: str) -> str:
     :return: The fixed name of the testing tool.
     :rtype: str
     """
-    if ("pytest" in tool.lower()):
-        return "Pytest"
-    elif ("tosca" in tool.lower()):
-        return "Tosca"
-    elif (
-            "ning" in tool.lower() or
-            len(tool) < 2 or
-            tool.lower().startswith("no ")
-            ):
-        return "Ninguna de las anteriores"
-    elif ("jasmine" in tool.lower()):
-        return "Jasmine"
-    elif ("mockito" in tool.lower()):
-        return "Mockito"
-    elif ("qmetry" in tool.lower()):
-        return "QMetry"
-    elif ("scalatest" in tool.lower()):
-        return "ScalaTest"
-    elif ("locust" in tool.lower()):
-        return "Locust"
-    elif ("gtest" in tool.lower()):
-        return "GTest"
-    elif ("insomnia" in tool.lower()):
-        return "Insomnia"
-    elif ("jmeter" in tool.lower()):
-        return "Jmeter"
-    elif ("playwright" in tool.lower()):
-        return "Playwright"
-    elif ("webdriver" in tool.lower() and ("io" in tool.lower())):
-        return "WebDriverIO"
-    elif ("quick" in tool.lower() and ("nimble" in tool.lower())):
-        return "Quick & Nimble"
-    elif ("manual" in tool.lower() and "test" in tool.lower()):
-        return "Test Manual"
-    elif ("testing" in tool.lower() and "react" in tool.lower()):
-        return "React Testing Library"
-    elif ("unit" in tool.lower() and ("test" in tool.lower())):
-        return "Unittest"
-    elif ("eclipse" in tool.lower() or ("rcptt" in tool.lower())):
-        return "Eclipse RCPTT"
-    return tool
+    return rules.TESTING_TOOLS(tool)
 
 
 def group_careers(career: str):
@@ -508,86 +310,7 @@ def group_careers(career: str):
     :return: A string representing the group of the career.
     :rtype: str
     """
-    if type(career) != str:
-        return career
-
-    if ("econom" in career.lower()):
-        return "Licenciatura en Economía"
-    if ("traduc" in career.lower()):
-        return "Traductorado"
-    if ("sociolog" in career.lower()):
-        return "Licenciatura en Sociología"
-    elif ("marketing" in career.lower()):
-        return "Marketing"
-    elif ("contador" in career.lower()):
-        return "Contador Público"
-    elif ("filosof" in career.lower()):
-        return "Filosofía"
-    elif ("política" in career.lower()):
-        return "Licenciatura en Ciencia Política"
-    elif ("psicolog" in career.lower()):
-        return "Licenciatura en Psicología"
-    elif ("analista " in career.lower()) and ("computac" in career.lower()):
-        return 'Analista de Computación'
-    elif ("diseño " in career.lower()) and ("industrial" in career.lower()):
-        return 'Diseño Industrial'
-    elif ("program" in career.lower()) and ("tecnicatura " in career.lower()):
-        return 'Tecnicatura en Programación'
-    elif ("comunicaci" in career.lower()) and ("social" in career.lower()):
-        return 'Licenciatura en Comunicación Social'
-    elif (career.lower().startswith('lic')) and (
-            "comunicaci" in career.lower()):
-        return 'Licenciatura en Comunicación'
-    elif (("comunicaci" in career.lower()) and ((len(career) <= 14))):
-        return "Licenciatura en Comunicación"
-    elif (
-            (career.lower().startswith('lic')) and
-            ("gesti" in career.lower()) and
-            ("inform" in career.lower())
-            ):
-        return 'Licenciatura en Gestión de la Información'
-    elif (
-            (career.lower().startswith('lic')) and
-            ("en ciencia" in career.lower()) and
-            (" de datos" in career.lower())
-            ):
-        return 'Licenciatura en Ciencia de Datos'
-    elif ("ciencia de datos" in career.lower()):
-        return 'Ciencia de Datos'
-    elif (career.lower().startswith('lic')) and ("matem" in career.lower()):
-        return "Licenciatura en Matemática"
-    elif (
-            (career.lower().startswith('lic')) and
-            (("fisica" in career.lower()) or ("física" in career.lower()))
-            ):
-        return 'Licenciatura en Física'
-    elif (
-            "recursos humanos" in career.lower() or
-            "hr" in career.lower() or
-            "rrhh" in career.lower()
-            ):
-        return "Recursos Humanos"
-    elif ("ciber" in career.lower()) and ("seguridad" in career.lower()):
-        return "Ciberseguridad"
-    elif ("inf" in career.lower()) and ("seguridad" in career.lower()):
-        return "Seguridad Informática"
-    elif (career.lower().startswith('ing')) and ("meca" in career.lower()):
-        return "Ingeniería en Mecatrónica"
-    elif (
-            (career.lower().startswith('tec')) and
-            ("web" in career.lower()) and
-            ("desarrollo" in career.lower())
-            ):
-        return "Tecnicatura en Desarrollo Web"
-    elif ("abog" in career.lower()) or ("derecho" in career.lower()):
-        return "Derecho"
-    elif (
-            (career.lower().startswith('lic')) and
-            "inter" in career.lower() and
-            ("rela" in career.lower())
-            ):
-        return "Licenciatura en Relaciones Internacionales"
-    return career
+    return rules.CAREERS(career)
 
 
 def fix_bootcamp_name(bootcamp: str) -> str:
@@ -598,67 +321,7 @@ def fix_bootcamp_name(bootcamp: str) -> str:
     :return: The corrected name of the bootcamp.
     :rtype: str
     """
-    if ("ada" in bootcamp.lower()):
-        return "ADA ITW"
-    elif ("SAP" in bootcamp.lower()):
-        return "SAP"
-    elif ("alkemy" in bootcamp.lower()):
-        return "Alkemy"
-    elif ("udemy" in bootcamp.lower()):
-        return "Udemy"
-    elif ("nucba" in bootcamp.lower()):
-        return "Nucba"
-    elif ("accentur" in bootcamp.lower()):
-        return "Accenture"
-    elif ("platzi" in bootcamp.lower()):
-        return "Platzi"
-    elif ("henry" in bootcamp.lower()):
-        return "Soy Henry"
-    elif ("globant" in bootcamp.lower()):
-        return "Globant"
-    elif ("egg" in bootcamp.lower()):
-        return "Egg Educacion"
-    elif ("codo " in bootcamp.lower()):
-        return "Codo a Codo"
-    elif ("free" in bootcamp.lower()):
-        return "Freecodecamp"
-    elif ("acamica" in bootcamp.lower() or ("acámica" in bootcamp.lower())):
-        return "Acámica"
-    elif ("mercado" in bootcamp.lower() or ("meli" in bootcamp.lower())):
-        return "BootCamp MercadoLibre"
-    elif ("mind" in bootcamp.lower() and ("hub" in bootcamp.lower())):
-        return "Mindhub"
-    elif ("comunidad" in bootcamp.lower() and ("it" in bootcamp.lower())):
-        return "Comunidad IT"
-    elif ("code" in bootcamp.lower() and ("house" in bootcamp.lower())):
-        return "Coderhouse"
-    elif ("digital" in bootcamp.lower() and ("house" in bootcamp.lower())):
-        return "Digital House"
-    elif ("educaci" in bootcamp.lower() and ("it" in bootcamp.lower())):
-        return "Educación IT"
-    elif (
-            "argentina" in bootcamp.lower() and
-            "programa" in bootcamp.lower()
-            ):
-        return "Argentina Programa"
-    elif ("plataforma" in bootcamp.lower() and ("5" in bootcamp.lower())):
-        return "Plataforma 5"
-    elif ("open" in bootcamp.lower() and ("bootcamp" in bootcamp.lower())):
-        return "Open BootCamp"
-    elif (
-            "mujeres" in bootcamp.lower() or
-            "met " in bootcamp.lower() or
-            ("met" in bootcamp.lower() and (len(bootcamp) <= 3))
-            ):
-        return "Mujeres en Tecnologia"
-    elif (
-            ("utn" in bootcamp.lower() and (len(bootcamp) <= 3)) or
-            (" utn" in bootcamp.lower()) or
-            ("utn " in bootcamp.lower())
-            ):
-        return "UTN"
-
-    return bootcamp
+    return rules.BOOTCAMPS(bootcamp)
 
 
 def fix_bootcamp_theme_name(theme: str) -> str:
@@ -669,66 +332,7 @@ def fix_bootcamp_theme_name(theme: str) -> str:
     :return: The corrected name of the theme.
     :rtype: str
     """
-    if type(theme) != str:
-        return theme
-
-    theme_lower = theme.lower()
-
-    if ("full" in theme_lower) or ("mern" in theme_lower):
-        return "Full Stack Developer"
-    elif ("javas" in theme_lower):
-        return "Javascript"
-    elif ("certified tech developer" in theme_lower):
-        return "Certified Tech Developer"
-    elif ("java" in theme_lower):
-        return "Java"
-    elif ("salesfor" in theme_lower):
-        return "Salesforce"
-    elif (".net" in theme_lower):
-        return ".NET"
-    elif ("python" in theme_lower):
-        return "Python"
-    elif ("devops" in theme_lower):
-        return "DevOps"
-    elif ("web" in theme_lower):
-        return "Web Developer"
-    elif ("ux" in theme_lower and "ui" in theme_lower) or "ux" in theme_lower:
-        return "UX/UI"
-    elif "front" in theme_lower:
-        return "Frontend"
-    elif "back" in theme_lower and "end" in theme_lower:
-        return "Backend"
-    elif "data" in theme_lower and "aly" in theme_lower:
-        return "Data Analyst"
-    elif "dat" in theme_lower and (
-            "scien" in theme_lower or "cien" in theme_lower):
-        return "Data Science"
-    elif "dat" in theme_lower and (
-            "big" in theme_lower or "engin" in theme_lower):
-        return "Big Data"
-    elif "qa" in theme_lower or "test" in theme_lower:
-        return "QA Testing"
-    elif ("react" in theme_lower):
-        return "React.js"
-    elif (
-            "mobile" in theme_lower or
-            "movil" in theme_lower or
-            "android" in theme_lower or
-            "swift" in theme_lower or
-            "ios" in theme_lower):
-        return "Desarrollo Mobile"
-    elif (
-            theme_lower.startswith("sap ") or
-            (theme_lower.startswith("sap") and len(theme) <= 3)):
-        return "SAP"
-    elif (
-        theme_lower.startswith("no ") or
-        (theme_lower.startswith("no") and
-         len(theme) <= 3) or len(theme) == 1):
-
-        return "Ninguna de las anteriores"
-
-    return theme
+    return rules.BOOTCAMP_THEMES(theme)
 
 
 def find_nearest_multiple(number: float, multiple: int) -> int:
@@ -815,26 +419,116 @@ def to_category_number_category2(
 
     while (number < stop):
         if number <= (start + (step - 1)):
+            return _number_category_label(start, step)
+        start += step
 
-            number_string = (start + (step - 1))
-            start_string = start
+    return "+" + str(stop)
 
-            if 1000 < number_string < 1000000:
-                number_string = str(int(number_string/1000)) + "k"
-            elif number_string > 1000000:
-                number_string = str(
-                            round(float(number_string/1000000), 3)
-                            ) + "mill"
 
-            if 1000 < start < 1000000:
-                start_string = str(int(start/1000)) + "k"
-            elif start >= 1000000:
-                start_string = str(round(float(start/1000000), 3)) + "mill"
+def _number_category_label(start: float, step: int) -> str:
+    """Returns the label of the category of to_category_number_category2
+    that begins in start.
+    """
+    number_string = (start + (step - 1))
+    start_string = start
 
-            return str(start_string) + " - " + str((number_string))
-        start += step
+    if 1000 < number_string < 1000000:
+        number_string = str(int(number_string/1000)) + "k"
+    elif number_string > 1000000:
+        number_string = str(
+                    round(float(number_string/1000000), 3)
+                    ) + "mill"
 
-    return "+" + str(stop)
+    if 1000 < start < 1000000:
+        start_string = str(int(start/1000)) + "k"
+    elif start >= 1000000:
+        start_string = str(round(float(start/1000000), 3)) + "mill"
+
+    return str(start_string) + " - " + str((number_string))
+
+
+def to_number_categories(
+            serie: pd.Series, start: int, stop: int, step: int
+        ) -> pd.Series:
+    """Vectorized version of to_category_number_category2, returns an
+    ordered categorical with the same labels. The categories are all
+    the possible labels, from the smallest to the biggest.
+
+    :param serie: The numbers to be categorized.
+    :type serie: pd.Series
+    :param start: The start of the first category.
+    :type start: int
+    :param stop: The end of the last category.
+    :type stop: int
+    :param step: The size of each category.
+    :type step: int
+    :return: The category in which each number falls.
+    :rtype: pd.Series
+    """
+    # the numbers up to the last value of each category, the same
+    # way the categories are walked in to_category_number_category2
+    category_starts = []
+    category_start = start
+    if start < stop:
+        while not category_starts or category_start - 1 < stop:
+            category_starts.append(category_start)
+            category_start += step
+    last_values = np.array(category_starts, dtype=float) + (step - 1)
+
+    labels = (
+        ["<" + str(start - 1)] +
+        [_number_category_label(value, step) for value in category_starts] +
+        ["+" + str(stop)]
+    )
+
+    numbers = serie.to_numpy(dtype=float, na_value=np.NaN)
+    codes = np.searchsorted(last_values, numbers, side="left") + 1
+    codes[numbers < start] = 0
+    # the null values and the numbers after stop are in the last category
+    codes[~(numbers < stop)] = len(labels) - 1
+
+    return _to_ordered_categories(codes, labels, serie.index)
+
+
+# Limits of the categories of to_fibonacci_category
+FIBONACCI_LIMITS = [1, 2, 3, 5, 8, 13, 21]
+FIBONACCI_LABELS = (
+    ["<" + str(FIBONACCI_LIMITS[0])] +
+    [
+        str(low) + " - " + str(high) + ")"
+        for low, high in zip(FIBONACCI_LIMITS, FIBONACCI_LIMITS[1:])
+    ] +
+    ["+" + str(FIBONACCI_LIMITS[-1])]
+)
+
+
+def to_fibonacci_categories(serie: pd.Series) -> pd.Series:
+    """Vectorized version of to_fibonacci_category, returns an
+    ordered categorical with the same labels.
+
+    :param serie: The numbers to be categorized.
+    :type serie: pd.Series
+    :return: The category in which each number falls.
+    :rtype: pd.Series
+    """
+    numbers = serie.to_numpy(dtype=float, na_value=np.NaN)
+    # the null values are sorted at the end, in the last category
+    codes = np.searchsorted(FIBONACCI_LIMITS, numbers, side="right")
+
+    return _to_ordered_categories(codes, FIBONACCI_LABELS, serie.index)
+
+
+def _to_ordered_categories(
+            codes: np.ndarray, labels: list[str], index: pd.Index
+        ) -> pd.Series:
+    # labels that are repeated are merged in a single category
+    label_codes, categories = pd.factorize(np.array(labels, dtype=object))
+    return pd.Series(
+        pd.Categorical.from_codes(
+            label_codes[codes], categories=categories, ordered=True
+        ),
+        index=index,
+    )
 
 
 def to_fibonacci_category(number: float):